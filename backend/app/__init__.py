@@ -1,3 +1,3 @@
-"""Wazuh SCA AI Analyst Backend."""
-
-__version__ = "2.0.0"
+"""Wazuh SCA AI Analyst Backend."""
+
+__version__ = "2.0.0"
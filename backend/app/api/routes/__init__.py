@@ -1 +1 @@
-"""API routes package."""
+"""API routes package."""
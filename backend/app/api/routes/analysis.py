@@ -1,451 +1,1208 @@
-"""AI analysis API endpoints."""
-
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from datetime import datetime
-
-from app.models.schemas import (
-    AnalysisRequest,
-    AnalysisResponse,
-    BatchAnalysisRequest,
-    BatchAnalysisResponse,
-)
-from app.services.wazuh_client import wazuh_client
-from app.services.ai import AIServiceFactory
-from app.utils.exceptions import WazuhAPIError, AIServiceError, CheckNotFoundError
-from app.utils.logger import logger
-from app.db.session import get_db
-from app.repositories.analysis_repository import AnalysisRepository
-from app.config import settings
-
-router = APIRouter(prefix="/analysis", tags=["analysis"])
-
-
-@router.post("", response_model=AnalysisResponse)
-async def analyze_check(request: AnalysisRequest, db: Session = Depends(get_db)):
-    """
-    Analyze a single SCA check using AI with intelligent caching.
-
-    This endpoint:
-    1. Checks for cached analysis (if enabled)
-    2. Returns cached result if valid
-    3. Performs new analysis if no cache or cache expired
-    4. Saves new analysis to history
-
-    Args:
-        request: Analysis request parameters
-        db: Database session
-
-    Returns:
-        AI-generated analysis report (cached or fresh)
-    """
-    start_time = datetime.utcnow()
-    repo = AnalysisRepository(db)
-
-    try:
-        # Get check details from Wazuh
-        check = await wazuh_client.get_check_details(
-            request.agent_id, request.policy_id, request.check_id
-        )
-
-        # Get agent information for context
-        agents = await wazuh_client.get_agents()
-        agent_info = next((a for a in agents if a["id"] == request.agent_id), None)
-        agent_name = agent_info.get("name") if agent_info else request.agent_id
-
-        # Try to get cached analysis first
-        # Strategy: 1) Try agent-specific cache, 2) Try shared cache by title
-        cached = None
-        cache_type = None
-
-        if settings.enable_analysis_cache:
-            # 1. Try agent-specific cache first (exact match)
-            cached = repo.find_cached_analysis(
-                agent_id=request.agent_id,
-                check_id=request.check_id,
-                language=request.language,
-            )
-
-            if cached:
-                cache_type = "agent-specific"
-            else:
-                # 2. Try shared cache by check_id (reuse from other agents)
-                cached = repo.find_cached_analysis_by_check_id(
-                    check_id=request.check_id,
-                    language=request.language,
-                    exclude_agent_id=request.agent_id,  # Exclude current agent
-                )
-                if cached:
-                    cache_type = "shared"
-
-            if cached:
-                logger.info(
-                    f"✅ Returning CACHED analysis ({cache_type}): "
-                    f"check={request.check_id}, "
-                    f"age={(datetime.utcnow() - cached.analysis_date).total_seconds() / 3600:.1f}h"
-                    + (f", original_agent={cached.agent_name}" if cache_type == "shared" else "")
-                )
-
-                # Reconstruct script data if available
-                cached_script = None
-                if cached.remediation_script:
-                    import json
-                    metadata = {}
-                    if cached.script_metadata:
-                        try:
-                            metadata = json.loads(cached.script_metadata)
-                        except (json.JSONDecodeError, TypeError):
-                            pass
-
-                    cached_script = {
-                        "script_content": cached.remediation_script,
-                        "script_language": cached.script_language,
-                        "validation_command": cached.validation_command,
-                        **metadata
-                    }
-
-                # IMPORTANT: If using shared cache, save a new entry for THIS agent
-                # This allows the analysis to appear in this agent's history
-                if cache_type == "shared":
-                    execution_time = (datetime.utcnow() - start_time).total_seconds()
-                    repo.save_analysis(
-                        agent_id=request.agent_id,
-                        agent_name=agent_name,
-                        policy_id=request.policy_id,
-                        check_id=request.check_id,
-                        check_title=check.get("title", "Unknown"),
-                        check_description=check.get("description"),
-                        language=request.language,
-                        ai_provider=cached.ai_provider,
-                        report_text=cached.report_text,
-                        status="completed",
-                        execution_time=execution_time,
-                        remediation_script=cached_script,
-                    )
-                    logger.info(
-                        f"📝 Saved shared cache analysis to current agent's history: {agent_name}"
-                    )
-
-                return AnalysisResponse(
-                    check_id=request.check_id,
-                    report=cached.report_text,
-                    remediation_script=cached_script,
-                    ai_provider=cached.ai_provider,
-                    language=request.language,
-                    cached_from_agent=cached.agent_name if cache_type == "shared" else None,
-                )
-
-        # No cache - perform new analysis
-        logger.info(
-            f"🔍 NEW analysis: check={request.check_id}, agent={agent_name}, "
-            f"provider={request.ai_provider.upper()}, language={request.language}"
-        )
-
-        # Create AI service and analyze
-        ai_service = AIServiceFactory.create(request.ai_provider)
-        analysis_result = await ai_service.analyze_check(
-            check,
-            language=request.language,
-            agent_info=agent_info
-        )
-
-        # Extract report and script from result
-        report = analysis_result["report"]
-        script_data = analysis_result.get("remediation_script")
-
-        # Calculate execution time
-        execution_time = (datetime.utcnow() - start_time).total_seconds()
-
-        # Save to history (including script if generated)
-        repo.save_analysis(
-            agent_id=request.agent_id,
-            agent_name=agent_name,
-            policy_id=request.policy_id,
-            check_id=request.check_id,
-            check_title=check.get("title", "Unknown"),
-            check_description=check.get("description"),
-            language=request.language,
-            ai_provider=request.ai_provider,
-            report_text=report,
-            status="completed",
-            execution_time=execution_time,
-            remediation_script=script_data,
-        )
-
-        logger.info(
-            f"✅ Analysis completed in {execution_time:.2f}s and saved to history"
-            + (f" with script ({script_data['script_language']})" if script_data else "")
-        )
-
-        return AnalysisResponse(
-            check_id=request.check_id,
-            report=report,
-            remediation_script=script_data,
-            ai_provider=request.ai_provider,
-            language=request.language,
-            cached_from_agent=None,
-        )
-
-    except CheckNotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except (WazuhAPIError, AIServiceError) as e:
-        # Save failed analysis to history
-        if agent_info:
-            try:
-                repo.save_analysis(
-                    agent_id=request.agent_id,
-                    agent_name=agent_info.get("name", request.agent_id),
-                    policy_id=request.policy_id,
-                    check_id=request.check_id,
-                    check_title=check.get("title", "Unknown") if 'check' in locals() else "Unknown",
-                    language=request.language,
-                    ai_provider=request.ai_provider,
-                    report_text="",
-                    status="failed",
-                    error_message=str(e),
-                )
-            except Exception as save_error:
-                logger.error(f"Failed to save error to history: {save_error}")
-
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.post("/stream")
-async def analyze_check_stream(request: AnalysisRequest):
-    """
-    Analyze a check with streaming response.
-
-    Args:
-        request: Analysis request parameters
-
-    Returns:
-        Server-sent events stream of analysis
-    """
-    try:
-        # Get check details
-        check = await wazuh_client.get_check_details(
-            request.agent_id, request.policy_id, request.check_id
-        )
-
-        # Get agent information for context
-        agents = await wazuh_client.get_agents()
-        agent_info = next((a for a in agents if a["id"] == request.agent_id), None)
-
-        # Create AI service
-        ai_service = AIServiceFactory.create(request.ai_provider)
-
-        # Stream analysis
-        async def generate():
-            async for chunk in ai_service.analyze_check_stream(
-                check,
-                language=request.language,
-                agent_info=agent_info
-            ):
-                yield f"data: {chunk}\n\n"
-            yield "data: [DONE]\n\n"
-
-        return StreamingResponse(generate(), media_type="text/event-stream")
-
-    except CheckNotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except (WazuhAPIError, AIServiceError) as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.post("/batch", response_model=BatchAnalysisResponse)
-async def analyze_batch(request: BatchAnalysisRequest):
-    """
-    Analyze multiple SCA checks.
-
-    Args:
-        request: Batch analysis request
-
-    Returns:
-        Results for all checks
-    """
-    results = []
-    successful = 0
-    failed = 0
-
-    # Get agent information once for context
-    try:
-        agents = await wazuh_client.get_agents()
-        agent_info = next((a for a in agents if a["id"] == request.agent_id), None)
-    except Exception as e:
-        logger.warning(f"Failed to get agent info: {e}. Continuing without agent context.")
-        agent_info = None
-
-    # Create AI service once
-    try:
-        ai_service = AIServiceFactory.create(request.ai_provider)
-    except AIServiceError as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-    # Analyze each check
-    for check_id in request.check_ids:
-        try:
-            check = await wazuh_client.get_check_details(
-                request.agent_id, request.policy_id, check_id
-            )
-            analysis_result = await ai_service.analyze_check(
-                check,
-                language=request.language,
-                agent_info=agent_info
-            )
-
-            # Extract report and script from result
-            report = analysis_result["report"]
-            script_data = analysis_result.get("remediation_script")
-
-            results.append(
-                AnalysisResponse(
-                    check_id=check_id,
-                    report=report,
-                    remediation_script=script_data,
-                    ai_provider=request.ai_provider,
-                    language=request.language,
-                )
-            )
-            successful += 1
-
-        except Exception as e:
-            logger.error(f"Failed to analyze check {check_id}: {e}")
-            results.append(
-                AnalysisResponse(
-                    check_id=check_id,
-                    report=f"Error: {str(e)}",
-                    remediation_script=None,
-                    ai_provider=request.ai_provider,
-                    language=request.language,
-                )
-            )
-            failed += 1
-
-    return BatchAnalysisResponse(
-        results=results, total=len(request.check_ids), successful=successful, failed=failed
-    )
-
-
-@router.get("/providers")
-async def get_ai_providers():
-    """
-    Get list of available AI providers.
-
-    Returns:
-        List of available AI provider names
-    """
-    return {"providers": AIServiceFactory.get_available_providers()}
-
-
-@router.get("/status")
-async def get_ai_status():
-    """
-    Get status of AI providers based on AI_MODE configuration.
-
-    Returns:
-        Status of each AI provider
-    """
-    from app.config import settings
-    import httpx
-
-    status = {
-        "ai_mode": settings.ai_mode,
-        "vllm": {
-            "available": False,
-            "enabled": settings.ai_mode in ["local", "mixed"],
-            "url": settings.vllm_api_url,
-            "model": settings.vllm_model,
-            "type": "Local LLM",
-        },
-        "openai": {
-            "available": bool(settings.openai_api_key),
-            "enabled": settings.ai_mode in ["external", "mixed"],
-            "model": settings.openai_model if settings.openai_api_key else None,
-            "type": "Cloud API",
-        },
-    }
-
-    # Test vLLM connection only if enabled
-    if settings.ai_mode in ["local", "mixed"]:
-        try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{settings.vllm_api_url}/models")
-                if response.status_code == 200:
-                    status["vllm"]["available"] = True
-                    status["vllm"]["models"] = response.json().get("data", [])
-        except Exception as e:
-            status["vllm"]["error"] = str(e)
-
-    return status
-
-
-@router.get("/system-status")
-async def get_system_status():
-    """
-    Get comprehensive system status including Wazuh API and AI providers.
-
-    Returns:
-        Complete system status
-    """
-    from app.config import settings
-    import httpx
-
-    status = {
-        "wazuh": {
-            "available": False,
-            "url": settings.wazuh_api_url,
-            "error": None,
-        },
-        "ai_mode": settings.ai_mode,
-        "vllm": {
-            "available": False,
-            "enabled": settings.ai_mode in ["local", "mixed"],
-            "url": settings.vllm_api_url,
-            "model": settings.vllm_model,
-            "type": "Local LLM",
-            "error": None,
-        },
-        "openai": {
-            "available": bool(settings.openai_api_key),
-            "enabled": settings.ai_mode in ["external", "mixed"],
-            "model": settings.openai_model if settings.openai_api_key else None,
-            "type": "Cloud API",
-            "error": None,
-        },
-    }
-
-    # Test Wazuh API connection
-    try:
-        token = await wazuh_client._get_token()
-        if token:
-            status["wazuh"]["available"] = True
-    except Exception as e:
-        status["wazuh"]["error"] = str(e)
-        logger.error(f"Wazuh API health check failed: {e}")
-
-    # Test vLLM connection only if enabled
-    if settings.ai_mode in ["local", "mixed"]:
-        try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{settings.vllm_api_url}/models")
-                if response.status_code == 200:
-                    status["vllm"]["available"] = True
-                    status["vllm"]["models"] = response.json().get("data", [])
-        except Exception as e:
-            status["vllm"]["error"] = str(e)
-
-    # Test OpenAI API if configured
-    if settings.ai_mode in ["external", "mixed"] and settings.openai_api_key:
-        try:
-            from openai import AsyncOpenAI
-            client = AsyncOpenAI(api_key=settings.openai_api_key)
-            # Simple test to verify API key
-            models = await client.models.list()
-            if models:
-                status["openai"]["available"] = True
-        except Exception as e:
-            status["openai"]["error"] = str(e)
-            status["openai"]["available"] = False
-
-    return status
+"""AI analysis API endpoints."""
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from contextlib import aclosing
+from datetime import datetime
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+import asyncio
+import json
+
+from app.models.schemas import (
+    AnalysisRequest,
+    AnalysisResponse,
+    BatchAnalysisRequest,
+    BatchAnalysisResponse,
+)
+from app.services.precompute_service import precompute_worker
+from app.services.wazuh_client import wazuh_client
+from app.services.ai import AIServiceFactory, compute_analysis_fingerprint
+from app.services.ai.rate_limiter import openai_rate_limiter
+from app.services.ai.report_parser import ReportStreamParser
+from app.services.ai.metrics import cancellation_stats
+from app.services.ai.routing import hedging_stats
+from app.services.ai.scheduler import PRIORITY_BATCH, scheduler_stats
+from app.services.ai.similarity import SIMILARITY_REUSE, SIMILARITY_SEED, similarity_index
+from app.services.ai.token_budget import token_budget
+from app.services.ai.vllm_pool import vllm_pool
+from app.utils.exceptions import (
+    WazuhAPIError,
+    AIServiceError,
+    CheckNotFoundError,
+    ClientDisconnectedError,
+)
+from app.utils.logger import logger
+from app.db.models import AnalysisHistory
+from app.db.session import get_async_db, AsyncSessionLocal
+from app.prompts import prompt_registry
+from app.repositories.async_analysis_repository import AsyncAnalysisRepository
+from app.repositories.history_writer import history_writer
+from app.config import settings
+
+router = APIRouter(prefix="/analysis", tags=["analysis"])
+
+T = TypeVar("T")
+
+# Non-standard status (nginx convention) logged for requests whose client
+# went away; the response itself is never delivered
+CLIENT_CLOSED_REQUEST = 499
+DISCONNECTED_MESSAGE = "Client disconnected before the analysis completed"
+
+
+async def _wait_for_disconnect(http_request: Request) -> None:
+    """Return once the client has disconnected."""
+    while True:
+        # The request body has already been read, so the next ASGI message
+        # is the disconnect
+        message = await http_request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def _cancel_on_disconnect(http_request: Request, awaitable: Awaitable[T]) -> T:
+    """
+    Await an analysis, cancelling it if the client disconnects first.
+
+    FastAPI does not cancel a request handler when its client goes away, so
+    without this the LLM keeps generating up to `max_tokens` for nobody.
+    Cancelling the analysis task aborts the upstream request.
+
+    Args:
+        http_request: Incoming HTTP request
+        awaitable: Analysis to run
+
+    Returns:
+        Result of the analysis
+
+    Raises:
+        ClientDisconnectedError: If the client disconnected first
+    """
+    work = asyncio.ensure_future(awaitable)
+    disconnect = asyncio.ensure_future(_wait_for_disconnect(http_request))
+    try:
+        await asyncio.wait({work, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        disconnect.cancel()
+        if not work.done():
+            work.cancel()
+            await asyncio.gather(work, return_exceptions=True)
+
+    if work.cancelled():
+        raise ClientDisconnectedError(DISCONNECTED_MESSAGE)
+    return work.result()
+
+
+class _ClosingStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that closes its body generator when it stops sending.
+
+    Starlette stops iterating the body when the client disconnects but leaves
+    the generator suspended; closing it right away aborts the upstream LLM
+    stream instead of leaving it to garbage collection.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
+
+
+def _cached_script_data(cached: AnalysisHistory) -> Optional[Dict[str, Any]]:
+    """Reconstruct the remediation script dict of a cached analysis, if any."""
+    if not cached.remediation_script:
+        return None
+
+    metadata = {}
+    if cached.script_metadata:
+        try:
+            metadata = json.loads(cached.script_metadata)
+        except (json.JSONDecodeError, TypeError):
+            pass
+
+    return {
+        "script_content": cached.remediation_script,
+        "script_language": cached.script_language,
+        "validation_command": cached.validation_command,
+        **metadata
+    }
+
+
+async def _lookup_cached_analysis(
+    repo: AsyncAnalysisRepository,
+    request: AnalysisRequest,
+    check: Dict[str, Any],
+    agent_name: str,
+    fingerprint: str,
+    start_time: datetime,
+) -> Tuple[Optional[AnalysisHistory], Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Look up a cached analysis for a request.
+
+    Strategy: 1) Try agent-specific cache, 2) Try shared cache by fingerprint.
+    A shared hit is also saved as a new entry for the requesting agent so the
+    analysis appears in its history.
+
+    Returns:
+        Tuple of (cached analysis, cache type, remediation script dict);
+        (None, None, None) on a miss or when the cache is disabled
+    """
+    if not settings.enable_analysis_cache:
+        return None, None, None
+
+    cache_type = None
+
+    # 1. Try agent-specific cache first (exact match)
+    cached = await repo.find_cached_analysis(
+        agent_id=request.agent_id,
+        fingerprint=fingerprint,
+    )
+
+    if cached:
+        cache_type = "agent-specific"
+    else:
+        # 2. Try shared cache by fingerprint (reuse from other agents/policies)
+        cached = await repo.find_cached_analysis_by_fingerprint(
+            fingerprint=fingerprint,
+            exclude_agent_id=request.agent_id,  # Exclude current agent
+        )
+        if cached:
+            cache_type = "shared"
+
+    if not cached:
+        return None, None, None
+
+    logger.info(
+        f"✅ Returning CACHED analysis ({cache_type}): "
+        f"check={request.check_id}, "
+        f"age={(datetime.utcnow() - cached.analysis_date).total_seconds() / 3600:.1f}h"
+        + (f", original_agent={cached.agent_name}" if cache_type == "shared" else "")
+    )
+
+    cached_script = _cached_script_data(cached)
+
+    # IMPORTANT: If using shared cache, save a new entry for THIS agent
+    # This allows the analysis to appear in this agent's history
+    if cache_type == "shared":
+        execution_time = (datetime.utcnow() - start_time).total_seconds()
+        await repo.save_analysis(
+            agent_id=request.agent_id,
+            agent_name=agent_name,
+            policy_id=request.policy_id,
+            check_id=request.check_id,
+            check_title=check.get("title", "Unknown"),
+            check_description=check.get("description"),
+            language=request.language,
+            ai_provider=cached.ai_provider,
+            report_text=cached.report_text,
+            status="completed",
+            execution_time=execution_time,
+            remediation_script=cached_script,
+            analysis_fingerprint=fingerprint,
+            source_analysis_id=cached.source_analysis_id,
+        )
+        logger.info(
+            f"📝 Saved shared cache analysis to current agent's history: {agent_name}"
+        )
+
+    return cached, cache_type, cached_script
+
+
+def _served_fingerprint(
+    request: AnalysisRequest,
+    check: Dict[str, Any],
+    agent_info: Optional[Dict[str, Any]],
+    fingerprint: str,
+    served_provider: str,
+) -> str:
+    """
+    Fingerprint to save an analysis under.
+
+    Lookups use the model of the requested (or, for 'auto', primary)
+    provider; an analysis served by the fallback provider is keyed on the
+    model that actually generated it.
+    """
+    if served_provider == AIServiceFactory.resolve_provider(request.ai_provider):
+        return fingerprint
+    return compute_analysis_fingerprint(
+        check,
+        language=request.language,
+        model=AIServiceFactory.get_model_name(served_provider),
+        agent_info=agent_info,
+    )
+
+
+async def _translate_from_cache(
+    repo: AsyncAnalysisRepository,
+    request: AnalysisRequest,
+    check: Dict[str, Any],
+    agent_info: Optional[Dict[str, Any]],
+    agent_name: str,
+    http_request: Request,
+    start_time: datetime,
+) -> Optional[Tuple[AnalysisHistory, Dict[str, Any]]]:
+    """
+    Derive the requested language from a cached analysis in the other one.
+
+    Looks up the other language's fingerprint (agent-specific, then shared)
+    and translates the report prose (see ai/translation.py). The result is
+    saved under the request's fingerprint, linked to its source row, so it
+    is served from cache like any other analysis.
+
+    Returns:
+        Tuple of (saved analysis, translation result), or None when there is
+        nothing to translate or the translation failed
+
+    Raises:
+        ClientDisconnectedError: If the client disconnected during the translation
+    """
+    if not (settings.enable_analysis_cache and settings.enable_cache_translation):
+        return None
+
+    source_language = "en" if request.language == "pt" else "pt"
+    source_fingerprint = compute_analysis_fingerprint(
+        check,
+        language=source_language,
+        model=AIServiceFactory.get_model_name(request.ai_provider),
+        agent_info=agent_info,
+    )
+    source = await repo.find_cached_analysis(
+        agent_id=request.agent_id, fingerprint=source_fingerprint
+    ) or await repo.find_cached_analysis_by_fingerprint(fingerprint=source_fingerprint)
+    if not source or not source.report_text:
+        return None
+
+    logger.info(
+        f"🌐 Translating cached analysis: check={request.check_id}, "
+        f"{source_language} -> {request.language}, source={source.id}"
+    )
+    try:
+        ai_service = AIServiceFactory.create(request.ai_provider, tenant=request.agent_id)
+        result = await _cancel_on_disconnect(
+            http_request,
+            ai_service.translate_report(
+                source.report_text, source_language, request.language, agent_info=agent_info
+            ),
+        )
+    except AIServiceError as e:
+        logger.warning(f"⚠️ Translation of cached analysis failed ({e}); analyzing from scratch")
+        return None
+
+    # The fingerprint's model is that of the source analysis; the provider
+    # (and llm_metrics) are those of the translation call, so the LLM call
+    # stats credit the model that actually ran
+    analysis = await repo.save_analysis(
+        agent_id=request.agent_id,
+        agent_name=agent_name,
+        policy_id=request.policy_id,
+        check_id=request.check_id,
+        check_title=check.get("title", "Unknown"),
+        check_description=check.get("description"),
+        language=request.language,
+        ai_provider=result.get("ai_provider", AIServiceFactory.resolve_provider(request.ai_provider)),
+        report_text=result["report"],
+        status="completed",
+        execution_time=(datetime.utcnow() - start_time).total_seconds(),
+        remediation_script=result.get("remediation_script"),
+        analysis_fingerprint=compute_analysis_fingerprint(
+            check,
+            language=request.language,
+            model=AIServiceFactory.get_model_name(request.ai_provider),
+            agent_info=agent_info,
+        ),
+        routing_decision=result.get("routing_decision"),
+        llm_metrics=result.get("llm_metrics"),
+        source_analysis_id=source.id,
+    )
+    return analysis, result
+
+
+async def _find_similar_analysis(
+    repo: AsyncAnalysisRepository,
+    request: AnalysisRequest,
+    check: Dict[str, Any],
+    agent_info: Optional[Dict[str, Any]],
+) -> Optional[Tuple[AnalysisHistory, float]]:
+    """
+    Find the analysis of a similar check for a cache miss (see ai/similarity.py).
+
+    Returns:
+        Tuple of (similar analysis, estimated similarity), or None when
+        similarity lookups are off or nothing is similar enough
+    """
+    if not settings.enable_analysis_cache or settings.similarity_mode not in (SIMILARITY_REUSE, SIMILARITY_SEED):
+        return None
+
+    found = await similarity_index.find_similar(
+        check.get("title"), check.get("description"), request.language, agent_info
+    )
+    if not found:
+        return None
+    similar = await repo.get_by_id(found[0])
+    if not similar or similar.status != "completed":
+        return None
+
+    logger.info(
+        f"🧭 Similar analysis found ({settings.similarity_mode}): check={request.check_id} ~ "
+        f"check={similar.check_id} of {similar.policy_id}, similarity={found[1]:.2f}"
+    )
+    return similar, found[1]
+
+
+async def _reuse_similar_analysis(
+    repo: AsyncAnalysisRepository,
+    request: AnalysisRequest,
+    check: Dict[str, Any],
+    agent_name: str,
+    fingerprint: str,
+    similar: AnalysisHistory,
+    start_time: datetime,
+) -> AnalysisHistory:
+    """Save the analysis of a similar check as this request's cache entry."""
+    return await repo.save_analysis(
+        agent_id=request.agent_id,
+        agent_name=agent_name,
+        policy_id=request.policy_id,
+        check_id=request.check_id,
+        check_title=check.get("title", "Unknown"),
+        check_description=check.get("description"),
+        language=request.language,
+        ai_provider=similar.ai_provider,
+        report_text=similar.report_text,
+        status="completed",
+        execution_time=(datetime.utcnow() - start_time).total_seconds(),
+        remediation_script=_cached_script_data(similar),
+        analysis_fingerprint=fingerprint,
+        source_analysis_id=similar.id,
+    )
+
+
+@router.post("", response_model=AnalysisResponse)
+async def analyze_check(
+    request: AnalysisRequest, http_request: Request, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Analyze a single SCA check using AI with intelligent caching.
+
+    This endpoint:
+    1. Checks for cached analysis (if enabled)
+    2. Returns cached result if valid
+    3. Translates a cached analysis in the other language, if there is one
+    4. Reuses the analysis of a similar check, or uses it as a reference
+       for the new analysis (see ``similarity_mode``)
+    5. Performs new analysis if no cache or cache expired
+    6. Saves new analysis to history
+
+    If the client disconnects while the analysis runs, the LLM request is
+    cancelled and the analysis is saved as failed.
+
+    Args:
+        request: Analysis request parameters
+        http_request: Incoming HTTP request (to detect client disconnects)
+        db: Database session
+
+    Returns:
+        AI-generated analysis report (cached or fresh)
+    """
+    start_time = datetime.utcnow()
+    repo = AsyncAnalysisRepository(db)
+
+    try:
+        # Get check details from Wazuh
+        check = await wazuh_client.get_check_details(
+            request.agent_id, request.policy_id, request.check_id
+        )
+
+        # Get agent information for context
+        agents = await wazuh_client.get_agents()
+        agent_info = next((a for a in agents if a["id"] == request.agent_id), None)
+        agent_name = agent_info.get("name") if agent_info else request.agent_id
+
+        # Content-addressed cache key over the prompt-relevant inputs
+        fingerprint = compute_analysis_fingerprint(
+            check,
+            language=request.language,
+            model=AIServiceFactory.get_model_name(request.ai_provider),
+            agent_info=agent_info,
+        )
+
+        # Try to get cached analysis first (agent-specific, then shared)
+        cached, cache_type, cached_script = await _lookup_cached_analysis(
+            repo, request, check, agent_name, fingerprint, start_time
+        )
+        if cached:
+            return AnalysisResponse(
+                check_id=request.check_id,
+                report=cached.report_text,
+                remediation_script=cached_script,
+                ai_provider=cached.ai_provider,
+                language=request.language,
+                cached_from_agent=cached.agent_name if cache_type == "shared" else None,
+                source_analysis_id=cached.source_analysis_id,
+            )
+
+        # Cached in the other language - translate it
+        translated = await _translate_from_cache(
+            repo, request, check, agent_info, agent_name, http_request, start_time
+        )
+        if translated:
+            analysis, result = translated
+            return AnalysisResponse(
+                check_id=request.check_id,
+                report=analysis.report_text,
+                remediation_script=result.get("remediation_script"),
+                ai_provider=analysis.ai_provider,
+                routing_decision=analysis.routing_decision,
+                language=request.language,
+                source_analysis_id=analysis.source_analysis_id,
+            )
+
+        # Similar check analyzed before - reuse it or pass it as a reference
+        similar = await _find_similar_analysis(repo, request, check, agent_info)
+        similarity = similar[1] if similar else None
+        if similar and settings.similarity_mode == SIMILARITY_REUSE:
+            analysis = await _reuse_similar_analysis(
+                repo, request, check, agent_name, fingerprint, similar[0], start_time
+            )
+            return AnalysisResponse(
+                check_id=request.check_id,
+                report=analysis.report_text,
+                remediation_script=_cached_script_data(analysis),
+                ai_provider=analysis.ai_provider,
+                language=request.language,
+                source_analysis_id=analysis.source_analysis_id,
+                similarity=similarity,
+            )
+        if similar:
+            check = {**check, "reference_report": similar[0].report_text}
+
+        # No cache - perform new analysis
+        logger.info(
+            f"🔍 NEW analysis: check={request.check_id}, agent={agent_name}, "
+            f"provider={request.ai_provider.upper()}, language={request.language}"
+        )
+
+        # Create AI service and analyze
+        ai_service = AIServiceFactory.create(request.ai_provider, tenant=request.agent_id)
+        analysis_result = await _cancel_on_disconnect(
+            http_request,
+            ai_service.analyze_check(check, language=request.language, agent_info=agent_info),
+        )
+
+        # Extract report and script from result
+        report = analysis_result["report"]
+        script_data = analysis_result.get("remediation_script")
+        served_provider = analysis_result.get(
+            "ai_provider", AIServiceFactory.resolve_provider(request.ai_provider)
+        )
+        routing_decision = analysis_result.get("routing_decision")
+
+        # Calculate execution time
+        execution_time = (datetime.utcnow() - start_time).total_seconds()
+
+        # Save to history (including script if generated)
+        await repo.save_analysis(
+            agent_id=request.agent_id,
+            agent_name=agent_name,
+            policy_id=request.policy_id,
+            check_id=request.check_id,
+            check_title=check.get("title", "Unknown"),
+            check_description=check.get("description"),
+            language=request.language,
+            ai_provider=served_provider,
+            report_text=report,
+            status="completed",
+            execution_time=execution_time,
+            remediation_script=script_data,
+            analysis_fingerprint=_served_fingerprint(
+                request, check, agent_info, fingerprint, served_provider
+            ),
+            routing_decision=routing_decision,
+            llm_metrics=analysis_result.get("llm_metrics"),
+            source_analysis_id=similar[0].id if similar else None,
+        )
+
+        logger.info(
+            f"✅ Analysis completed in {execution_time:.2f}s and saved to history"
+            + (f" with script ({script_data['script_language']})" if script_data else "")
+        )
+
+        return AnalysisResponse(
+            check_id=request.check_id,
+            report=report,
+            remediation_script=script_data,
+            ai_provider=served_provider,
+            routing_decision=routing_decision,
+            language=request.language,
+            cached_from_agent=None,
+            source_analysis_id=similar[0].id if similar else None,
+            similarity=similarity,
+        )
+
+    except CheckNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (WazuhAPIError, AIServiceError, ClientDisconnectedError) as e:
+        # Save failed analysis to history
+        if agent_info:
+            try:
+                await repo.save_analysis(
+                    agent_id=request.agent_id,
+                    agent_name=agent_info.get("name", request.agent_id),
+                    policy_id=request.policy_id,
+                    check_id=request.check_id,
+                    check_title=check.get("title", "Unknown") if 'check' in locals() else "Unknown",
+                    language=request.language,
+                    ai_provider=AIServiceFactory.resolve_provider(request.ai_provider),
+                    report_text="",
+                    status="failed",
+                    error_message=str(e),
+                )
+            except Exception as save_error:
+                logger.error(f"Failed to save error to history: {save_error}")
+
+        if isinstance(e, ClientDisconnectedError):
+            raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _replay_chunks(text: str, size: int = 256) -> List[str]:
+    """Split a stored report into line-aligned chunks for fast SSE replay."""
+    chunks = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        current += line
+        if len(current) >= size:
+            chunks.append(current)
+            current = ""
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event with a JSON payload (safe for multi-line text)."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _save_streamed_analysis(
+    request: AnalysisRequest,
+    check: Dict[str, Any],
+    agent_name: str,
+    fingerprint: str,
+    result: Dict[str, Any],
+    status: str,
+    start_time: datetime,
+    error_message: Optional[str] = None,
+    route: Optional[Tuple[str, Optional[str]]] = None,
+    llm_metrics: Optional[Dict[str, Any]] = None,
+    source_analysis_id: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Persist a streamed analysis once the stream has finished or was interrupted.
+
+    Uses its own session: the request-scoped one is released before the
+    streaming response body is sent.
+
+    Args:
+        route: (serving provider, routing decision); defaults to the requested provider
+        llm_metrics: Metrics of the streamed LLM call, if known
+        source_analysis_id: ID of the similar analysis used as reference, if any
+
+    Returns:
+        ID of the saved history record, or None if saving failed
+    """
+    ai_provider, routing_decision = route or (AIServiceFactory.resolve_provider(request.ai_provider), None)
+    try:
+        async with AsyncSessionLocal() as db:
+            analysis = await AsyncAnalysisRepository(db).save_analysis(
+                agent_id=request.agent_id,
+                agent_name=agent_name,
+                policy_id=request.policy_id,
+                check_id=request.check_id,
+                check_title=check.get("title", "Unknown"),
+                check_description=check.get("description"),
+                language=request.language,
+                ai_provider=ai_provider,
+                report_text=result["report"],
+                status=status,
+                error_message=error_message,
+                execution_time=(datetime.utcnow() - start_time).total_seconds(),
+                remediation_script=result.get("remediation_script"),
+                analysis_fingerprint=fingerprint,
+                routing_decision=routing_decision,
+                llm_metrics=llm_metrics,
+                source_analysis_id=source_analysis_id,
+            )
+            return analysis.id
+    except Exception as e:
+        logger.error(f"Failed to save streamed analysis to history: {e}")
+        return None
+
+
+def _replay_response(report_text: str, metadata: Dict[str, Any]) -> StreamingResponse:
+    """Stream a stored report through the same events as a live analysis."""
+
+    async def replay():
+        parser = ReportStreamParser()
+        for chunk in _replay_chunks(report_text):
+            yield _sse("chunk", {"text": chunk})
+            for event, data in parser.feed(chunk):
+                yield _sse(event, data)
+        for event, data in parser.close():
+            yield _sse(event, data)
+        yield _sse("metadata", metadata)
+        yield _sse("done", {"status": "completed"})
+
+    return StreamingResponse(replay(), media_type="text/event-stream")
+
+
+@router.post("/stream")
+async def analyze_check_stream(
+    request: AnalysisRequest, http_request: Request, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Analyze a check with streaming response.
+
+    The response is a server-sent events stream with JSON payloads:
+
+    - ``chunk``: ``{"text"}`` raw report text as it is generated
+    - ``section``: ``{"title", "content"}`` once a report section is complete
+    - ``script``: ``{"index", "language", "content"}`` as soon as a fenced
+      code block closes
+    - ``metadata``: ``{"check_id", "ai_provider", "routing_decision", "language",
+      "cached", "cached_from_agent", "source_analysis_id", "similarity",
+      "analysis_id", "remediation_script"}``
+    - ``error``: ``{"detail"}`` if the analysis fails mid-stream
+    - ``done``: ``{"status"}`` last event of every stream
+
+    Cached analyses are replayed immediately through the same events, as are
+    analyses translated from a cached one in the other language and reused
+    analyses of similar checks. New analyses are saved to history when the stream ends; an interrupted stream
+    (error or client disconnect) is saved as failed with the partial report.
+    A client disconnect also closes the upstream LLM stream, which stops the
+    generation.
+
+    Args:
+        request: Analysis request parameters
+        http_request: Incoming HTTP request (to detect client disconnects)
+        db: Database session
+
+    Returns:
+        Server-sent events stream of analysis
+    """
+    start_time = datetime.utcnow()
+    repo = AsyncAnalysisRepository(db)
+
+    try:
+        # Get check details
+        check = await wazuh_client.get_check_details(
+            request.agent_id, request.policy_id, request.check_id
+        )
+
+        # Get agent information for context
+        agents = await wazuh_client.get_agents()
+        agent_info = next((a for a in agents if a["id"] == request.agent_id), None)
+        agent_name = agent_info.get("name") if agent_info else request.agent_id
+
+        fingerprint = compute_analysis_fingerprint(
+            check,
+            language=request.language,
+            model=AIServiceFactory.get_model_name(request.ai_provider),
+            agent_info=agent_info,
+        )
+
+        cached, cache_type, cached_script = await _lookup_cached_analysis(
+            repo, request, check, agent_name, fingerprint, start_time
+        )
+        if cached:
+            return _replay_response(cached.report_text, {
+                "check_id": request.check_id,
+                "ai_provider": cached.ai_provider,
+                "routing_decision": None,
+                "language": request.language,
+                "cached": True,
+                "cached_from_agent": cached.agent_name if cache_type == "shared" else None,
+                "source_analysis_id": cached.source_analysis_id,
+                "similarity": None,
+                "analysis_id": cached.id,
+                "remediation_script": cached_script,
+            })
+
+        translated = await _translate_from_cache(
+            repo, request, check, agent_info, agent_name, http_request, start_time
+        )
+        if translated:
+            analysis, result = translated
+            return _replay_response(analysis.report_text, {
+                "check_id": request.check_id,
+                "ai_provider": analysis.ai_provider,
+                "routing_decision": analysis.routing_decision,
+                "language": request.language,
+                "cached": False,
+                "cached_from_agent": None,
+                "source_analysis_id": analysis.source_analysis_id,
+                "similarity": None,
+                "analysis_id": analysis.id,
+                "remediation_script": result.get("remediation_script"),
+            })
+
+        similar = await _find_similar_analysis(repo, request, check, agent_info)
+        similarity = similar[1] if similar else None
+        source_analysis_id = similar[0].id if similar else None
+        if similar and settings.similarity_mode == SIMILARITY_REUSE:
+            analysis = await _reuse_similar_analysis(
+                repo, request, check, agent_name, fingerprint, similar[0], start_time
+            )
+            return _replay_response(analysis.report_text, {
+                "check_id": request.check_id,
+                "ai_provider": analysis.ai_provider,
+                "routing_decision": None,
+                "language": request.language,
+                "cached": False,
+                "cached_from_agent": None,
+                "source_analysis_id": source_analysis_id,
+                "similarity": similarity,
+                "analysis_id": analysis.id,
+                "remediation_script": _cached_script_data(analysis),
+            })
+        if similar:
+            check = {**check, "reference_report": similar[0].report_text}
+
+        logger.info(
+            f"🔍 NEW streamed analysis: check={request.check_id}, agent={agent_name}, "
+            f"provider={request.ai_provider.upper()}, language={request.language}"
+        )
+
+        # Create AI service
+        ai_service = AIServiceFactory.create(request.ai_provider, tenant=request.agent_id)
+
+        def route() -> Tuple[str, Optional[str]]:
+            """Provider that served the stream and the routing decision ('auto' only)."""
+            last_route = getattr(ai_service, "last_route", None)
+            return last_route or (AIServiceFactory.resolve_provider(request.ai_provider), None)
+
+        # Stream analysis, accumulating the report for history
+        async def generate():
+            parser = ReportStreamParser()
+            chunks: List[str] = []
+            saved = False
+            error_message = None
+            try:
+                # aclosing: an interrupted stream closes the upstream request
+                # (and records its metrics) before the partial report is saved
+                async with aclosing(ai_service.analyze_check_stream(
+                    check,
+                    language=request.language,
+                    agent_info=agent_info
+                )) as stream:
+                    async for chunk in stream:
+                        chunks.append(chunk)
+                        yield _sse("chunk", {"text": chunk})
+                        for event, data in parser.feed(chunk):
+                            yield _sse(event, data)
+                for event, data in parser.close():
+                    yield _sse(event, data)
+
+                result = ai_service._finalize_report(
+                    "".join(chunks), request.language, agent_info, parser=parser
+                )
+                served_provider, routing_decision = route()
+                analysis_id = await _save_streamed_analysis(
+                    request, check, agent_name,
+                    _served_fingerprint(request, check, agent_info, fingerprint, served_provider),
+                    result, "completed", start_time,
+                    route=(served_provider, routing_decision),
+                    llm_metrics=ai_service.last_metrics,
+                    source_analysis_id=source_analysis_id,
+                )
+                saved = True
+
+                yield _sse("metadata", {
+                    "check_id": request.check_id,
+                    "ai_provider": served_provider,
+                    "routing_decision": routing_decision,
+                    "language": request.language,
+                    "cached": False,
+                    "cached_from_agent": None,
+                    "source_analysis_id": source_analysis_id,
+                    "similarity": similarity,
+                    "analysis_id": analysis_id,
+                    "remediation_script": result["remediation_script"],
+                })
+                yield _sse("done", {"status": "completed"})
+            except (asyncio.CancelledError, GeneratorExit):
+                error_message = DISCONNECTED_MESSAGE
+                raise
+            except AIServiceError as e:
+                error_message = str(e)
+                yield _sse("error", {"detail": error_message})
+                yield _sse("done", {"status": "failed"})
+            finally:
+                if not saved:
+                    result = (
+                        ai_service._finalize_report("".join(chunks), request.language, agent_info)
+                        if chunks
+                        else {"report": "", "remediation_script": None}
+                    )
+                    # Shielded: a disconnect cancels the stream, not the save
+                    await asyncio.shield(_save_streamed_analysis(
+                        request, check, agent_name, fingerprint, result, "failed", start_time,
+                        error_message or "Stream interrupted before the analysis completed",
+                        route=route(),
+                        llm_metrics=ai_service.last_metrics,
+                        source_analysis_id=source_analysis_id,
+                    ))
+
+        return _ClosingStreamingResponse(generate(), media_type="text/event-stream")
+
+    except CheckNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ClientDisconnectedError as e:
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail=str(e))
+    except (WazuhAPIError, AIServiceError) as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _save_batch_analysis(
+    request: BatchAnalysisRequest,
+    check: Dict[str, Any],
+    agent_info: Optional[Dict[str, Any]],
+    result: Dict[str, Any],
+) -> None:
+    """Save one analysis of a batch to history under its single-check fingerprint."""
+    served_provider = result.get("ai_provider", AIServiceFactory.resolve_provider(request.ai_provider))
+    try:
+        async with AsyncSessionLocal() as db:
+            await AsyncAnalysisRepository(db).save_analysis(
+                agent_id=request.agent_id,
+                agent_name=agent_info.get("name", request.agent_id) if agent_info else request.agent_id,
+                policy_id=request.policy_id,
+                check_id=check["id"],
+                check_title=check.get("title", "Unknown"),
+                check_description=check.get("description"),
+                language=request.language,
+                ai_provider=served_provider,
+                report_text=result["report"],
+                status="completed",
+                remediation_script=result.get("remediation_script"),
+                analysis_fingerprint=compute_analysis_fingerprint(
+                    check,
+                    language=request.language,
+                    model=AIServiceFactory.get_model_name(served_provider),
+                    agent_info=agent_info,
+                ),
+                routing_decision=result.get("routing_decision"),
+                llm_metrics=result.get("llm_metrics"),
+            )
+    except Exception as e:
+        logger.error(f"Failed to save batch analysis of check {check.get('id')} to history: {e}")
+
+
+@router.post("/batch", response_model=BatchAnalysisResponse)
+async def analyze_batch(request: BatchAnalysisRequest, http_request: Request):
+    """
+    Analyze multiple SCA checks.
+
+    With ``packed``, related checks are analyzed together in shared LLM
+    calls (see packing.py). Either way every analysis is saved to history,
+    so later single requests hit the cache.
+
+    The LLM requests are cancelled if the client disconnects.
+
+    Args:
+        request: Batch analysis request
+        http_request: Incoming HTTP request (to detect client disconnects)
+
+    Returns:
+        Results for all checks
+    """
+    results = []
+    successful = 0
+    failed = 0
+
+    # Get agent information once for context
+    try:
+        agents = await wazuh_client.get_agents()
+        agent_info = next((a for a in agents if a["id"] == request.agent_id), None)
+    except Exception as e:
+        logger.warning(f"Failed to get agent info: {e}. Continuing without agent context.")
+        agent_info = None
+
+    # Create AI service once; batch requests queue behind interactive ones
+    try:
+        ai_service = AIServiceFactory.create(
+            request.ai_provider, priority=PRIORITY_BATCH, tenant=request.agent_id
+        )
+    except AIServiceError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # Fetch check details first, then analyze all fetched checks in one batch
+    checks = {}
+    errors = {}
+    for check_id in request.check_ids:
+        try:
+            checks[check_id] = await wazuh_client.get_check_details(
+                request.agent_id, request.policy_id, check_id
+            )
+        except Exception as e:
+            errors[check_id] = e
+
+    try:
+        analyses = await _cancel_on_disconnect(
+            http_request,
+            (ai_service.analyze_checks_packed if request.packed else ai_service.analyze_checks_batch)(
+                list(checks.values()),
+                language=request.language,
+                agent_info=agent_info,
+            ),
+        )
+    except ClientDisconnectedError as e:
+        logger.info(f"🛑 Batch analysis of {len(checks)} checks cancelled: {e}")
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail=str(e))
+    analysis_results = {}
+    for check_id, analysis_result in zip(checks.keys(), analyses):
+        if isinstance(analysis_result, Exception):
+            errors[check_id] = analysis_result
+        else:
+            analysis_results[check_id] = analysis_result
+            await _save_batch_analysis(request, checks[check_id], agent_info, analysis_result)
+
+    for check_id in request.check_ids:
+        if check_id in errors:
+            logger.error(f"Failed to analyze check {check_id}: {errors[check_id]}")
+            results.append(
+                AnalysisResponse(
+                    check_id=check_id,
+                    report=f"Error: {str(errors[check_id])}",
+                    remediation_script=None,
+                    ai_provider=AIServiceFactory.resolve_provider(request.ai_provider),
+                    language=request.language,
+                )
+            )
+            failed += 1
+            continue
+
+        # Extract report and script from result
+        analysis_result = analysis_results[check_id]
+        results.append(
+            AnalysisResponse(
+                check_id=check_id,
+                report=analysis_result["report"],
+                remediation_script=analysis_result.get("remediation_script"),
+                ai_provider=analysis_result.get(
+                    "ai_provider", AIServiceFactory.resolve_provider(request.ai_provider)
+                ),
+                routing_decision=analysis_result.get("routing_decision"),
+                language=request.language,
+            )
+        )
+        successful += 1
+
+    return BatchAnalysisResponse(
+        results=results, total=len(request.check_ids), successful=successful, failed=failed
+    )
+
+
+@router.get("/providers")
+async def get_ai_providers():
+    """
+    Get list of available AI providers.
+
+    Returns:
+        List of available AI provider names
+    """
+    return {"providers": AIServiceFactory.get_available_providers()}
+
+
+@router.get("/vllm/endpoints")
+async def get_vllm_endpoints():
+    """
+    Get load, latency and health statistics of every vLLM endpoint.
+
+    Returns:
+        Per-endpoint statistics (outstanding requests, p50/p95 latency, errors, health)
+    """
+    return {
+        "endpoints": vllm_pool.get_stats(),
+        "healthy": vllm_pool.healthy_count(),
+        "total": len(vllm_pool.endpoints),
+    }
+
+
+@router.get("/scheduler")
+async def get_scheduler_stats():
+    """
+    Get LLM request scheduler statistics.
+
+    Returns:
+        Per provider and priority class: running and queued requests,
+        queued tenants and p50/p95/max wait time for a slot
+    """
+    return scheduler_stats()
+
+
+@router.get("/precompute")
+async def get_precompute_stats():
+    """
+    Get background precompute worker statistics.
+
+    Returns:
+        Worker state, GPU budget usage and the summary of the last run
+    """
+    return precompute_worker.get_stats()
+
+
+@router.post("/precompute/run", status_code=202)
+async def run_precompute(
+    background_tasks: BackgroundTasks,
+    force: bool = Query(False, description="Ignore the GPU budget and the time window"),
+):
+    """
+    Start a precompute run now (e.g. right after a scan).
+
+    Like scheduled runs, the run respects the GPU budget and time window
+    unless `force` is set, and needs the analysis cache to be enabled.
+
+    Args:
+        background_tasks: FastAPI background tasks
+        force: Ignore the GPU budget and the time window
+
+    Returns:
+        Worker statistics at the time the run was scheduled
+    """
+    error = precompute_worker.configuration_error()
+    if error:
+        raise HTTPException(status_code=409, detail=f"Precompute is unavailable: {error}")
+    if precompute_worker.get_stats()["running"]:
+        raise HTTPException(status_code=409, detail="A precompute run is already in progress")
+    background_tasks.add_task(precompute_worker.run_once, force)
+    return precompute_worker.get_stats()
+
+
+@router.get("/status")
+async def get_ai_status():
+    """
+    Get status of AI providers based on AI_MODE configuration.
+
+    Returns:
+        Status of each AI provider
+    """
+    from app.config import settings
+    import httpx
+
+    status = {
+        "ai_mode": settings.ai_mode,
+        "vllm": {
+            "available": False,
+            "enabled": settings.ai_mode in ["local", "mixed"],
+            "url": settings.vllm_api_url,
+            "model": settings.vllm_model,
+            "type": "Local LLM",
+        },
+        "openai": {
+            "available": bool(settings.openai_api_key),
+            "enabled": settings.ai_mode in ["external", "mixed"],
+            "model": settings.openai_model if settings.openai_api_key else None,
+            "type": "Cloud API",
+            "rate_limit": openai_rate_limiter.get_stats(),
+        },
+        "token_budget": {
+            "max_model_len": settings.max_model_len,
+            "max_tokens": settings.ai_max_tokens,
+            "learned_output_tokens": token_budget.get_stats(),
+        },
+        "routing": hedging_stats() if settings.ai_mode == "mixed" else None,
+        "scheduler": scheduler_stats(),
+        "cancelled_generations": cancellation_stats.get_stats(),
+        "precompute": precompute_worker.get_stats(),
+        "similarity": similarity_index.get_stats(),
+        "prompt_templates": prompt_registry.get_stats(),
+        "history_writer": history_writer.get_stats(),
+    }
+
+    # Test vLLM connection only if enabled
+    if settings.ai_mode in ["local", "mixed"]:
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.get(f"{vllm_pool.select().url}/models")
+                if response.status_code == 200:
+                    status["vllm"]["available"] = True
+                    status["vllm"]["models"] = response.json().get("data", [])
+        except Exception as e:
+            status["vllm"]["error"] = str(e)
+        status["vllm"]["endpoints"] = vllm_pool.get_stats()
+
+    return status
+
+
+@router.get("/system-status")
+async def get_system_status():
+    """
+    Get comprehensive system status including Wazuh API and AI providers.
+
+    Returns:
+        Complete system status
+    """
+    from app.config import settings
+    import httpx
+
+    status = {
+        "wazuh": {
+            "available": False,
+            "url": settings.wazuh_api_url,
+            "error": None,
+        },
+        "ai_mode": settings.ai_mode,
+        "vllm": {
+            "available": False,
+            "enabled": settings.ai_mode in ["local", "mixed"],
+            "url": settings.vllm_api_url,
+            "model": settings.vllm_model,
+            "type": "Local LLM",
+            "error": None,
+        },
+        "openai": {
+            "available": bool(settings.openai_api_key),
+            "enabled": settings.ai_mode in ["external", "mixed"],
+            "model": settings.openai_model if settings.openai_api_key else None,
+            "type": "Cloud API",
+            "error": None,
+        },
+    }
+
+    # Test Wazuh API connection
+    try:
+        token = await wazuh_client._get_token()
+        if token:
+            status["wazuh"]["available"] = True
+    except Exception as e:
+        status["wazuh"]["error"] = str(e)
+        logger.error(f"Wazuh API health check failed: {e}")
+
+    # Test vLLM connection only if enabled
+    if settings.ai_mode in ["local", "mixed"]:
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.get(f"{vllm_pool.select().url}/models")
+                if response.status_code == 200:
+                    status["vllm"]["available"] = True
+                    status["vllm"]["models"] = response.json().get("data", [])
+        except Exception as e:
+            status["vllm"]["error"] = str(e)
+        status["vllm"]["endpoints"] = vllm_pool.get_stats()
+
+    # Test OpenAI API if configured
+    if settings.ai_mode in ["external", "mixed"] and settings.openai_api_key:
+        try:
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(api_key=settings.openai_api_key)
+            # Simple test to verify API key
+            models = await client.models.list()
+            if models:
+                status["openai"]["available"] = True
+        except Exception as e:
+            status["openai"]["error"] = str(e)
+            status["openai"]["available"] = False
+
+    return status
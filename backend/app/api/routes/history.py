@@ -1,221 +1,295 @@
-"""Analysis history API endpoints."""
-
-from fastapi import APIRouter, HTTPException, Depends, Query, Path
-from sqlalchemy.orm import Session
-from typing import Optional
-
-from app.models.schemas import (
-    AnalysisHistoryResponse,
-    AnalysisHistoryListResponse,
-    CacheStatsResponse,
-)
-from app.db.session import get_db
-from app.repositories.analysis_repository import AnalysisRepository
-from app.utils.logger import logger
-
-router = APIRouter(prefix="/history", tags=["history"])
-
-
-@router.get("/agent/{agent_id}", response_model=AnalysisHistoryListResponse)
-async def get_agent_history(
-    agent_id: str,
-    limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
-    status: Optional[str] = Query(None, regex="^(pending|completed|failed)$"),
-    db: Session = Depends(get_db),
-):
-    """
-    Get analysis history for a specific agent.
-
-    Args:
-        agent_id: Wazuh agent ID
-        limit: Maximum number of results (1-200)
-        offset: Pagination offset
-        status: Optional status filter
-        db: Database session
-
-    Returns:
-        List of analysis history records
-    """
-    repo = AnalysisRepository(db)
-
-    try:
-        analyses = repo.get_history_by_agent(
-            agent_id=agent_id,
-            limit=limit,
-            offset=offset,
-            status_filter=status,
-        )
-
-        total = repo.count_by_agent(agent_id)
-
-        return AnalysisHistoryListResponse(
-            analyses=[AnalysisHistoryResponse.model_validate(a) for a in analyses],
-            total=total,
-            limit=limit,
-            offset=offset,
-        )
-
-    except Exception as e:
-        logger.error(f"Failed to get agent history: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.get("/check/{agent_id}/{check_id}", response_model=AnalysisHistoryListResponse)
-async def get_check_history(
-    agent_id: str,
-    check_id: int,
-    limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
-):
-    """
-    Get analysis history for a specific check.
-
-    Args:
-        agent_id: Wazuh agent ID
-        check_id: SCA check ID
-        limit: Maximum number of results
-        db: Database session
-
-    Returns:
-        List of analysis history records for the check
-    """
-    repo = AnalysisRepository(db)
-
-    try:
-        analyses = repo.get_history_by_check(
-            agent_id=agent_id,
-            check_id=check_id,
-            limit=limit,
-        )
-
-        return AnalysisHistoryListResponse(
-            analyses=[AnalysisHistoryResponse(**a.to_dict()) for a in analyses],
-            total=len(analyses),
-            limit=limit,
-            offset=0,
-        )
-
-    except Exception as e:
-        logger.error(f"Failed to get check history: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.get("/{analysis_id}", response_model=AnalysisHistoryResponse)
-async def get_analysis_by_id(
-    analysis_id: str,
-    db: Session = Depends(get_db),
-):
-    """
-    Get a specific analysis by ID.
-
-    Args:
-        analysis_id: Analysis history ID
-        db: Database session
-
-    Returns:
-        Analysis history record
-    """
-    repo = AnalysisRepository(db)
-
-    try:
-        analysis = repo.get_by_id(analysis_id)
-
-        if not analysis:
-            raise HTTPException(status_code=404, detail="Analysis not found")
-
-        return AnalysisHistoryResponse(**analysis.to_dict())
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to get analysis by ID: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.delete("/{analysis_id}")
-async def delete_analysis(
-    analysis_id: str,
-    db: Session = Depends(get_db),
-):
-    """
-    Delete an analysis from history.
-
-    Args:
-        analysis_id: Analysis history ID
-        db: Database session
-
-    Returns:
-        Success message
-    """
-    repo = AnalysisRepository(db)
-
-    try:
-        deleted = repo.delete_analysis(analysis_id)
-
-        if not deleted:
-            raise HTTPException(status_code=404, detail="Analysis not found")
-
-        return {"message": "Analysis deleted successfully", "id": analysis_id}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to delete analysis: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.get("/stats/cache", response_model=CacheStatsResponse)
-async def get_cache_stats(db: Session = Depends(get_db)):
-    """
-    Get cache statistics.
-
-    Args:
-        db: Database session
-
-    Returns:
-        Cache statistics including hit rates and totals
-    """
-    repo = AnalysisRepository(db)
-
-    try:
-        stats = repo.get_cache_stats()
-        return CacheStatsResponse(**stats)
-
-    except Exception as e:
-        logger.error(f"Failed to get cache stats: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.get("/recent", response_model=AnalysisHistoryListResponse)
-async def get_recent_analyses(
-    hours: int = Query(24, ge=1, le=168),  # Max 1 week
-    limit: int = Query(100, ge=1, le=200),
-    db: Session = Depends(get_db),
-):
-    """
-    Get recent analyses across all agents.
-
-    Args:
-        hours: Look back window in hours (1-168, default 24)
-        limit: Maximum number of results (default 100)
-        db: Database session
-
-    Returns:
-        List of recent analysis records
-    """
-    repo = AnalysisRepository(db)
-
-    try:
-        analyses = repo.get_recent_analyses(hours=hours, limit=limit)
-
-        return AnalysisHistoryListResponse(
-            analyses=[AnalysisHistoryResponse(**a.to_dict()) for a in analyses],
-            total=len(analyses),
-            limit=limit,
-            offset=0,
-        )
-
-    except Exception as e:
-        logger.error(f"Failed to get recent analyses: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+"""Analysis history API endpoints."""
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Path
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from app.db.models import AnalysisHistory
+from app.models.schemas import (
+    AnalysisHistoryResponse,
+    AnalysisHistoryListResponse,
+    CacheStatsResponse,
+    LLMCallStatsResponse,
+)
+from app.db.session import get_async_db
+from app.repositories.analysis_repository import HistoryCursor, decode_cursor, encode_cursor
+from app.repositories.async_analysis_repository import AsyncAnalysisRepository
+from app.utils.logger import logger
+
+router = APIRouter(prefix="/history", tags=["history"])
+
+CURSOR_DESCRIPTION = "next_cursor of the previous page (keyset pagination, newest first)"
+
+
+def _parse_cursor(cursor: Optional[str]) -> Optional[HistoryCursor]:
+    """Decode a cursor query parameter, rejecting malformed ones with 400."""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _history_page(
+    analyses: List[AnalysisHistory],
+    limit: int,
+    offset: int = 0,
+    total: Optional[int] = None,
+    total_is_exact: bool = True,
+) -> AnalysisHistoryListResponse:
+    """
+    Build a history page from up to limit + 1 analyses.
+
+    The extra analysis is not returned; it only tells that there is a next
+    page, whose cursor points after the last returned analysis.
+    """
+    page = analyses[:limit]
+    return AnalysisHistoryListResponse(
+        analyses=[AnalysisHistoryResponse(**a.to_dict()) for a in page],
+        total=total,
+        total_is_exact=total_is_exact,
+        limit=limit,
+        offset=offset,
+        next_cursor=encode_cursor(page[-1]) if len(analyses) > limit else None,
+    )
+
+
+@router.get("/agent/{agent_id}", response_model=AnalysisHistoryListResponse)
+async def get_agent_history(
+    agent_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    status: Optional[str] = Query(None, regex="^(pending|completed|failed)$"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    count: str = Query("approximate", regex="^(approximate|exact|none)$"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get analysis history for a specific agent, newest first.
+
+    Pages are fetched with `cursor` (the previous page's next_cursor), which
+    seeks to the position through the agent/date/id index; `offset` still
+    works but reads and discards every skipped row, so deep pages get slower.
+
+    Args:
+        agent_id: Wazuh agent ID
+        limit: Maximum number of results (1-200)
+        offset: Pagination offset (not combinable with cursor)
+        status: Optional status filter
+        cursor: Keyset cursor of the previous page
+        count: How to compute `total`: "approximate" (in-process count,
+            refreshed periodically), "exact" (count query) or "none"
+        db: Database session
+
+    Returns:
+        Page of analysis history records with the cursor of the next page
+    """
+    if cursor and offset:
+        raise HTTPException(status_code=400, detail="Use either cursor or offset, not both")
+    before = _parse_cursor(cursor)
+    repo = AsyncAnalysisRepository(db)
+
+    try:
+        analyses = await repo.get_history_by_agent(
+            agent_id=agent_id,
+            limit=limit + 1,
+            offset=offset,
+            status_filter=status,
+            before=before,
+        )
+
+        total = None
+        if count != "none":
+            total = await repo.count_by_agent(agent_id, status_filter=status, exact=count == "exact")
+
+        return _history_page(
+            analyses, limit, offset=offset, total=total, total_is_exact=count == "exact"
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to get agent history: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/check/{agent_id}/{check_id}", response_model=AnalysisHistoryListResponse)
+async def get_check_history(
+    agent_id: str,
+    check_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get analysis history for a specific check.
+
+    Args:
+        agent_id: Wazuh agent ID
+        check_id: SCA check ID
+        limit: Maximum number of results
+        cursor: Keyset cursor of the previous page
+        db: Database session
+
+    Returns:
+        Page of analysis history records for the check (total counts the page)
+    """
+    before = _parse_cursor(cursor)
+    repo = AsyncAnalysisRepository(db)
+
+    try:
+        analyses = await repo.get_history_by_check(
+            agent_id=agent_id,
+            check_id=check_id,
+            limit=limit + 1,
+            before=before,
+        )
+
+        return _history_page(analyses, limit, total=min(len(analyses), limit))
+
+    except Exception as e:
+        logger.error(f"Failed to get check history: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/recent", response_model=AnalysisHistoryListResponse)
+async def get_recent_analyses(
+    hours: int = Query(24, ge=1, le=168),  # Max 1 week
+    limit: int = Query(100, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get recent analyses across all agents.
+
+    Args:
+        hours: Look back window in hours (1-168, default 24)
+        limit: Maximum number of results (default 100)
+        cursor: Keyset cursor of the previous page
+        db: Database session
+
+    Returns:
+        Page of recent analysis records (total counts the page)
+    """
+    before = _parse_cursor(cursor)
+    repo = AsyncAnalysisRepository(db)
+
+    try:
+        analyses = await repo.get_recent_analyses(hours=hours, limit=limit + 1, before=before)
+
+        return _history_page(analyses, limit, total=min(len(analyses), limit))
+
+    except Exception as e:
+        logger.error(f"Failed to get recent analyses: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{analysis_id}", response_model=AnalysisHistoryResponse)
+async def get_analysis_by_id(
+    analysis_id: str,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get a specific analysis by ID.
+
+    Args:
+        analysis_id: Analysis history ID
+        db: Database session
+
+    Returns:
+        Analysis history record
+    """
+    repo = AsyncAnalysisRepository(db)
+
+    try:
+        analysis = await repo.get_by_id(analysis_id)
+
+        if not analysis:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+
+        return AnalysisHistoryResponse(**analysis.to_dict())
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get analysis by ID: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/{analysis_id}")
+async def delete_analysis(
+    analysis_id: str,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Delete an analysis from history.
+
+    Args:
+        analysis_id: Analysis history ID
+        db: Database session
+
+    Returns:
+        Success message
+    """
+    repo = AsyncAnalysisRepository(db)
+
+    try:
+        deleted = await repo.delete_analysis(analysis_id)
+
+        if not deleted:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+
+        return {"message": "Analysis deleted successfully", "id": analysis_id}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to delete analysis: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stats/cache", response_model=CacheStatsResponse)
+async def get_cache_stats(db: AsyncSession = Depends(get_async_db)):
+    """
+    Get cache statistics.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Cache statistics including hit rates and totals
+    """
+    repo = AsyncAnalysisRepository(db)
+
+    try:
+        stats = await repo.get_cache_stats()
+        return CacheStatsResponse(**stats)
+
+    except Exception as e:
+        logger.error(f"Failed to get cache stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stats/llm", response_model=LLMCallStatsResponse)
+async def get_llm_call_stats(
+    hours: int = Query(24, ge=1, le=720),  # Max 30 days
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get LLM call metrics aggregated per provider and model.
+
+    Args:
+        hours: Look back window in hours (1-720, default 24)
+        db: Database session
+
+    Returns:
+        Call counts and p50/p95/p99 of queue wait, time-to-first-token,
+        generation time and tokens/second per provider and model
+    """
+    repo = AsyncAnalysisRepository(db)
+
+    try:
+        return LLMCallStatsResponse(hours=hours, groups=await repo.get_llm_call_stats(hours=hours))
+
+    except Exception as e:
+        logger.error(f"Failed to get LLM call stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,54 +1,166 @@
-from pydantic_settings import BaseSettings
-from typing import Literal
-
-
-class Settings(BaseSettings):
-    """Application configuration using environment variables."""
-
-    # Wazuh API
-    wazuh_api_url: str = "https://127.0.0.1:55000"
-    wazuh_user: str = "wazuh"
-    wazuh_password: str
-    wazuh_verify_ssl: bool = False
-
-    # AI Mode: "local" (only vLLM), "external" (only OpenAI), "mixed" (both)
-    ai_mode: Literal["local", "external", "mixed"] = "mixed"
-
-    # AI Configuration - vLLM (Local) - Only used if ai_mode is "local" or "mixed"
-    vllm_api_url: str = "http://vllm:8000/v1"
-    vllm_model: str = "meta-llama/Meta-Llama-3-8B-Instruct"
-
-    # AI Configuration - OpenAI (External) - Only used if ai_mode is "external" or "mixed"
-    openai_api_key: str | None = None
-    openai_model: str = "gpt-4"
-    openai_base_url: str = "https://api.openai.com/v1"
-
-    # App settings
-    app_env: Literal["development", "production"] = "development"
-    app_port: int = 8000
-    log_level: str = "INFO"
-    secret_key: str
-
-    # Database (optional)
-    database_url: str = "sqlite:///./sca_history.db"
-
-    # Redis (optional)
-    enable_redis_cache: bool = False
-    redis_url: str | None = None
-
-    # Redis TTL (Time To Live) in seconds - Customizable per resource type
-    redis_ttl_default: int = 3600    # Default TTL (1 hour)
-    redis_ttl_agents: int = 300      # Agents cache (5 minutes)
-    redis_ttl_policies: int = 600    # Policies cache (10 minutes)
-    redis_ttl_checks: int = 300      # Checks cache (5 minutes)
-
-    # Analysis History & Cache
-    enable_analysis_cache: bool = True
-    analysis_cache_ttl_hours: int = 24  # Cache analysis results for 24 hours
-
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
-
-
-settings = Settings()
+from pydantic_settings import BaseSettings
+from typing import Literal
+
+
+class Settings(BaseSettings):
+    """Application configuration using environment variables."""
+
+    # Wazuh API
+    wazuh_api_url: str = "https://127.0.0.1:55000"
+    wazuh_user: str = "wazuh"
+    wazuh_password: str
+    wazuh_verify_ssl: bool = False
+
+    # AI Mode: "local" (only vLLM), "external" (only OpenAI), "mixed" (both)
+    ai_mode: Literal["local", "external", "mixed"] = "mixed"
+
+    # AI Configuration - vLLM (Local) - Only used if ai_mode is "local" or "mixed"
+    vllm_api_url: str = "http://vllm:8000/v1"
+    vllm_model: str = "meta-llama/Meta-Llama-3-8B-Instruct"
+
+    # Several vLLM servers (comma-separated base URLs) are balanced by least
+    # outstanding requests; defaults to vllm_api_url. Endpoints are ejected
+    # after consecutive failures and readmitted when /models answers again.
+    vllm_api_urls: str = ""
+    vllm_health_check_interval_seconds: float = 10.0
+    vllm_eject_after_failures: int = 3
+
+    # Prompt layout: stable instruction prefix first, per-check data last, so
+    # vLLM automatic prefix caching (and OpenAI prompt caching) can reuse it
+    enable_prompt_prefix_caching: bool = True
+
+    # Structured output: request a JSON report (vLLM guided decoding / OpenAI
+    # JSON mode), validate it and render the markdown report server-side
+    ai_structured_output: bool = False
+
+    # Batch analysis: prompts per multi-prompt vLLM request, and concurrent
+    # single-check calls for providers without multi-prompt support
+    vllm_batch_size: int = 8
+    ai_batch_concurrency: int = 4
+    # Packed batch analysis: related checks of one agent analyzed together in
+    # one LLM call, at most this many per call
+    ai_pack_size: int = 4
+
+    # LLM request scheduler (per provider): total concurrent requests, and caps
+    # for the batch and background classes; interactive analyses may use every
+    # slot, so keep batch + background below the total to reserve capacity
+    ai_max_concurrency: int = 16
+    ai_batch_max_concurrency: int = 8
+    ai_background_max_concurrency: int = 4
+
+    # Token budgeting: max_tokens is picked per request from the output
+    # lengths observed for the check's policy, capped by the vLLM context
+    # window (MAX_MODEL_LEN) minus the prompt
+    max_model_len: int = 4096
+    ai_max_tokens: int = 3072  # Upper bound, and the value used until enough history exists
+    ai_min_max_tokens: int = 512
+    ai_output_percentile: float = 0.95
+    ai_output_headroom: float = 1.2
+    ai_output_min_samples: int = 20
+    ai_output_stats_refresh_seconds: int = 600
+    # Oversized rationale/remediation/reason fields are truncated (0 disables)
+    prompt_field_max_tokens: int = 400
+
+    # Routing provider "auto" (mixed mode): send to the primary provider,
+    # hedge to the other one once the primary exceeds its rolling p95 latency,
+    # and fail over on errors
+    ai_routing_primary: Literal["vllm", "openai"] = "vllm"
+    enable_ai_hedging: bool = True
+    ai_hedge_min_delay_seconds: float = 2.0
+    ai_hedge_default_delay_seconds: float = 30.0  # Until enough latency samples exist
+    ai_hedge_window: int = 100
+    ai_hedge_min_samples: int = 20
+
+    # AI Configuration - OpenAI (External) - Only used if ai_mode is "external" or "mixed"
+    openai_api_key: str | None = None
+    openai_model: str = "gpt-4"
+    openai_base_url: str = "https://api.openai.com/v1"
+
+    # Client-side OpenAI rate limits (0 = unlimited). Starting values only:
+    # they are replaced by the account limits reported in x-ratelimit-* headers
+    openai_rpm_limit: int = 500
+    openai_tpm_limit: int = 30000
+    # Retries of 429 responses (after the server-suggested delay)
+    openai_rate_limit_max_retries: int = 6
+
+    # App settings
+    app_env: Literal["development", "production"] = "development"
+    app_port: int = 8000
+    log_level: str = "INFO"
+    secret_key: str
+
+    # Database (optional)
+    database_url: str = "sqlite:///./sca_history.db"
+
+    # Connection pool per process (and per uvicorn worker): at most
+    # pool_size + max_overflow connections; waits pool_timeout seconds for one
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: int = 30
+    database_pool_recycle: int = 1800  # Seconds before a pooled connection is replaced
+
+    # SQLite profile, applied to every new connection: WAL lets readers and
+    # one writer work concurrently, and writers wait up to busy_timeout for
+    # the lock instead of failing with "database is locked"
+    sqlite_journal_mode: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"] = "WAL"
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 65536  # Page cache per connection
+    sqlite_mmap_size_mb: int = 256  # Memory-mapped I/O (0 disables)
+
+    # Write-behind history: new analyses are queued and inserted in one
+    # transaction once max_rows are waiting or every interval; the queue is
+    # flushed on shutdown
+    history_write_behind: bool = True
+    history_flush_max_rows: int = 100
+    history_flush_interval_ms: int = 250
+
+    # Approximate history page totals: per-agent counts are kept in process
+    # and re-queried after this many seconds (see history_counts.py)
+    history_count_refresh_seconds: int = 300
+
+    # Redis (optional)
+    enable_redis_cache: bool = False
+    redis_url: str | None = None
+
+    # Redis TTL (Time To Live) in seconds - Customizable per resource type
+    redis_ttl_default: int = 3600    # Default TTL (1 hour)
+    redis_ttl_agents: int = 300      # Agents cache (5 minutes)
+    redis_ttl_policies: int = 600    # Policies cache (10 minutes)
+    redis_ttl_checks: int = 300      # Checks cache (5 minutes)
+
+    # Analysis History & Cache
+    enable_analysis_cache: bool = True
+    analysis_cache_ttl_hours: int = 24  # Cache analysis results for 24 hours
+    # Serve the second report language by translating a cached analysis in
+    # the other language (prose only; scripts are kept verbatim)
+    enable_cache_translation: bool = True
+    # Cache misses look up analyses of similar checks (e.g. the same CIS rule
+    # under another policy version): "seed" passes the closest one to the
+    # model as a reference, "reuse" serves it as is, "off" disables lookups
+    similarity_mode: Literal["seed", "reuse", "off"] = "seed"
+    # Seed-mode references are cut to this many tokens, and to what the
+    # context window leaves after the prompt and the expected report
+    similarity_reference_max_tokens: int = 1024
+    similarity_threshold: float = 0.8  # estimated Jaccard similarity of title + description
+    similarity_refresh_seconds: int = 300
+
+    # Background precomputation: analyses for newly failed checks are
+    # generated ahead of time at background priority, so interactive
+    # requests hit the cache
+    enable_precompute: bool = False
+    precompute_interval_seconds: int = 900
+    # Local time window "HH:MM-HH:MM" (may wrap midnight); empty = any time
+    precompute_window: str = ""
+    # GPU budget: generation seconds per rolling hour (0 = unlimited)
+    precompute_gpu_seconds_per_hour: float = 600.0
+    precompute_max_analyses_per_run: int = 200
+    precompute_languages: str = "en"  # comma-separated
+    precompute_ai_provider: str = "vllm"
+
+    class Config:
+        env_file = ".env"
+        case_sensitive = False
+
+
+settings = Settings()
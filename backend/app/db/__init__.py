@@ -1,6 +1,6 @@
-"""Database package."""
-
-from app.db.base import Base
-from app.db.session import get_db, engine
-
-__all__ = ["Base", "get_db", "engine"]
+"""Database package."""
+
+from app.db.base import Base
+from app.db.session import get_db, get_async_db, engine, async_engine
+
+__all__ = ["Base", "get_db", "get_async_db", "engine", "async_engine"]
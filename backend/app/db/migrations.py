@@ -0,0 +1,195 @@
+"""
+Lightweight schema migrations for existing databases.
+
+`Base.metadata.create_all` creates missing tables but never alters existing
+ones, so databases created by older versions need new columns and indexes
+added explicitly. Each migration runs once and is recorded in the
+`schema_migrations` table. Migrations must be idempotent because fresh
+databases already get the full schema from `create_all`.
+
+The DDL is built through SQLAlchemy (inspection, `Table.create`, types
+compiled by the dialect) rather than backend-specific SQL such as
+`IF NOT EXISTS`, so it runs on every backend in session.ASYNC_DRIVERS.
+"""
+
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import (
+    Column, DateTime, Float, Integer, MetaData, String, Table, column, inspect, or_, select, table, text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.types import TypeEngine
+
+from app.db.models import AnalysisContent, content_hash, insert_contents
+from app.utils.logger import logger
+
+
+def _has_column(conn: Connection, table_name: str, column_name: str) -> bool:
+    """Check whether a column exists on a table."""
+    return column_name in {col["name"] for col in inspect(conn).get_columns(table_name)}
+
+
+# Applied migrations (created on first run; not part of the ORM models)
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _add_column(conn: Connection, table_name: str, column_name: str, column_type: TypeEngine) -> None:
+    """Add a nullable column to a table if it does not exist yet."""
+    if not _has_column(conn, table_name, column_name):
+        quote = conn.dialect.identifier_preparer.quote
+        # SQL Server's ALTER TABLE has no COLUMN keyword
+        add = "ADD" if conn.dialect.name == "mssql" else "ADD COLUMN"
+        conn.execute(text(
+            f"ALTER TABLE {quote(table_name)} {add} {quote(column_name)} "
+            f"{column_type.compile(dialect=conn.dialect)}"
+        ))
+        logger.info(f"Added column {table_name}.{column_name}")
+
+
+def _create_index(conn: Connection, name: str, table_name: str, columns: str) -> None:
+    """Create an index if it does not exist yet."""
+    if name not in {index["name"] for index in inspect(conn).get_indexes(table_name)}:
+        conn.execute(text(f"CREATE INDEX {name} ON {table_name} ({columns})"))
+
+
+def _001_analysis_fingerprint(conn: Connection) -> None:
+    """
+    Add the content-addressed cache key to analysis history.
+
+    Existing rows keep a NULL fingerprint: the check fields and OS details
+    that the fingerprint covers were never stored, so old analyses stay in
+    history but are no longer served from cache.
+    """
+    _add_column(conn, "analysis_history", "analysis_fingerprint", String(64))
+    _create_index(
+        conn,
+        "ix_analysis_history_analysis_fingerprint",
+        "analysis_history",
+        "analysis_fingerprint",
+    )
+
+
+def _002_routing_decision(conn: Connection) -> None:
+    """Record how the 'auto' provider routed each analysis."""
+    _add_column(conn, "analysis_history", "routing_decision", String(20))
+
+
+def _003_llm_call_metrics(conn: Connection) -> None:
+    """Add per-call LLM timings and token usage. Existing rows keep NULLs."""
+    for column_name, column_type in (
+        ("llm_model", String(100)),
+        ("llm_endpoint", String(255)),
+        ("queue_wait_seconds", Float()),
+        ("time_to_first_token_seconds", Float()),
+        ("generation_seconds", Float()),
+        ("prompt_tokens", Integer()),
+        ("completion_tokens", Integer()),
+        ("tokens_per_second", Float()),
+    ):
+        _add_column(conn, "analysis_history", column_name, column_type)
+
+
+def _004_source_analysis_id(conn: Connection) -> None:
+    """Link analyses translated from a cached analysis to their source row."""
+    _add_column(conn, "analysis_history", "source_analysis_id", String(36))
+
+
+def _005_prompt_template(conn: Connection) -> None:
+    """Record the prompt template version of each analysis. Existing rows keep NULL."""
+    _add_column(conn, "analysis_history", "prompt_template", String(40))
+
+
+def _006_content_table(conn: Connection) -> None:
+    """
+    Move report and script bodies into the content-addressed analysis_content table.
+
+    Bodies are hashed and stored once (identical bodies of shared-cache
+    copies collapse into one row); history rows keep the hashes, and their
+    inline columns are emptied. SQLite reuses the freed pages for new rows;
+    run VACUUM to shrink the file.
+    """
+    AnalysisContent.__table__.create(conn, checkfirst=True)
+    _add_column(conn, "analysis_history", "report_hash", String(64))
+    _add_column(conn, "analysis_history", "script_hash", String(64))
+    _create_index(conn, "ix_analysis_history_report_hash", "analysis_history", "report_hash")
+    _create_index(conn, "ix_analysis_history_script_hash", "analysis_history", "script_hash")
+
+    history = table("analysis_history", column("id"), column("report_text"), column("remediation_script"))
+    moved = 0
+    stored = set()
+    while True:
+        # Moved rows drop out of the selection (empty report, NULL script)
+        rows = conn.execute(
+            select(history.c.id, history.c.report_text, history.c.remediation_script)
+            .where(or_(history.c.report_text != "", history.c.remediation_script.isnot(None)))
+            .limit(500)
+        ).fetchall()
+        if not rows:
+            break
+
+        contents = {}
+        updates = []
+        for analysis_id, report, script in rows:
+            report_hash = content_hash(report) if report else None
+            script_hash = content_hash(script) if script else None
+            for key, body in ((report_hash, report), (script_hash, script)):
+                if key:
+                    contents[key] = body
+            updates.append({"id": analysis_id, "report_hash": report_hash, "script_hash": script_hash})
+
+        insert_contents(conn, contents)
+        conn.execute(
+            text(
+                "UPDATE analysis_history SET report_hash = :report_hash, script_hash = :script_hash, "
+                "report_text = '', remediation_script = NULL WHERE id = :id"
+            ),
+            updates,
+        )
+        moved += len(rows)
+        stored.update(contents)
+
+    if moved:
+        logger.info(f"Moved the bodies of {moved} analyses into {len(stored)} content rows")
+
+
+def _007_agent_history_index(conn: Connection) -> None:
+    """Index the keyset order of agent history pages (newest first, ties by ID)."""
+    _create_index(conn, "idx_agent_date_id", "analysis_history", "agent_id, analysis_date, id")
+
+
+# Ordered list of (version, description, migration function)
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "analysis_history.analysis_fingerprint", _001_analysis_fingerprint),
+    (2, "analysis_history.routing_decision", _002_routing_decision),
+    (3, "analysis_history LLM call metrics", _003_llm_call_metrics),
+    (4, "analysis_history.source_analysis_id", _004_source_analysis_id),
+    (5, "analysis_history.prompt_template", _005_prompt_template),
+    (6, "analysis_content table", _006_content_table),
+    (7, "analysis_history agent/date/id index", _007_agent_history_index),
+]
+
+
+def run_migrations(engine: Engine) -> None:
+    """Apply pending migrations in order."""
+    with engine.begin() as conn:
+        schema_migrations.create(conn, checkfirst=True)
+        applied = set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+    for version, description, migration in MIGRATIONS:
+        if version in applied:
+            continue
+
+        with engine.begin() as conn:
+            migration(conn)
+            conn.execute(
+                schema_migrations.insert(),
+                {"version": version, "description": description, "applied_at": datetime.utcnow()},
+            )
+        logger.info(f"Applied migration {version:03d}: {description}")
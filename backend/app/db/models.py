@@ -1,110 +1,261 @@
-"""SQLAlchemy ORM models for database tables."""
-
-import uuid
-import json
-from datetime import datetime
-from sqlalchemy import Column, String, Integer, Text, Float, DateTime, Index, Boolean
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
-from sqlalchemy import event
-
-from app.db.base import Base
-
-
-def generate_uuid():
-    """Generate UUID as string for SQLite compatibility."""
-    return str(uuid.uuid4())
-
-
-class AnalysisHistory(Base):
-    """
-    Model for storing SCA analysis history.
-
-    This table serves as:
-    1. Cache for expensive AI analysis calls
-    2. Historical record for compliance tracking
-    3. Audit trail for analysis changes over time
-    """
-
-    __tablename__ = "analysis_history"
-
-    # Primary Key
-    id = Column(String(36), primary_key=True, default=generate_uuid)
-
-    # Identifiers (indexed for fast lookups)
-    agent_id = Column(String(50), nullable=False, index=True)
-    agent_name = Column(String(255), nullable=False)
-    policy_id = Column(String(100), nullable=False)
-    check_id = Column(Integer, nullable=False, index=True)
-
-    # Check Information (for display/search)
-    check_title = Column(String(500), nullable=False)
-    check_description = Column(Text, nullable=True)
-
-    # Analysis Metadata
-    analysis_date = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
-    language = Column(String(2), nullable=False)  # 'pt' or 'en'
-    ai_provider = Column(String(20), nullable=False)  # 'vllm' or 'openai'
-
-    # Analysis Content
-    report_text = Column(Text, nullable=False)
-
-    # Remediation Script (NEW)
-    remediation_script = Column(Text, nullable=True)  # Script content
-    script_language = Column(String(20), nullable=True)  # bash, powershell, python
-    validation_command = Column(Text, nullable=True)  # Command to validate fix
-    script_metadata = Column(Text, nullable=True)  # JSON: {estimated_duration, requires_root, risks[]}
-
-    # Status and Performance
-    status = Column(String(20), nullable=False, default='pending', index=True)  # pending, completed, failed
-    error_message = Column(Text, nullable=True)
-    execution_time_seconds = Column(Float, nullable=True)
-
-    # Composite Indexes for optimized queries
-    __table_args__ = (
-        Index('idx_agent_check', 'agent_id', 'check_id'),
-        Index('idx_date_status', 'analysis_date', 'status'),
-        Index('idx_policy_check', 'policy_id', 'check_id'),
-    )
-
-    def __repr__(self):
-        return (
-            f"<AnalysisHistory(id={self.id}, agent={self.agent_name}, "
-            f"check={self.check_id}, date={self.analysis_date}, status={self.status})>"
-        )
-
-    def to_dict(self):
-        """Convert model to dictionary for API responses."""
-        result = {
-            "id": self.id,
-            "agent_id": self.agent_id,
-            "agent_name": self.agent_name,
-            "policy_id": self.policy_id,
-            "check_id": self.check_id,
-            "check_title": self.check_title,
-            "check_description": self.check_description,
-            "analysis_date": self.analysis_date.isoformat() if self.analysis_date else None,
-            "language": self.language,
-            "ai_provider": self.ai_provider,
-            "report_text": self.report_text,
-            "status": self.status,
-            "error_message": self.error_message,
-            "execution_time_seconds": self.execution_time_seconds,
-        }
-
-        # Add remediation script if available
-        if self.remediation_script:
-            metadata = {}
-            if self.script_metadata:
-                try:
-                    metadata = json.loads(self.script_metadata)
-                except (json.JSONDecodeError, TypeError):
-                    pass
-
-            result["remediation_script"] = {
-                "script_content": self.remediation_script,
-                "script_language": self.script_language,
-                "validation_command": self.validation_command,
-                **metadata
-            }
-
-        return result
+"""SQLAlchemy ORM models for database tables."""
+
+import hashlib
+import uuid
+import json
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import Column, String, Integer, Text, Float, DateTime, Index, Boolean, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+def generate_uuid():
+    """Generate UUID as string for SQLite compatibility."""
+    return str(uuid.uuid4())
+
+
+def content_hash(body: str) -> str:
+    """Key of a body in the content table (SHA-256 hex of its UTF-8 bytes)."""
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class AnalysisContent(Base):
+    """
+    Report and script bodies, stored once per distinct content.
+
+    History rows reference their bodies by hash, so the copies of an
+    analysis saved for every agent that hits the shared cache share one
+    body instead of repeating it.
+    """
+
+    __tablename__ = "analysis_content"
+
+    hash = Column(String(64), primary_key=True)
+    body = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+def insert_contents(conn: Connection, contents: Dict[str, str]) -> None:
+    """
+    Insert bodies into the content table, skipping hashes already stored.
+
+    Args:
+        conn: Connection (in the caller's transaction)
+        contents: Bodies by content_hash
+    """
+    table = AnalysisContent.__table__
+    dialect = conn.dialect.name
+    rows = [{"hash": key, "body": body, "created_at": datetime.utcnow()} for key, body in contents.items()]
+    # Chunked to stay under SQLite's bound-parameter limit
+    for start in range(0, len(rows), 200):
+        chunk = rows[start:start + 200]
+        if dialect in ("sqlite", "postgresql"):
+            insert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}[dialect]
+            conn.execute(insert(table).values(chunk).on_conflict_do_nothing(index_elements=["hash"]))
+        elif dialect in ("mysql", "mariadb"):
+            conn.execute(mysql.insert(table).values(chunk).prefix_with("IGNORE"))
+        else:
+            # No portable "insert if absent": skip the hashes already stored
+            # (a concurrent writer can still win the race and fail the insert)
+            stored = set(conn.execute(
+                select(table.c.hash).where(table.c.hash.in_([row["hash"] for row in chunk]))
+            ).scalars())
+            missing = [row for row in chunk if row["hash"] not in stored]
+            if missing:
+                conn.execute(table.insert(), missing)
+
+
+class AnalysisHistory(Base):
+    """
+    Model for storing SCA analysis history.
+
+    This table serves as:
+    1. Cache for expensive AI analysis calls
+    2. Historical record for compliance tracking
+    3. Audit trail for analysis changes over time
+    """
+
+    __tablename__ = "analysis_history"
+
+    # Primary Key
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+
+    # Identifiers (indexed for fast lookups)
+    agent_id = Column(String(50), nullable=False, index=True)
+    agent_name = Column(String(255), nullable=False)
+    policy_id = Column(String(100), nullable=False)
+    check_id = Column(Integer, nullable=False, index=True)
+
+    # Content-addressed cache key (see app.services.ai.fingerprint)
+    analysis_fingerprint = Column(String(64), nullable=True, index=True)
+
+    # Check Information (for display/search)
+    check_title = Column(String(500), nullable=False)
+    check_description = Column(Text, nullable=True)
+
+    # Analysis Metadata
+    analysis_date = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    language = Column(String(2), nullable=False)  # 'pt' or 'en'
+    ai_provider = Column(String(20), nullable=False)  # 'vllm' or 'openai'
+    prompt_template = Column(String(40), nullable=True)  # e.g. 'prefix-<hash>' (see app.prompts)
+    routing_decision = Column(String(20), nullable=True)  # set when served via the 'auto' provider
+
+    # Analysis Content: bodies live in analysis_content, referenced by hash.
+    # The inline columns only hold rows written before the content table
+    # existed (see migration 006); read the report_text and
+    # remediation_script properties instead
+    report_hash = Column(String(64), nullable=True, index=True)
+    report_text_inline = Column("report_text", Text, nullable=False, default="")
+    # Set when the report was derived from another analysis: translated from
+    # the other language, or reused from / seeded by a similar check
+    source_analysis_id = Column(String(36), nullable=True)
+
+    # Remediation Script (NEW)
+    script_hash = Column(String(64), nullable=True, index=True)  # Script content, in analysis_content
+    remediation_script_inline = Column("remediation_script", Text, nullable=True)
+    script_language = Column(String(20), nullable=True)  # bash, powershell, python
+    validation_command = Column(Text, nullable=True)  # Command to validate fix
+    script_metadata = Column(Text, nullable=True)  # JSON: {estimated_duration, requires_root, risks[]}
+
+    # Status and Performance
+    status = Column(String(20), nullable=False, default='pending', index=True)  # pending, completed, failed
+    error_message = Column(Text, nullable=True)
+    execution_time_seconds = Column(Float, nullable=True)
+
+    # LLM call metrics (see app.services.ai.metrics.LLMCallTimer)
+    llm_model = Column(String(100), nullable=True)
+    llm_endpoint = Column(String(255), nullable=True)
+    queue_wait_seconds = Column(Float, nullable=True)
+    time_to_first_token_seconds = Column(Float, nullable=True)  # streamed analyses only
+    generation_seconds = Column(Float, nullable=True)
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+    tokens_per_second = Column(Float, nullable=True)
+
+    # Composite Indexes for optimized queries
+    __table_args__ = (
+        Index('idx_agent_check', 'agent_id', 'check_id'),
+        Index('idx_date_status', 'analysis_date', 'status'),
+        Index('idx_policy_check', 'policy_id', 'check_id'),
+        # Keyset pagination of agent history (see AnalysisRepository.get_history_by_agent)
+        Index('idx_agent_date_id', 'agent_id', 'analysis_date', 'id'),
+    )
+
+    # Bodies, loaded with the row
+    report_content = relationship(
+        AnalysisContent,
+        primaryjoin="foreign(AnalysisHistory.report_hash) == AnalysisContent.hash",
+        lazy="joined",
+        viewonly=True,
+    )
+    script_content = relationship(
+        AnalysisContent,
+        primaryjoin="foreign(AnalysisHistory.script_hash) == AnalysisContent.hash",
+        lazy="joined",
+        viewonly=True,
+    )
+
+    def set_bodies(self, report_text: str, remediation_script: Optional[str]) -> None:
+        """
+        Set the report and script bodies of a new row.
+
+        Only the hashes are columns of the row; the bodies are kept on the
+        instance until AnalysisRepository.save_analyses stores them.
+        """
+        self._report_body = report_text
+        self._script_body = remediation_script or None
+        self.report_hash = content_hash(report_text) if report_text else None
+        self.script_hash = content_hash(remediation_script) if remediation_script else None
+        self.report_text_inline = ""
+        self.remediation_script_inline = None
+
+    def new_contents(self) -> Dict[str, str]:
+        """Bodies set with set_bodies, by hash (empty for rows loaded from the database)."""
+        contents = {}
+        if self.__dict__.get("_report_body") and self.report_hash:
+            contents[self.report_hash] = self._report_body
+        if self.__dict__.get("_script_body") and self.script_hash:
+            contents[self.script_hash] = self._script_body
+        return contents
+
+    @property
+    def report_text(self) -> str:
+        """Report body."""
+        body = self.__dict__.get("_report_body")
+        if body is None and self.report_hash:
+            body = self.report_content.body if self.report_content else None
+        return body if body is not None else (self.report_text_inline or "")
+
+    @property
+    def remediation_script(self) -> Optional[str]:
+        """Remediation script content, if any."""
+        if "_script_body" in self.__dict__:
+            return self._script_body
+        if self.script_hash:
+            return self.script_content.body if self.script_content else None
+        return self.remediation_script_inline
+
+    def __repr__(self):
+        return (
+            f"<AnalysisHistory(id={self.id}, agent={self.agent_name}, "
+            f"check={self.check_id}, date={self.analysis_date}, status={self.status})>"
+        )
+
+    def to_dict(self):
+        """Convert model to dictionary for API responses."""
+        result = {
+            "id": self.id,
+            "agent_id": self.agent_id,
+            "agent_name": self.agent_name,
+            "policy_id": self.policy_id,
+            "check_id": self.check_id,
+            "check_title": self.check_title,
+            "check_description": self.check_description,
+            "analysis_date": self.analysis_date.isoformat() if self.analysis_date else None,
+            "language": self.language,
+            "ai_provider": self.ai_provider,
+            "prompt_template": self.prompt_template,
+            "routing_decision": self.routing_decision,
+            "report_text": self.report_text,
+            "source_analysis_id": self.source_analysis_id,
+            "status": self.status,
+            "error_message": self.error_message,
+            "execution_time_seconds": self.execution_time_seconds,
+        }
+
+        # Add LLM call metrics if they were recorded
+        if self.llm_model:
+            result["llm_metrics"] = {
+                "model": self.llm_model,
+                "endpoint": self.llm_endpoint,
+                "queue_wait_seconds": self.queue_wait_seconds,
+                "time_to_first_token_seconds": self.time_to_first_token_seconds,
+                "generation_seconds": self.generation_seconds,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "tokens_per_second": self.tokens_per_second,
+            }
+
+        # Add remediation script if available
+        if self.remediation_script:
+            metadata = {}
+            if self.script_metadata:
+                try:
+                    metadata = json.loads(self.script_metadata)
+                except (json.JSONDecodeError, TypeError):
+                    pass
+
+            result["remediation_script"] = {
+                "script_content": self.remediation_script,
+                "script_language": self.script_language,
+                "validation_command": self.validation_command,
+                **metadata
+            }
+
+        return result
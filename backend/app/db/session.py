@@ -1,39 +1,194 @@
-"""Database session management."""
-
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
-
-from app.config import settings
-
-# Create engine
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
-    echo=settings.app_env == "development"  # Log SQL in development
-)
-
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-def get_db() -> Generator[Session, None, None]:
-    """
-    Dependency for getting database session.
-
-    Usage in FastAPI:
-        @app.get("/items/")
-        def read_items(db: Session = Depends(get_db)):
-            ...
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-def init_db() -> None:
-    """Initialize database tables."""
-    from app.db.base import Base
-    Base.metadata.create_all(bind=engine)
+"""Database session management."""
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import Any, AsyncGenerator, Dict, Generator
+
+from app.config import settings
+from app.utils.logger import logger
+
+# Async drivers for the database URLs the app supports (the driver package
+# must be installed; only aiosqlite is in requirements.txt)
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+    "mariadb": "aiomysql",
+    "mssql": "aioodbc",
+}
+
+
+def async_database_url(url: str) -> str:
+    """
+    Rewrite a database URL to use the async driver of its backend.
+
+    Args:
+        url: Database URL, e.g. sqlite:///./sca_history.db
+
+    Returns:
+        URL with the async driver, e.g. sqlite+aiosqlite:///./sca_history.db
+
+    Raises:
+        ValueError: If the backend has no async driver (see ASYNC_DRIVERS)
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(
+            f"Unsupported DATABASE_URL backend {backend!r}: the history database needs an async "
+            f"driver, available for {', '.join(sorted(ASYNC_DRIVERS))}"
+        )
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """PRAGMAs of the SQLite profile, applied to every new connection."""
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "cache_size": -settings.sqlite_cache_size_kib,  # Negative: size in KiB, not pages
+        "mmap_size": settings.sqlite_mmap_size_mb * 1024 * 1024,
+    }
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Connect event handler applying the SQLite profile (sync and async drivers)."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _pool_options(url: str) -> Dict[str, Any]:
+    """Pool settings for an engine (in-memory SQLite keeps its single-connection pool)."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout,
+        "pool_recycle": settings.database_pool_recycle,
+        # Server databases may drop idle connections; a SQLite file cannot
+        "pool_pre_ping": parsed.get_backend_name() != "sqlite",
+    }
+
+
+IS_SQLITE = make_url(settings.database_url).get_backend_name() == "sqlite"
+
+# Create engine (startup, migrations and background threads)
+engine = create_engine(
+    settings.database_url,
+    connect_args={"check_same_thread": False} if IS_SQLITE else {},
+    echo=settings.app_env == "development",  # Log SQL in development
+    **_pool_options(settings.database_url),
+)
+
+# Create session factory
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async engine for request handlers: queries run without blocking the event loop
+# (aiosqlite defaults to NullPool, which opens a connection - and a thread -
+# per session)
+async_engine = create_async_engine(
+    async_database_url(settings.database_url),
+    echo=settings.app_env == "development",
+    **({"poolclass": AsyncAdaptedQueuePool} if _pool_options(settings.database_url) else {}),
+    **_pool_options(settings.database_url),
+)
+
+if IS_SQLITE:
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
+# Async session factory; objects stay readable after commit (no lazy reloads)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+def get_db() -> Generator[Session, None, None]:
+    """
+    Dependency for getting database session.
+
+    Usage in FastAPI:
+        @app.get("/items/")
+        def read_items(db: Session = Depends(get_db)):
+            ...
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for getting an async database session.
+
+    Usage in FastAPI:
+        @app.get("/items/")
+        async def read_items(db: AsyncSession = Depends(get_async_db)):
+            ...
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def init_db() -> None:
+    """Initialize database tables and apply pending migrations."""
+    from app.db.base import Base
+    from app.db.migrations import run_migrations
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+
+
+# Values SQLite reports for PRAGMA synchronous
+_SYNCHRONOUS_NAMES = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
+
+
+def check_database_settings(bind: Engine = engine) -> Dict[str, Any]:
+    """
+    Log the effective connection settings of the database.
+
+    For SQLite, the PRAGMAs are read back from a pooled connection, so a
+    profile SQLite did not accept (e.g. WAL on a filesystem without shared
+    memory support) is reported as a warning.
+
+    Returns:
+        Effective settings (backend, pool and, for SQLite, the PRAGMA values)
+    """
+    effective: Dict[str, Any] = {
+        "backend": bind.dialect.name,
+        "pool": type(bind.pool).__name__,
+        **_pool_options(str(bind.url)),
+    }
+    if bind.dialect.name == "sqlite":
+        with bind.connect() as conn:
+            for name in sqlite_pragmas():
+                effective[name] = conn.execute(text(f"PRAGMA {name}")).scalar()
+        effective["synchronous"] = _SYNCHRONOUS_NAMES.get(effective["synchronous"], effective["synchronous"])
+        effective["journal_mode"] = str(effective["journal_mode"]).upper()
+
+        logger.info(
+            "🗄️ SQLite: "
+            + ", ".join(f"{name}={effective[name]}" for name in sqlite_pragmas())
+        )
+        for name in ("journal_mode", "synchronous"):
+            if effective[name] != sqlite_pragmas()[name]:
+                logger.warning(
+                    f"⚠️ SQLite {name} is {effective[name]}, not the configured {sqlite_pragmas()[name]}"
+                )
+    logger.info(
+        f"🗄️ Database pool: {effective['pool']}"
+        + "".join(f", {name}={effective[name]}" for name in _pool_options(str(bind.url)))
+    )
+    return effective
@@ -1,85 +1,108 @@
-"""Main FastAPI application."""
-
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-
-from app.api.routes import agents, sca, analysis, reports, history
-from app.config import settings
-from app.utils.logger import logger
-from app.db.session import init_db
-
-# Create FastAPI app
-app = FastAPI(
-    title="Wazuh SCA AI Analyst API",
-    description="API for analyzing Wazuh SCA checks using AI",
-    version="2.0.0",
-    docs_url="/api/docs",
-    redoc_url="/api/redoc",
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure properly in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(agents.router, prefix="/api")
-app.include_router(sca.router, prefix="/api")
-app.include_router(analysis.router, prefix="/api")
-app.include_router(reports.router, prefix="/api")
-app.include_router(history.router, prefix="/api")
-
-
-@app.get("/")
-async def root():
-    """Root endpoint."""
-    return {
-        "name": "Wazuh SCA AI Analyst API",
-        "version": "2.0.0",
-        "docs": "/api/docs",
-    }
-
-
-@app.get("/health")
-async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
-
-
-@app.on_event("startup")
-async def startup_event():
-    """Run on application startup."""
-    logger.info("Starting Wazuh SCA AI Analyst API")
-    logger.info(f"Environment: {settings.app_env}")
-    logger.info(f"vLLM API: {settings.vllm_api_url}")
-
-    # Initialize database
-    try:
-        init_db()
-        logger.info("✅ Database initialized successfully")
-        logger.info(f"📊 Analysis cache: {'ENABLED' if settings.enable_analysis_cache else 'DISABLED'}")
-        if settings.enable_analysis_cache:
-            logger.info(f"⏱️  Cache TTL: {settings.analysis_cache_ttl_hours} hours")
-    except Exception as e:
-        logger.error(f"❌ Failed to initialize database: {e}")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Run on application shutdown."""
-    logger.info("Shutting down Wazuh SCA AI Analyst API")
-
-
-if __name__ == "__main__":
-    import uvicorn
-
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=settings.app_port,
-        reload=settings.app_env == "development",
-    )
+"""Main FastAPI application."""
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+from app.api.routes import agents, sca, analysis, reports, history
+from app.config import settings
+from app.utils.logger import logger
+from app.db.session import async_engine, check_database_settings, init_db
+from app.prompts import prompt_registry
+from app.repositories.history_writer import history_writer
+from app.services.ai.vllm_pool import vllm_pool
+from app.services.precompute_service import precompute_worker
+
+# Create FastAPI app
+app = FastAPI(
+    title="Wazuh SCA AI Analyst API",
+    description="API for analyzing Wazuh SCA checks using AI",
+    version="2.0.0",
+    docs_url="/api/docs",
+    redoc_url="/api/redoc",
+)
+
+# CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],  # Configure properly in production
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Include routers
+app.include_router(agents.router, prefix="/api")
+app.include_router(sca.router, prefix="/api")
+app.include_router(analysis.router, prefix="/api")
+app.include_router(reports.router, prefix="/api")
+app.include_router(history.router, prefix="/api")
+
+
+@app.get("/")
+async def root():
+    """Root endpoint."""
+    return {
+        "name": "Wazuh SCA AI Analyst API",
+        "version": "2.0.0",
+        "docs": "/api/docs",
+    }
+
+
+@app.get("/health")
+async def health_check():
+    """Health check endpoint."""
+    return {"status": "healthy"}
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Run on application startup."""
+    logger.info("Starting Wazuh SCA AI Analyst API")
+    logger.info(f"Environment: {settings.app_env}")
+    logger.info(f"vLLM API: {', '.join(e.url for e in vllm_pool.endpoints)}")
+    logger.info(
+        f"📝 Prompt templates: {len(prompt_registry)} loaded, "
+        + ", ".join(f"{lang}={version}" for lang, version in prompt_registry.get_stats()["versions"].items())
+    )
+
+    # Initialize database
+    try:
+        init_db()
+        logger.info("✅ Database initialized successfully")
+        check_database_settings()
+        history_writer.start()
+        logger.info(f"📊 Analysis cache: {'ENABLED' if settings.enable_analysis_cache else 'DISABLED'}")
+        if settings.enable_analysis_cache:
+            logger.info(f"⏱️  Cache TTL: {settings.analysis_cache_ttl_hours} hours")
+    except Exception as e:
+        logger.error(f"❌ Failed to initialize database: {e}")
+
+    # Health-check vLLM endpoints so unhealthy ones leave the rotation
+    if settings.ai_mode in ["local", "mixed"]:
+        vllm_pool.start()
+
+    # Precompute analyses for newly failed checks in the background
+    if settings.enable_precompute:
+        precompute_worker.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Run on application shutdown."""
+    logger.info("Shutting down Wazuh SCA AI Analyst API")
+    await precompute_worker.stop()
+    await vllm_pool.stop()
+    # After the workers that save analyses, before the engine goes away
+    await history_writer.stop()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=settings.app_port,
+        reload=settings.app_env == "development",
+    )
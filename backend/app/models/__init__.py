@@ -1 +1 @@
-"""Models package."""
+"""Models package."""
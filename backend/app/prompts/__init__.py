@@ -0,0 +1,136 @@
+"""
+Prompt template registry.
+
+Prompt wording lives in text files under `templates/`, named
+`<template>.<language>.txt` and used verbatim (including leading and
+trailing newlines). The registry loads and pre-parses every file once, at
+startup, and gives each template the SHA-256 of its content.
+
+The version of the analysis prompt in use (`prompt_template_version`) is
+derived from the hashes of the templates its layout is built from. It is
+part of the analysis fingerprint and recorded on every history row, so
+editing a template invalidates exactly the cache entries built from it.
+"""
+
+import hashlib
+import string
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+# Language used when a template has no file for the requested one
+DEFAULT_LANGUAGE = "en"
+
+# Templates each analysis prompt layout is built from (see BaseAIService._build_prompt)
+LAYOUT_TEMPLATES = {
+    "legacy": ("analysis_legacy", "reference_analysis"),
+    "prefix": ("analysis_prefix", "analysis_data", "reference_analysis", "analysis_response_start"),
+    "json": ("structured_prefix", "analysis_data", "reference_analysis", "structured_response_start"),
+}
+
+
+class PromptTemplate:
+    """A prompt template, pre-parsed into literal text and field names."""
+
+    def __init__(self, name: str, language: str, text: str):
+        self.name = name
+        self.language = language
+        self.text = text
+        self.hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        # (literal text, field name or None), as parsed by str.format
+        self._parts: List[Tuple[str, Optional[str]]] = [
+            (literal, field) for literal, field, _, _ in string.Formatter().parse(text)
+        ]
+        self.fields = {field for _, field in self._parts if field}
+        # Templates without fields render to their text (with escaped braces resolved)
+        self._static = "".join(literal for literal, _ in self._parts) if not self.fields else None
+
+    def render(self, **fields: Any) -> str:
+        """
+        Fill in the template fields.
+
+        Raises:
+            KeyError: If a field of the template is not given
+        """
+        if self._static is not None:
+            return self._static
+        return "".join(
+            literal + (str(fields[field]) if field else "") for literal, field in self._parts
+        )
+
+
+class PromptRegistry:
+    """Prompt templates loaded from a directory of `<template>.<language>.txt` files."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._templates: Dict[Tuple[str, str], PromptTemplate] = {}
+        for path in sorted(directory.glob("*.txt")):
+            name, _, language = path.stem.rpartition(".")
+            if not name:
+                raise ValueError(f"Prompt template file {path.name} is not named <template>.<language>.txt")
+            # Text mode: templates hash the same whatever the checkout's line endings
+            self._templates[(name, language)] = PromptTemplate(name, language, path.read_text(encoding="utf-8"))
+        self._versions: Dict[Tuple[str, str], str] = {}
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def get(self, name: str, language: str) -> PromptTemplate:
+        """
+        Template in a language, falling back to English.
+
+        Raises:
+            KeyError: If the template does not exist
+        """
+        template = self._templates.get((name, language)) or self._templates.get((name, DEFAULT_LANGUAGE))
+        if template is None:
+            raise KeyError(f"Unknown prompt template {name!r}")
+        return template
+
+    def render(self, name: str, language: str, **fields: Any) -> str:
+        """Render a template in a language (see get)."""
+        return self.get(name, language).render(**fields)
+
+    def version(self, layout: str, language: str) -> str:
+        """
+        Version of an analysis prompt layout in a language.
+
+        Returns:
+            "<layout>-<first 16 hex digits of the hash over its templates>"
+        """
+        key = (layout, language)
+        if key not in self._versions:
+            digest = hashlib.sha256()
+            for name in LAYOUT_TEMPLATES[layout]:
+                digest.update(self.get(name, language).hash.encode("ascii"))
+            self._versions[key] = f"{layout}-{digest.hexdigest()[:16]}"
+        return self._versions[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Loaded templates and the version of the analysis layout in use per language."""
+        languages = sorted({language for _, language in self._templates})
+        return {
+            "templates": len(self._templates),
+            "layout": current_layout(),
+            "versions": {language: self.version(current_layout(), language) for language in languages},
+        }
+
+
+def current_layout() -> str:
+    """Analysis prompt layout selected by the settings."""
+    if settings.ai_structured_output:
+        return "json"
+    return "prefix" if settings.enable_prompt_prefix_caching else "legacy"
+
+
+def prompt_template_version(language: str) -> str:
+    """Return the version of the analysis prompt currently in use for a language."""
+    return prompt_registry.version(current_layout(), language)
+
+
+# Global prompt registry, loaded at import (startup)
+prompt_registry = PromptRegistry(TEMPLATES_DIR)
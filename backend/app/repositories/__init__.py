@@ -1,5 +1,6 @@
-"""Repository package for database operations."""
-
-from app.repositories.analysis_repository import AnalysisRepository
-
-__all__ = ["AnalysisRepository"]
+"""Repository package for database operations."""
+
+from app.repositories.analysis_repository import AnalysisRepository
+from app.repositories.async_analysis_repository import AsyncAnalysisRepository
+
+__all__ = ["AnalysisRepository", "AsyncAnalysisRepository"]
@@ -1,364 +1,623 @@
-"""Repository for analysis history database operations."""
-
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
-import json
-
-from app.db.models import AnalysisHistory
-from app.config import settings
-from app.utils.logger import logger
-
-
-class AnalysisRepository:
-    """Repository for CRUD operations on analysis history."""
-
-    def __init__(self, db: Session):
-        self.db = db
-
-    def save_analysis(
-        self,
-        agent_id: str,
-        agent_name: str,
-        policy_id: str,
-        check_id: int,
-        check_title: str,
-        language: str,
-        ai_provider: str,
-        report_text: str,
-        status: str = "completed",
-        error_message: Optional[str] = None,
-        execution_time: Optional[float] = None,
-        check_description: Optional[str] = None,
-        remediation_script: Optional[Dict[str, Any]] = None,
-    ) -> AnalysisHistory:
-        """
-        Save a new analysis to history.
-
-        Args:
-            agent_id: Wazuh agent ID
-            agent_name: Wazuh agent name
-            policy_id: SCA policy ID
-            check_id: SCA check ID
-            check_title: Check title for display
-            language: Report language ('pt' or 'en')
-            ai_provider: AI provider used ('vllm' or 'openai')
-            report_text: Generated analysis report
-            status: Analysis status (default: 'completed')
-            error_message: Error message if failed
-            execution_time: Time taken in seconds
-            check_description: Optional check description
-            remediation_script: Optional dict with script data
-
-        Returns:
-            Created AnalysisHistory instance
-        """
-        # Extract script fields if provided
-        script_content = None
-        script_language = None
-        validation_command = None
-        script_metadata_json = None
-
-        if remediation_script:
-            script_content = remediation_script.get("script_content")
-            script_language = remediation_script.get("script_language")
-            validation_command = remediation_script.get("validation_command")
-
-            # Store metadata as JSON
-            metadata = {
-                "estimated_duration": remediation_script.get("estimated_duration"),
-                "requires_root": remediation_script.get("requires_root", False),
-                "risks": remediation_script.get("risks", []),
-            }
-            script_metadata_json = json.dumps(metadata)
-
-        analysis = AnalysisHistory(
-            agent_id=agent_id,
-            agent_name=agent_name,
-            policy_id=policy_id,
-            check_id=check_id,
-            check_title=check_title,
-            check_description=check_description,
-            language=language,
-            ai_provider=ai_provider,
-            report_text=report_text,
-            status=status,
-            error_message=error_message,
-            execution_time_seconds=execution_time,
-            remediation_script=script_content,
-            script_language=script_language,
-            validation_command=validation_command,
-            script_metadata=script_metadata_json,
-        )
-
-        self.db.add(analysis)
-        self.db.commit()
-        self.db.refresh(analysis)
-
-        logger.info(
-            f"Saved analysis to history: agent={agent_name}, "
-            f"check={check_id}, provider={ai_provider}, status={status}"
-            + (f", script={script_language}" if script_content else "")
-        )
-
-        return analysis
-
-    def find_cached_analysis(
-        self,
-        agent_id: str,
-        check_id: int,
-        language: str,
-        max_age_hours: Optional[int] = None,
-    ) -> Optional[AnalysisHistory]:
-        """
-        Find a recent cached analysis for the given parameters.
-
-        Args:
-            agent_id: Wazuh agent ID
-            check_id: SCA check ID
-            language: Report language
-            max_age_hours: Maximum age in hours (default from settings)
-
-        Returns:
-            Most recent matching analysis if found and valid, None otherwise
-        """
-        if not settings.enable_analysis_cache:
-            return None
-
-        max_age = max_age_hours or settings.analysis_cache_ttl_hours
-        cutoff_date = datetime.utcnow() - timedelta(hours=max_age)
-
-        analysis = (
-            self.db.query(AnalysisHistory)
-            .filter(
-                and_(
-                    AnalysisHistory.agent_id == agent_id,
-                    AnalysisHistory.check_id == check_id,
-                    AnalysisHistory.language == language,
-                    AnalysisHistory.status == "completed",
-                    AnalysisHistory.analysis_date >= cutoff_date,
-                )
-            )
-            .order_by(desc(AnalysisHistory.analysis_date))
-            .first()
-        )
-
-        if analysis:
-            logger.info(
-                f"Cache HIT (agent-specific): agent={agent_id}, check={check_id}, "
-                f"age={datetime.utcnow() - analysis.analysis_date}"
-            )
-        else:
-            logger.info(f"Cache MISS (agent-specific): agent={agent_id}, check={check_id}")
-
-        return analysis
-
-    def find_cached_analysis_by_check_id(
-        self,
-        check_id: int,
-        language: str,
-        exclude_agent_id: Optional[str] = None,
-        max_age_hours: Optional[int] = None,
-    ) -> Optional[AnalysisHistory]:
-        """
-        Find a recent cached analysis for ANY agent with the same check_id.
-        This allows reusing analyses across different agents for the same check.
-
-        Args:
-            check_id: Check ID to search for
-            language: Report language
-            exclude_agent_id: Optional agent ID to exclude (to avoid returning same agent's cache)
-            max_age_hours: Maximum age in hours (default from settings)
-
-        Returns:
-            Most recent matching analysis if found and valid, None otherwise
-        """
-        if not settings.enable_analysis_cache:
-            return None
-
-        max_age = max_age_hours or settings.analysis_cache_ttl_hours
-        cutoff_date = datetime.utcnow() - timedelta(hours=max_age)
-
-        query = self.db.query(AnalysisHistory).filter(
-            and_(
-                AnalysisHistory.check_id == check_id,
-                AnalysisHistory.language == language,
-                AnalysisHistory.status == "completed",
-                AnalysisHistory.analysis_date >= cutoff_date,
-            )
-        )
-
-        # Exclude the requesting agent's own cache (to force shared cache)
-        if exclude_agent_id:
-            query = query.filter(AnalysisHistory.agent_id != exclude_agent_id)
-
-        analysis = query.order_by(desc(AnalysisHistory.analysis_date)).first()
-
-        if analysis:
-            logger.info(
-                f"Cache HIT (shared): check_id={check_id}, "
-                f"original_agent={analysis.agent_name}, "
-                f"age={datetime.utcnow() - analysis.analysis_date}"
-            )
-        else:
-            logger.info(f"Cache MISS (shared): check_id={check_id}")
-
-        return analysis
-
-    def get_by_id(self, analysis_id: str) -> Optional[AnalysisHistory]:
-        """Get analysis by ID."""
-        return (
-            self.db.query(AnalysisHistory)
-            .filter(AnalysisHistory.id == analysis_id)
-            .first()
-        )
-
-    def get_history_by_agent(
-        self,
-        agent_id: str,
-        limit: int = 50,
-        offset: int = 0,
-        status_filter: Optional[str] = None,
-    ) -> List[AnalysisHistory]:
-        """
-        Get analysis history for a specific agent.
-
-        Args:
-            agent_id: Wazuh agent ID
-            limit: Maximum number of results
-            offset: Pagination offset
-            status_filter: Optional status filter
-
-        Returns:
-            List of analysis history records
-        """
-        query = self.db.query(AnalysisHistory).filter(
-            AnalysisHistory.agent_id == agent_id
-        )
-
-        if status_filter:
-            query = query.filter(AnalysisHistory.status == status_filter)
-
-        return (
-            query.order_by(desc(AnalysisHistory.analysis_date))
-            .limit(limit)
-            .offset(offset)
-            .all()
-        )
-
-    def get_history_by_check(
-        self,
-        agent_id: str,
-        check_id: int,
-        limit: int = 20,
-    ) -> List[AnalysisHistory]:
-        """
-        Get analysis history for a specific check.
-
-        Args:
-            agent_id: Wazuh agent ID
-            check_id: SCA check ID
-            limit: Maximum number of results
-
-        Returns:
-            List of analysis history records for the check
-        """
-        return (
-            self.db.query(AnalysisHistory)
-            .filter(
-                and_(
-                    AnalysisHistory.agent_id == agent_id,
-                    AnalysisHistory.check_id == check_id,
-                )
-            )
-            .order_by(desc(AnalysisHistory.analysis_date))
-            .limit(limit)
-            .all()
-        )
-
-    def get_recent_analyses(
-        self,
-        hours: int = 24,
-        limit: int = 100,
-    ) -> List[AnalysisHistory]:
-        """
-        Get recent analyses across all agents.
-
-        Args:
-            hours: Look back window in hours
-            limit: Maximum number of results
-
-        Returns:
-            List of recent analysis records
-        """
-        cutoff_date = datetime.utcnow() - timedelta(hours=hours)
-
-        return (
-            self.db.query(AnalysisHistory)
-            .filter(AnalysisHistory.analysis_date >= cutoff_date)
-            .order_by(desc(AnalysisHistory.analysis_date))
-            .limit(limit)
-            .all()
-        )
-
-    def delete_analysis(self, analysis_id: str) -> bool:
-        """
-        Delete an analysis from history.
-
-        Args:
-            analysis_id: Analysis ID to delete
-
-        Returns:
-            True if deleted, False if not found
-        """
-        analysis = self.get_by_id(analysis_id)
-        if analysis:
-            self.db.delete(analysis)
-            self.db.commit()
-            logger.info(f"Deleted analysis from history: id={analysis_id}")
-            return True
-        return False
-
-    def count_by_agent(self, agent_id: str) -> int:
-        """Count total analyses for an agent."""
-        return (
-            self.db.query(AnalysisHistory)
-            .filter(AnalysisHistory.agent_id == agent_id)
-            .count()
-        )
-
-    def get_cache_stats(self) -> dict:
-        """Get cache statistics."""
-        total = self.db.query(AnalysisHistory).count()
-        completed = (
-            self.db.query(AnalysisHistory)
-            .filter(AnalysisHistory.status == "completed")
-            .count()
-        )
-        failed = (
-            self.db.query(AnalysisHistory)
-            .filter(AnalysisHistory.status == "failed")
-            .count()
-        )
-
-        cutoff = datetime.utcnow() - timedelta(hours=settings.analysis_cache_ttl_hours)
-        cached = (
-            self.db.query(AnalysisHistory)
-            .filter(
-                and_(
-                    AnalysisHistory.status == "completed",
-                    AnalysisHistory.analysis_date >= cutoff,
-                )
-            )
-            .count()
-        )
-
-        return {
-            "total_analyses": total,
-            "completed": completed,
-            "failed": failed,
-            "cached_valid": cached,
-            "cache_enabled": settings.enable_analysis_cache,
-            "cache_ttl_hours": settings.analysis_cache_ttl_hours,
-        }
+"""Repository for analysis history database operations."""
+
+import base64
+import math
+from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Set, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import desc, and_, func, or_
+import json
+
+from app.db.models import AnalysisContent, AnalysisHistory, generate_uuid, insert_contents
+from app.config import settings
+from app.prompts import prompt_template_version
+from app.utils.logger import logger
+
+# (analysis_date, id) of the last analysis of a history page
+HistoryCursor = Tuple[datetime, str]
+
+
+class AnalysisRepository:
+    """Repository for CRUD operations on analysis history."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def save_analysis(self, **fields: Any) -> AnalysisHistory:
+        """
+        Save a new analysis to history.
+
+        Args:
+            **fields: Analysis fields (see build_analysis)
+
+        Returns:
+            Created AnalysisHistory instance
+        """
+        analysis = self.build_analysis(**fields)
+        self.save_analyses([analysis])
+        self.db.refresh(analysis)
+        log_saved_analysis(analysis)
+        return analysis
+
+    def save_analyses(self, analyses: List[AnalysisHistory]) -> None:
+        """
+        Insert built analyses (see build_analysis) in one transaction.
+
+        Report and script bodies are stored once in the content table; rows
+        whose bodies are already stored (shared-cache copies) only add the
+        history row.
+
+        Args:
+            analyses: Analyses to insert; their IDs and dates are already set
+        """
+        contents: Dict[str, str] = {}
+        for analysis in analyses:
+            contents.update(analysis.new_contents())
+        if contents:
+            insert_contents(self.db.connection(), contents)
+        self.db.add_all(analyses)
+        self.db.commit()
+
+    @staticmethod
+    def build_analysis(
+        agent_id: str,
+        agent_name: str,
+        policy_id: str,
+        check_id: int,
+        check_title: str,
+        language: str,
+        ai_provider: str,
+        report_text: str,
+        status: str = "completed",
+        error_message: Optional[str] = None,
+        execution_time: Optional[float] = None,
+        check_description: Optional[str] = None,
+        remediation_script: Optional[Dict[str, Any]] = None,
+        analysis_fingerprint: Optional[str] = None,
+        routing_decision: Optional[str] = None,
+        llm_metrics: Optional[Dict[str, Any]] = None,
+        source_analysis_id: Optional[str] = None,
+        prompt_template: Optional[str] = None,
+    ) -> AnalysisHistory:
+        """
+        Build a history row for a new analysis, without saving it.
+
+        The ID and analysis date are assigned here, so the row can be served
+        before it is written (see history_writer.py).
+
+        Args:
+            agent_id: Wazuh agent ID
+            agent_name: Wazuh agent name
+            policy_id: SCA policy ID
+            check_id: SCA check ID
+            check_title: Check title for display
+            language: Report language ('pt' or 'en')
+            ai_provider: AI provider used ('vllm' or 'openai')
+            report_text: Generated analysis report
+            status: Analysis status (default: 'completed')
+            error_message: Error message if failed
+            execution_time: Time taken in seconds
+            check_description: Optional check description
+            remediation_script: Optional dict with script data
+            analysis_fingerprint: Content-addressed cache key of the analysis inputs
+            routing_decision: How the 'auto' provider routed the request, if used
+            llm_metrics: Optional dict with LLM call metrics (LLMCallTimer.to_dict)
+            source_analysis_id: ID of the analysis this report was derived from, if any
+            prompt_template: Prompt template version the analysis fingerprint was
+                computed with (default: the one in use for `language`)
+
+        Returns:
+            Unsaved AnalysisHistory instance
+        """
+        # Extract script fields if provided
+        script_content = None
+        script_language = None
+        validation_command = None
+        script_metadata_json = None
+
+        if remediation_script:
+            script_content = remediation_script.get("script_content")
+            script_language = remediation_script.get("script_language")
+            validation_command = remediation_script.get("validation_command")
+
+            # Store metadata as JSON
+            metadata = {
+                "estimated_duration": remediation_script.get("estimated_duration"),
+                "requires_root": remediation_script.get("requires_root", False),
+                "risks": remediation_script.get("risks", []),
+            }
+            script_metadata_json = json.dumps(metadata)
+
+        llm_metrics = llm_metrics or {}
+
+        analysis = AnalysisHistory(
+            id=generate_uuid(),
+            agent_id=agent_id,
+            agent_name=agent_name,
+            policy_id=policy_id,
+            check_id=check_id,
+            analysis_fingerprint=analysis_fingerprint,
+            check_title=check_title,
+            check_description=check_description,
+            analysis_date=datetime.utcnow(),
+            language=language,
+            ai_provider=ai_provider,
+            prompt_template=prompt_template or prompt_template_version(language),
+            routing_decision=routing_decision,
+            source_analysis_id=source_analysis_id,
+            status=status,
+            error_message=error_message,
+            execution_time_seconds=execution_time,
+            script_language=script_language,
+            validation_command=validation_command,
+            script_metadata=script_metadata_json,
+            llm_model=llm_metrics.get("model"),
+            llm_endpoint=llm_metrics.get("endpoint"),
+            queue_wait_seconds=llm_metrics.get("queue_wait_seconds"),
+            time_to_first_token_seconds=llm_metrics.get("time_to_first_token_seconds"),
+            generation_seconds=llm_metrics.get("generation_seconds"),
+            prompt_tokens=llm_metrics.get("prompt_tokens"),
+            completion_tokens=llm_metrics.get("completion_tokens"),
+            tokens_per_second=llm_metrics.get("tokens_per_second"),
+        )
+        analysis.set_bodies(report_text, script_content)
+        return analysis
+
+    def find_cached_analysis(
+        self,
+        agent_id: str,
+        fingerprint: str,
+        max_age_hours: Optional[int] = None,
+    ) -> Optional[AnalysisHistory]:
+        """
+        Find a recent cached analysis for the given agent and fingerprint.
+
+        Args:
+            agent_id: Wazuh agent ID
+            fingerprint: Analysis fingerprint (see compute_analysis_fingerprint)
+            max_age_hours: Maximum age in hours (default from settings)
+
+        Returns:
+            Most recent matching analysis if found and valid, None otherwise
+        """
+        if not settings.enable_analysis_cache:
+            return None
+
+        max_age = max_age_hours or settings.analysis_cache_ttl_hours
+        cutoff_date = datetime.utcnow() - timedelta(hours=max_age)
+
+        analysis = (
+            self.db.query(AnalysisHistory)
+            .filter(
+                and_(
+                    AnalysisHistory.analysis_fingerprint == fingerprint,
+                    AnalysisHistory.agent_id == agent_id,
+                    AnalysisHistory.status == "completed",
+                    AnalysisHistory.analysis_date >= cutoff_date,
+                )
+            )
+            .order_by(desc(AnalysisHistory.analysis_date))
+            .first()
+        )
+
+        if analysis:
+            logger.info(
+                f"Cache HIT (agent-specific): agent={agent_id}, check={analysis.check_id}, "
+                f"fingerprint={fingerprint[:12]}, age={datetime.utcnow() - analysis.analysis_date}"
+            )
+        else:
+            logger.info(f"Cache MISS (agent-specific): agent={agent_id}, fingerprint={fingerprint[:12]}")
+
+        return analysis
+
+    def find_cached_analysis_by_fingerprint(
+        self,
+        fingerprint: str,
+        exclude_agent_id: Optional[str] = None,
+        max_age_hours: Optional[int] = None,
+    ) -> Optional[AnalysisHistory]:
+        """
+        Find a recent cached analysis for ANY agent with the same fingerprint.
+        This allows reusing analyses across agents and policies whenever the
+        prompt-relevant inputs (check content, OS, language, template, model) match.
+
+        Args:
+            fingerprint: Analysis fingerprint (see compute_analysis_fingerprint)
+            exclude_agent_id: Optional agent ID to exclude (to avoid returning same agent's cache)
+            max_age_hours: Maximum age in hours (default from settings)
+
+        Returns:
+            Most recent matching analysis if found and valid, None otherwise
+        """
+        if not settings.enable_analysis_cache:
+            return None
+
+        max_age = max_age_hours or settings.analysis_cache_ttl_hours
+        cutoff_date = datetime.utcnow() - timedelta(hours=max_age)
+
+        query = self.db.query(AnalysisHistory).filter(
+            and_(
+                AnalysisHistory.analysis_fingerprint == fingerprint,
+                AnalysisHistory.status == "completed",
+                AnalysisHistory.analysis_date >= cutoff_date,
+            )
+        )
+
+        # Exclude the requesting agent's own cache (to force shared cache)
+        if exclude_agent_id:
+            query = query.filter(AnalysisHistory.agent_id != exclude_agent_id)
+
+        analysis = query.order_by(desc(AnalysisHistory.analysis_date)).first()
+
+        if analysis:
+            logger.info(
+                f"Cache HIT (shared): fingerprint={fingerprint[:12]}, "
+                f"check_id={analysis.check_id}, policy={analysis.policy_id}, "
+                f"original_agent={analysis.agent_name}, "
+                f"age={datetime.utcnow() - analysis.analysis_date}"
+            )
+        else:
+            logger.info(f"Cache MISS (shared): fingerprint={fingerprint[:12]}")
+
+        return analysis
+
+    def get_cached_fingerprints(
+        self,
+        fingerprints: List[str],
+        max_age_hours: Optional[int] = None,
+    ) -> Set[str]:
+        """
+        Find which fingerprints already have a valid cached analysis (any agent).
+
+        Args:
+            fingerprints: Analysis fingerprints to look up
+            max_age_hours: Maximum age in hours (default from settings)
+
+        Returns:
+            Subset of `fingerprints` with a recent completed analysis
+        """
+        max_age = max_age_hours or settings.analysis_cache_ttl_hours
+        cutoff_date = datetime.utcnow() - timedelta(hours=max_age)
+
+        found: Set[str] = set()
+        # Chunked to stay under SQLite's bound-parameter limit
+        for start in range(0, len(fingerprints), 500):
+            rows = (
+                self.db.query(AnalysisHistory.analysis_fingerprint)
+                .filter(
+                    and_(
+                        AnalysisHistory.analysis_fingerprint.in_(fingerprints[start:start + 500]),
+                        AnalysisHistory.status == "completed",
+                        AnalysisHistory.analysis_date >= cutoff_date,
+                    )
+                )
+                .distinct()
+                .all()
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    def get_similarity_candidates(self, max_age_hours: Optional[int] = None) -> List[Any]:
+        """
+        Get the recent completed analyses indexed for similarity lookups.
+
+        Args:
+            max_age_hours: Maximum age in hours (default from settings)
+
+        Returns:
+            Rows with id, check_title, check_description, language,
+            script_language and analysis_fingerprint, newest first
+        """
+        max_age = max_age_hours or settings.analysis_cache_ttl_hours
+        cutoff_date = datetime.utcnow() - timedelta(hours=max_age)
+
+        return (
+            self.db.query(
+                AnalysisHistory.id,
+                AnalysisHistory.check_title,
+                AnalysisHistory.check_description,
+                AnalysisHistory.language,
+                AnalysisHistory.script_language,
+                AnalysisHistory.analysis_fingerprint,
+            )
+            .filter(
+                and_(
+                    AnalysisHistory.status == "completed",
+                    AnalysisHistory.report_hash.isnot(None),
+                    AnalysisHistory.analysis_date >= cutoff_date,
+                )
+            )
+            .order_by(desc(AnalysisHistory.analysis_date))
+            .all()
+        )
+
+    def get_by_id(self, analysis_id: str) -> Optional[AnalysisHistory]:
+        """Get analysis by ID."""
+        return (
+            self.db.query(AnalysisHistory)
+            .filter(AnalysisHistory.id == analysis_id)
+            .first()
+        )
+
+    def get_history_by_agent(
+        self,
+        agent_id: str,
+        limit: int = 50,
+        offset: int = 0,
+        status_filter: Optional[str] = None,
+        before: Optional[HistoryCursor] = None,
+    ) -> List[AnalysisHistory]:
+        """
+        Get analysis history for a specific agent, newest first.
+
+        Args:
+            agent_id: Wazuh agent ID
+            limit: Maximum number of results
+            offset: Pagination offset (scans and discards the skipped rows;
+                prefer `before`)
+            status_filter: Optional status filter
+            before: Keyset cursor; only rows after this position in the
+                order are returned (see decode_cursor)
+
+        Returns:
+            List of analysis history records
+        """
+        query = self.db.query(AnalysisHistory).filter(
+            AnalysisHistory.agent_id == agent_id
+        )
+
+        if status_filter:
+            query = query.filter(AnalysisHistory.status == status_filter)
+
+        return (
+            _newest_first(query, before)
+            .limit(limit)
+            .offset(offset)
+            .all()
+        )
+
+    def get_history_by_check(
+        self,
+        agent_id: str,
+        check_id: int,
+        limit: int = 20,
+        before: Optional[HistoryCursor] = None,
+    ) -> List[AnalysisHistory]:
+        """
+        Get analysis history for a specific check.
+
+        Args:
+            agent_id: Wazuh agent ID
+            check_id: SCA check ID
+            limit: Maximum number of results
+            before: Keyset cursor of the previous page
+
+        Returns:
+            List of analysis history records for the check
+        """
+        query = self.db.query(AnalysisHistory).filter(
+            and_(
+                AnalysisHistory.agent_id == agent_id,
+                AnalysisHistory.check_id == check_id,
+            )
+        )
+        return _newest_first(query, before).limit(limit).all()
+
+    def get_recent_analyses(
+        self,
+        hours: int = 24,
+        limit: int = 100,
+        before: Optional[HistoryCursor] = None,
+    ) -> List[AnalysisHistory]:
+        """
+        Get recent analyses across all agents.
+
+        Args:
+            hours: Look back window in hours
+            limit: Maximum number of results
+            before: Keyset cursor of the previous page
+
+        Returns:
+            List of recent analysis records
+        """
+        cutoff_date = datetime.utcnow() - timedelta(hours=hours)
+
+        query = self.db.query(AnalysisHistory).filter(AnalysisHistory.analysis_date >= cutoff_date)
+        return _newest_first(query, before).limit(limit).all()
+
+    def delete_analysis(self, analysis_id: str) -> bool:
+        """
+        Delete an analysis from history.
+
+        Args:
+            analysis_id: Analysis ID to delete
+
+        Returns:
+            True if deleted, False if not found
+        """
+        analysis = self.get_by_id(analysis_id)
+        if analysis:
+            self.db.delete(analysis)
+            self.db.flush()
+            self._delete_unreferenced_contents({analysis.report_hash, analysis.script_hash} - {None})
+            self.db.commit()
+            logger.info(f"Deleted analysis from history: id={analysis_id}")
+            return True
+        return False
+
+    def _delete_unreferenced_contents(self, hashes: Set[str]) -> None:
+        """Delete bodies no history row references anymore."""
+        for key in hashes:
+            referenced = (
+                self.db.query(AnalysisHistory.id)
+                .filter(or_(AnalysisHistory.report_hash == key, AnalysisHistory.script_hash == key))
+                .first()
+            )
+            if not referenced:
+                self.db.query(AnalysisContent).filter(AnalysisContent.hash == key).delete()
+
+    def count_by_agent(self, agent_id: str) -> int:
+        """Count total analyses for an agent."""
+        return (
+            self.db.query(AnalysisHistory)
+            .filter(AnalysisHistory.agent_id == agent_id)
+            .count()
+        )
+
+    def count_by_agent_status(self, agent_id: str) -> Dict[str, int]:
+        """Count the analyses of an agent per status."""
+        return dict(
+            self.db.query(AnalysisHistory.status, func.count(AnalysisHistory.id))
+            .filter(AnalysisHistory.agent_id == agent_id)
+            .group_by(AnalysisHistory.status)
+            .all()
+        )
+
+    def get_cache_stats(self) -> dict:
+        """Get cache statistics."""
+        total = self.db.query(AnalysisHistory).count()
+        completed = (
+            self.db.query(AnalysisHistory)
+            .filter(AnalysisHistory.status == "completed")
+            .count()
+        )
+        failed = (
+            self.db.query(AnalysisHistory)
+            .filter(AnalysisHistory.status == "failed")
+            .count()
+        )
+
+        cutoff = datetime.utcnow() - timedelta(hours=settings.analysis_cache_ttl_hours)
+        cached = (
+            self.db.query(AnalysisHistory)
+            .filter(
+                and_(
+                    AnalysisHistory.status == "completed",
+                    AnalysisHistory.analysis_date >= cutoff,
+                )
+            )
+            .count()
+        )
+
+        return {
+            "total_analyses": total,
+            "completed": completed,
+            "failed": failed,
+            "cached_valid": cached,
+            "cache_enabled": settings.enable_analysis_cache,
+            "cache_ttl_hours": settings.analysis_cache_ttl_hours,
+        }
+
+    def get_llm_call_stats(self, hours: int = 24) -> List[Dict[str, Any]]:
+        """
+        Aggregate LLM call metrics per provider and model.
+
+        Args:
+            hours: Look back window in hours
+
+        Returns:
+            One entry per (provider, model) with the call count, p50/p95/p99
+            of each timing and token averages
+        """
+        cutoff_date = datetime.utcnow() - timedelta(hours=hours)
+        rows = (
+            self.db.query(
+                AnalysisHistory.ai_provider,
+                AnalysisHistory.llm_model,
+                AnalysisHistory.queue_wait_seconds,
+                AnalysisHistory.time_to_first_token_seconds,
+                AnalysisHistory.generation_seconds,
+                AnalysisHistory.tokens_per_second,
+                AnalysisHistory.prompt_tokens,
+                AnalysisHistory.completion_tokens,
+            )
+            .filter(
+                and_(
+                    AnalysisHistory.analysis_date >= cutoff_date,
+                    AnalysisHistory.llm_model.isnot(None),
+                )
+            )
+            .all()
+        )
+
+        groups: Dict[Tuple[str, str], List[Any]] = {}
+        for row in rows:
+            groups.setdefault((row[0], row[1]), []).append(row)
+
+        timings = (
+            "queue_wait_seconds",
+            "time_to_first_token_seconds",
+            "generation_seconds",
+            "tokens_per_second",
+        )
+        stats = []
+        for (provider, model), group in sorted(groups.items()):
+            entry: Dict[str, Any] = {"ai_provider": provider, "llm_model": model, "calls": len(group)}
+            for index, name in enumerate(timings, start=2):
+                values = sorted(row[index] for row in group if row[index] is not None)
+                entry[name] = {
+                    f"p{p}": _percentile(values, p / 100) for p in (50, 95, 99)
+                }
+            for index, name in ((6, "prompt_tokens"), (7, "completion_tokens")):
+                values = [row[index] for row in group if row[index] is not None]
+                entry[f"avg_{name}"] = sum(values) / len(values) if values else None
+            stats.append(entry)
+        return stats
+
+
+def _percentile(ordered: List[float], percentile: float) -> Optional[float]:
+    """Nearest-rank percentile of a sorted list (None if empty)."""
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(percentile * len(ordered)) - 1)]
+
+
+def _newest_first(query, before: Optional[HistoryCursor]):
+    """Order a history query newest first and start it after a keyset cursor."""
+    if before is not None:
+        date, analysis_id = before
+        query = query.filter(
+            or_(
+                AnalysisHistory.analysis_date < date,
+                and_(AnalysisHistory.analysis_date == date, AnalysisHistory.id < analysis_id),
+            )
+        )
+    return query.order_by(desc(AnalysisHistory.analysis_date), desc(AnalysisHistory.id))
+
+
+def encode_cursor(analysis: AnalysisHistory) -> str:
+    """Opaque keyset cursor pointing just after an analysis (see decode_cursor)."""
+    raw = f"{analysis.analysis_date.isoformat()}|{analysis.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> HistoryCursor:
+    """
+    Decode a cursor returned by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+
+    Returns:
+        (analysis_date, id) of the last analysis of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        date, analysis_id = raw.split("|")
+        return datetime.fromisoformat(date), analysis_id
+    except ValueError:  # Also bad base64 (binascii.Error) and UTF-8
+        raise ValueError(f"Invalid history cursor {cursor!r}")
+
+
+def log_saved_analysis(analysis: AnalysisHistory) -> None:
+    """Log an analysis written to history."""
+    logger.info(
+        f"Saved analysis to history: agent={analysis.agent_name}, "
+        f"check={analysis.check_id}, provider={analysis.ai_provider}, status={analysis.status}"
+        + (f", routing={analysis.routing_decision}" if analysis.routing_decision else "")
+        + (f", script={analysis.script_language}" if analysis.remediation_script else "")
+        + (f", source={analysis.source_analysis_id}" if analysis.source_analysis_id else "")
+    )
@@ -0,0 +1,171 @@
+"""Async repository for analysis history, used by request handlers."""
+
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.models import AnalysisHistory
+from app.repositories.analysis_repository import AnalysisRepository, HistoryCursor
+from app.repositories.history_counts import history_counts
+from app.repositories.history_writer import history_writer
+
+
+class AsyncAnalysisRepository:
+    """
+    Async counterpart of AnalysisRepository.
+
+    Every method runs the AnalysisRepository query of the same name on the
+    session's async connection (``AsyncSession.run_sync``): the statements
+    are identical, but the driver (aiosqlite/asyncpg) awaits database I/O,
+    so queries and commits no longer block the event loop.
+
+    New analyses go through the write-behind history writer; reads see the
+    analyses it has not written yet (see history_writer.py).
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _run(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        return await self.db.run_sync(
+            lambda session: getattr(AnalysisRepository(session), method)(*args, **kwargs)
+        )
+
+    async def save_analysis(self, **fields: Any) -> AnalysisHistory:
+        """Save a new analysis to history (fields as in AnalysisRepository.build_analysis)."""
+        return await history_writer.save(AnalysisRepository.build_analysis(**fields))
+
+    async def find_cached_analysis(
+        self,
+        agent_id: str,
+        fingerprint: str,
+        max_age_hours: Optional[int] = None,
+    ) -> Optional[AnalysisHistory]:
+        """Find a recent cached analysis for the given agent and fingerprint."""
+        pending = settings.enable_analysis_cache and history_writer.find_pending(
+            lambda a: a.analysis_fingerprint == fingerprint
+            and a.agent_id == agent_id
+            and a.status == "completed"
+        )
+        if pending:
+            return pending
+        return await self._run("find_cached_analysis", agent_id, fingerprint, max_age_hours)
+
+    async def find_cached_analysis_by_fingerprint(
+        self,
+        fingerprint: str,
+        exclude_agent_id: Optional[str] = None,
+        max_age_hours: Optional[int] = None,
+    ) -> Optional[AnalysisHistory]:
+        """Find a recent cached analysis for ANY agent with the same fingerprint."""
+        pending = settings.enable_analysis_cache and history_writer.find_pending(
+            lambda a: a.analysis_fingerprint == fingerprint
+            and a.agent_id != exclude_agent_id
+            and a.status == "completed"
+        )
+        if pending:
+            return pending
+        return await self._run(
+            "find_cached_analysis_by_fingerprint", fingerprint, exclude_agent_id, max_age_hours
+        )
+
+    async def get_cached_fingerprints(
+        self,
+        fingerprints: List[str],
+        max_age_hours: Optional[int] = None,
+    ) -> Set[str]:
+        """Find which fingerprints already have a valid cached analysis (any agent)."""
+        wanted = set(fingerprints)
+        pending = {
+            a.analysis_fingerprint
+            for a in history_writer.pending()
+            if a.analysis_fingerprint in wanted and a.status == "completed"
+        }
+        return pending | await self._run("get_cached_fingerprints", fingerprints, max_age_hours)
+
+    async def get_by_id(self, analysis_id: str) -> Optional[AnalysisHistory]:
+        """Get analysis by ID."""
+        return history_writer.get_pending(analysis_id) or await self._run("get_by_id", analysis_id)
+
+    async def get_history_by_agent(
+        self,
+        agent_id: str,
+        limit: int = 50,
+        offset: int = 0,
+        status_filter: Optional[str] = None,
+        before: Optional[HistoryCursor] = None,
+    ) -> List[AnalysisHistory]:
+        """Get analysis history for a specific agent, newest first."""
+        await history_writer.flush()
+        return await self._run("get_history_by_agent", agent_id, limit, offset, status_filter, before)
+
+    async def get_history_by_check(
+        self,
+        agent_id: str,
+        check_id: int,
+        limit: int = 20,
+        before: Optional[HistoryCursor] = None,
+    ) -> List[AnalysisHistory]:
+        """Get analysis history for a specific check."""
+        await history_writer.flush()
+        return await self._run("get_history_by_check", agent_id, check_id, limit, before)
+
+    async def get_recent_analyses(
+        self,
+        hours: int = 24,
+        limit: int = 100,
+        before: Optional[HistoryCursor] = None,
+    ) -> List[AnalysisHistory]:
+        """Get recent analyses across all agents."""
+        await history_writer.flush()
+        return await self._run("get_recent_analyses", hours, limit, before)
+
+    async def delete_analysis(self, analysis_id: str) -> bool:
+        """Delete an analysis from history; returns False if not found."""
+        await history_writer.flush()
+        analysis = await self._run("get_by_id", analysis_id)
+        if analysis is None:
+            return False
+        deleted = await self._run("delete_analysis", analysis_id)
+        if deleted:
+            history_counts.add(analysis.agent_id, analysis.status, -1)
+        return deleted
+
+    async def count_by_agent(
+        self,
+        agent_id: str,
+        status_filter: Optional[str] = None,
+        exact: bool = True,
+    ) -> int:
+        """
+        Count the analyses of an agent, optionally of one status.
+
+        Args:
+            agent_id: Wazuh agent ID
+            status_filter: Optional status filter
+            exact: Query the database; otherwise serve the in-process count
+                (see history_counts.py) while it is fresh
+
+        Returns:
+            Number of analyses
+        """
+        if not exact:
+            cached = history_counts.get(agent_id, status_filter)
+            if cached is not None:
+                return cached
+
+        await history_writer.flush()
+        counts = await self._run("count_by_agent_status", agent_id)
+        history_counts.load(agent_id, counts)
+        return counts.get(status_filter, 0) if status_filter else sum(counts.values())
+
+    async def get_cache_stats(self) -> dict:
+        """Get cache statistics."""
+        await history_writer.flush()
+        return await self._run("get_cache_stats")
+
+    async def get_llm_call_stats(self, hours: int = 24) -> List[Dict[str, Any]]:
+        """Aggregate LLM call metrics per provider and model."""
+        await history_writer.flush()
+        return await self._run("get_llm_call_stats", hours)
@@ -0,0 +1,53 @@
+"""
+Per-agent analysis counts for history page totals.
+
+The history panel shows a page count, which used to cost a COUNT(*) over the
+agent's rows on every page. The counts of an agent are now loaded with one
+GROUP BY status query and then kept up to date in process: the history
+writer adds every saved analysis and AsyncAnalysisRepository subtracts
+deleted ones. Changes made by other processes (uvicorn workers, scripts) are
+picked up when the counts are reloaded, every `history_count_refresh_seconds`,
+so totals served from here are approximate.
+"""
+
+import time
+from typing import Dict, Optional, Tuple
+
+from app.config import settings
+
+
+class HistoryCounts:
+    """In-process analysis counts per agent and status."""
+
+    def __init__(self):
+        # agent_id -> (monotonic load time, {status: count})
+        self._counts: Dict[str, Tuple[float, Dict[str, int]]] = {}
+
+    def get(self, agent_id: str, status: Optional[str] = None) -> Optional[int]:
+        """
+        Count of an agent's analyses, optionally of one status.
+
+        Returns:
+            The count, or None if it is not loaded or older than
+            `history_count_refresh_seconds`
+        """
+        entry = self._counts.get(agent_id)
+        if entry is None or time.monotonic() - entry[0] > settings.history_count_refresh_seconds:
+            return None
+        counts = entry[1]
+        return counts.get(status, 0) if status else sum(counts.values())
+
+    def load(self, agent_id: str, counts: Dict[str, int]) -> None:
+        """Replace an agent's counts with freshly queried ones."""
+        self._counts[agent_id] = (time.monotonic(), dict(counts))
+
+    def add(self, agent_id: str, status: str, delta: int = 1) -> None:
+        """Count a saved (or, with a negative delta, deleted) analysis."""
+        entry = self._counts.get(agent_id)
+        if entry is not None:
+            counts = entry[1]
+            counts[status] = max(0, counts.get(status, 0) + delta)
+
+
+# Global history counts instance
+history_counts = HistoryCounts()
@@ -0,0 +1,193 @@
+"""
+Write-behind buffer for analysis history inserts.
+
+Saving an analysis used to cost a transaction (and an fsync) in the request
+path, even for shared-cache hits that only copy an existing row. While the
+writer runs, AsyncAnalysisRepository.save_analysis builds the row, queues it
+here and returns it; queued rows are inserted in one transaction whenever
+`history_flush_max_rows` are waiting or every `history_flush_interval_ms`.
+
+Queued rows stay visible to the process before they are written: point
+lookups (by ID and cache fingerprint) also search the queue, and history
+listings and statistics flush it first. Pending rows are flushed when the
+writer stops on shutdown.
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.db.models import AnalysisHistory
+from app.db.session import AsyncSessionLocal
+from app.repositories.analysis_repository import AnalysisRepository, log_saved_analysis
+from app.repositories.history_counts import history_counts
+from app.utils.logger import logger
+
+
+async def insert_analyses(analyses: List[AnalysisHistory]) -> None:
+    """Insert built analyses in one transaction of a new session."""
+    async with AsyncSessionLocal() as db:
+        await db.run_sync(lambda session: AnalysisRepository(session).save_analyses(analyses))
+
+
+class HistoryWriter:
+    """Buffers history inserts and writes them in bulk transactions."""
+
+    def __init__(self):
+        # Queued rows by ID, oldest first
+        self._pending: Dict[str, AnalysisHistory] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self.flushes = 0
+        self.written = 0
+        self.failed = 0
+        self.largest_batch = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def save(self, analysis: AnalysisHistory) -> AnalysisHistory:
+        """
+        Save a built analysis (see AnalysisRepository.build_analysis).
+
+        Queued while the writer runs; written right away otherwise. Either
+        way it is counted in history_counts once it is visible: queued rows
+        are uncounted again if a flush drops them.
+
+        Returns:
+            The analysis, with its ID and date set
+        """
+        if not self.running:
+            await insert_analyses([analysis])
+            history_counts.add(analysis.agent_id, analysis.status)
+            log_saved_analysis(analysis)
+            return analysis
+
+        self._pending[analysis.id] = analysis
+        history_counts.add(analysis.agent_id, analysis.status)
+        if len(self._pending) >= settings.history_flush_max_rows:
+            self._wakeup.set()
+        return analysis
+
+    def pending(self) -> List[AnalysisHistory]:
+        """Queued analyses, oldest first."""
+        return list(self._pending.values())
+
+    def find_pending(self, predicate: Callable[[AnalysisHistory], bool]) -> Optional[AnalysisHistory]:
+        """Newest queued analysis matching a predicate, if any."""
+        for analysis in reversed(self.pending()):
+            if predicate(analysis):
+                return analysis
+        return None
+
+    def get_pending(self, analysis_id: str) -> Optional[AnalysisHistory]:
+        """Queued analysis by ID, if it has not been written yet."""
+        return self._pending.get(analysis_id)
+
+    async def flush(self) -> int:
+        """
+        Write every queued analysis.
+
+        A batch that fails because the database is unavailable or locked
+        stays queued for the next flush. Otherwise its rows are retried one
+        by one, and rows that still fail are dropped and logged.
+
+        Returns:
+            Number of analyses written
+        """
+        async with self._flush_lock:
+            batch = self.pending()
+            if not batch:
+                return 0
+
+            written = batch
+            try:
+                await insert_analyses(batch)
+            except OperationalError as e:
+                logger.error(f"❌ History flush of {len(batch)} analyses failed, retrying later: {e}")
+                return 0
+            except Exception as e:
+                logger.warning(f"⚠️ History flush of {len(batch)} analyses failed ({e}); writing one by one")
+                written = []
+                for analysis in batch:
+                    try:
+                        await insert_analyses([analysis])
+                        written.append(analysis)
+                    except OperationalError:
+                        # Unavailable again: keep the rest queued
+                        break
+                    except Exception as row_error:
+                        self._pending.pop(analysis.id, None)
+                        history_counts.add(analysis.agent_id, analysis.status, -1)
+                        self.failed += 1
+                        logger.error(f"❌ Dropped history row {analysis.id}: {row_error}")
+
+            for analysis in written:
+                self._pending.pop(analysis.id, None)
+                log_saved_analysis(analysis)
+            self.flushes += 1
+            self.written += len(written)
+            self.largest_batch = max(self.largest_batch, len(written))
+            return len(written)
+
+    async def _loop(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=settings.history_flush_interval_ms / 1000
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"History flush failed: {e}")
+
+    def start(self) -> None:
+        """Start write-behind batching (call from the running event loop)."""
+        if self._task is not None or not settings.history_write_behind:
+            return
+        self._task = asyncio.create_task(self._loop())
+        logger.info(
+            f"💾 History write-behind: up to {settings.history_flush_max_rows} rows "
+            f"every {settings.history_flush_interval_ms}ms"
+        )
+
+    async def stop(self) -> None:
+        """Stop batching and flush the queued analyses; later saves are written directly."""
+        if self._task is None:
+            return
+        # Not cancelled: a flush interrupted mid-commit could be written twice
+        written_before = self.written
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        self._stopping = False
+        await self.flush()
+        flushed = self.written - written_before
+        if self._pending:
+            logger.error(f"❌ {len(self._pending)} history rows could not be written on shutdown")
+        elif flushed:
+            logger.info(f"💾 Flushed {flushed} pending history rows on shutdown")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue size and write totals."""
+        return {
+            "enabled": self.running,
+            "pending": len(self._pending),
+            "flushes": self.flushes,
+            "written": self.written,
+            "failed": self.failed,
+            "largest_batch": self.largest_batch,
+        }
+
+
+# Global history writer instance
+history_writer = HistoryWriter()
@@ -1 +1 @@
-"""Services package."""
+"""Services package."""
@@ -1,6 +1,7 @@
-"""AI services package."""
-
-from app.services.ai.factory import AIServiceFactory, AIProvider
-from app.services.ai.base import BaseAIService
-
-__all__ = ["AIServiceFactory", "AIProvider", "BaseAIService"]
+"""AI services package."""
+
+from app.services.ai.factory import AIServiceFactory, AIProvider
+from app.services.ai.base import BaseAIService
+from app.services.ai.fingerprint import compute_analysis_fingerprint
+
+__all__ = ["AIServiceFactory", "AIProvider", "BaseAIService", "compute_analysis_fingerprint"]
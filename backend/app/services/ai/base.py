@@ -1,300 +1,555 @@
-"""Base abstract class for AI services."""
-
-from abc import ABC, abstractmethod
-from typing import Dict, Any, AsyncIterator, Optional
-import re
-
-
-class BaseAIService(ABC):
-    """Abstract base class for AI analysis services."""
-
-    @abstractmethod
-    async def analyze_check(
-        self, check_data: Dict[str, Any], language: str = "en", agent_info: Dict[str, Any] = None
-    ) -> str:
-        """
-        Analyze an SCA check and return a formatted report.
-
-        Args:
-            check_data: Dictionary containing check information
-            language: Language for the report ('pt' or 'en')
-            agent_info: Dictionary containing agent information (name, ip, os, etc.)
-
-        Returns:
-            Formatted analysis report as string
-        """
-        pass
-
-    @abstractmethod
-    async def analyze_check_stream(
-        self, check_data: Dict[str, Any], language: str = "en", agent_info: Dict[str, Any] = None
-    ) -> AsyncIterator[str]:
-        """
-        Stream analysis of an SCA check.
-
-        Args:
-            check_data: Dictionary containing check information
-            language: Language for the report ('pt' or 'en')
-            agent_info: Dictionary containing agent information (name, ip, os, etc.)
-
-        Yields:
-            Chunks of the analysis report
-        """
-        pass
-
-    def _build_prompt(self, check_data: Dict[str, Any], language: str, agent_info: Dict[str, Any] = None) -> str:
-        """Build the prompt for AI analysis with agent context."""
-        # Extract compliance frameworks if available
-        compliance_frameworks = []
-        if check_data.get("compliance"):
-            for comp in check_data["compliance"]:
-                compliance_frameworks.extend(comp.keys())
-        compliance_str = ", ".join(compliance_frameworks) if compliance_frameworks else "N/A"
-
-        # Extract agent information
-        agent_name = "N/A"
-        agent_ip = "N/A"
-        os_name = "N/A"
-        os_version = "N/A"
-        os_arch = "N/A"
-
-        if agent_info:
-            agent_name = agent_info.get("name", "N/A")
-            agent_ip = agent_info.get("ip", "N/A")
-            if agent_info.get("os"):
-                os_info = agent_info["os"]
-                os_name = os_info.get("name", "N/A")
-                os_version = os_info.get("version", "N/A")
-                os_arch = os_info.get("arch", "N/A")
-
-        prompts = {
-            "pt": """Tarefa: Analise os seguintes dados de verificação SCA do Wazuh e forneça um relatório técnico detalhado com script executável.
-
-O relatório deve conter:
-1. **Descrição do Problema:** Explicação clara do problema de segurança identificado.
-2. **Contexto Técnico:** Análise dos detalhes técnicos do erro (ficheiro, comando, razão específica).
-3. **Passos de Remediação:** Passos técnicos detalhados e específicos para corrigir o problema, adaptados ao sistema operativo.
-4. **Script de Remediação Executável:** Script completo pronto para executar (bash para Linux, powershell para Windows).
-5. **Validação:** Como verificar se a correção foi aplicada com sucesso.
-
-Comece sua resposta imediatamente com a seguinte linha:
---- Relatório de Análise de Conformidade SCA ---
-
-## Contexto do Sistema:
-**Agente:** {agent_name}
-**IP:** {agent_ip}
-**Sistema Operativo:** {os_name} {os_version}
-**Arquitetura:** {os_arch}
-
-## Dados da Verificação:
-**ID:** {check_id}
-**Título:** {title}
-**Resultado:** {result}
-**Compliance:** {compliance}
-
-**Justificativa:**
-{rationale}
-
-**Remediação Recomendada:**
-{remediation}
-
-## Detalhes Técnicos do Erro:
-**Razão Específica:** {reason}
-**Ficheiro Afetado:** {file}
-**Diretório:** {directory}
-**Processo:** {process}
-**Registo:** {registry}
-**Comando de Verificação:** {command}
-**Condição:** {condition}
-
-IMPORTANTE:
-1. Forneça passos de remediação específicos para {os_name} {os_version} ({os_arch}).
-2. Considere os detalhes técnicos fornecidos (ficheiro, comando, razão) na sua análise.
-3. OBRIGATÓRIO: Inclua uma seção "## Script de Remediação Automática" com um bloco de código executável:
-   - Use ```bash para sistemas Linux/Unix
-   - Use ```powershell para sistemas Windows
-   - Inclua shebang apropriado (#!/bin/bash ou similar)
-   - Adicione verificação de privilégios (root/admin check)
-   - Inclua comentários explicativos
-   - Adicione tratamento de erros (set -e, verificações if/else)
-   - Termine com comando de validação
-4. Após o bloco de script, adicione:
-   **Comando de Validação:** (comando único para verificar se a correção funcionou)
-   **Riscos Potenciais:** (lista de avisos, se aplicável)
-   **Tempo Estimado:** (estimativa de duração)
-""",
-            "en": """Task: Analyze the following Wazuh SCA check data and provide a detailed technical report with executable script.
-
-The report must contain:
-1. **Problem Description:** Clear explanation of the identified security issue.
-2. **Technical Context:** Analysis of technical error details (file, command, specific reason).
-3. **Remediation Steps:** Detailed and specific technical steps to fix the problem, adapted to the operating system.
-4. **Executable Remediation Script:** Complete ready-to-execute script (bash for Linux, powershell for Windows).
-5. **Validation:** How to verify the fix was successfully applied.
-
-Begin your response immediately with the following line:
---- SCA Compliance Analysis Report ---
-
-## System Context:
-**Agent:** {agent_name}
-**IP:** {agent_ip}
-**Operating System:** {os_name} {os_version}
-**Architecture:** {os_arch}
-
-## Check Data:
-**ID:** {check_id}
-**Title:** {title}
-**Result:** {result}
-**Compliance:** {compliance}
-
-**Rationale:**
-{rationale}
-
-**Recommended Remediation:**
-{remediation}
-
-## Technical Error Details:
-**Specific Reason:** {reason}
-**Affected File:** {file}
-**Directory:** {directory}
-**Process:** {process}
-**Registry:** {registry}
-**Verification Command:** {command}
-**Condition:** {condition}
-
-IMPORTANT:
-1. Provide remediation steps specific to {os_name} {os_version} ({os_arch}).
-2. Consider the technical details provided (file, command, reason) in your analysis.
-3. REQUIRED: Include a "## Automated Remediation Script" section with an executable code block:
-   - Use ```bash for Linux/Unix systems
-   - Use ```powershell for Windows systems
-   - Include appropriate shebang (#!/bin/bash or similar)
-   - Add privilege checks (root/admin check)
-   - Include explanatory comments
-   - Add error handling (set -e, if/else checks)
-   - End with validation command
-4. After the script block, add:
-   **Validation Command:** (single command to verify the fix worked)
-   **Potential Risks:** (list of warnings, if applicable)
-   **Estimated Time:** (duration estimate)
-""",
-        }
-
-        template = prompts.get(language, prompts["en"])
-        return template.format(
-            # Agent context
-            agent_name=agent_name,
-            agent_ip=agent_ip,
-            os_name=os_name,
-            os_version=os_version,
-            os_arch=os_arch,
-            # Check data
-            check_id=check_data.get("id", "N/A"),
-            title=check_data.get("title", "N/A"),
-            result=check_data.get("result", "failed"),
-            compliance=compliance_str,
-            rationale=check_data.get("rationale", "N/A"),
-            remediation=check_data.get("remediation", "N/A"),
-            # Technical details
-            reason=check_data.get("reason", "N/A"),
-            file=check_data.get("file", "N/A"),
-            directory=check_data.get("directory", "N/A"),
-            process=check_data.get("process", "N/A"),
-            registry=check_data.get("registry", "N/A"),
-            command=check_data.get("command", "N/A"),
-            condition=check_data.get("condition", "N/A"),
-        )
-
-    def _parse_remediation_script(
-        self, ai_output: str, os_info: Optional[Dict[str, Any]] = None
-    ) -> Optional[Dict[str, Any]]:
-        """
-        Parse remediation script from AI output.
-
-        Args:
-            ai_output: The complete AI analysis output
-            os_info: Optional OS information to detect script language
-
-        Returns:
-            Dictionary with script data or None if no script found
-        """
-        # Detect script language based on OS or code fence
-        script_language = "bash"  # default
-        if os_info:
-            os_name = os_info.get("name", "").lower()
-            if "windows" in os_name:
-                script_language = "powershell"
-
-        # Try to find code blocks with language hints
-        patterns = [
-            (r'```bash\s*\n(.*?)```', "bash"),
-            (r'```shell\s*\n(.*?)```', "bash"),
-            (r'```sh\s*\n(.*?)```', "bash"),
-            (r'```powershell\s*\n(.*?)```', "powershell"),
-            (r'```ps1\s*\n(.*?)```', "powershell"),
-            (r'```python\s*\n(.*?)```', "python"),
-        ]
-
-        script_content = None
-        detected_language = script_language
-
-        for pattern, lang in patterns:
-            match = re.search(pattern, ai_output, re.DOTALL | re.IGNORECASE)
-            if match:
-                script_content = match.group(1).strip()
-                detected_language = lang
-                break
-
-        if not script_content:
-            # Try generic code block
-            match = re.search(r'```\s*\n(.*?)```', ai_output, re.DOTALL)
-            if match:
-                script_content = match.group(1).strip()
-
-        if not script_content:
-            return None
-
-        # Extract validation command
-        validation_match = re.search(
-            r'\*\*(?:Comando de )?Valida[çc][ãa]o(?:\s+Command)?[:\*]\*\*\s*[`]?(.*?)[`]?(?:\n|$)',
-            ai_output,
-            re.IGNORECASE
-        )
-        validation_command = validation_match.group(1).strip() if validation_match else ""
-
-        # Extract risks
-        risks = []
-        risks_section = re.search(
-            r'\*\*(?:Riscos )?Potenciais?(?: Risks)?[:\*]\*\*(.*?)(?:\n\*\*|\n##|$)',
-            ai_output,
-            re.DOTALL | re.IGNORECASE
-        )
-        if risks_section:
-            risk_text = risks_section.group(1)
-            # Extract bullet points
-            risk_items = re.findall(r'[-*]\s*(.+?)(?:\n|$)', risk_text)
-            risks = [risk.strip() for risk in risk_items if risk.strip()]
-
-        # Extract estimated time
-        time_match = re.search(
-            r'\*\*(?:Tempo )?Estimado?(?: Time)?[:\*]\*\*\s*(.+?)(?:\n|$)',
-            ai_output,
-            re.IGNORECASE
-        )
-        estimated_duration = time_match.group(1).strip() if time_match else None
-
-        # Detect if requires root/admin
-        requires_root = False
-        if detected_language in ["bash", "shell", "sh"]:
-            requires_root = bool(re.search(r'(sudo\s+|if.*EUID.*root|su\s+-)', script_content))
-        elif detected_language == "powershell":
-            requires_root = bool(re.search(r'(RunAsAdministrator|elevation required)', script_content, re.IGNORECASE))
-
-        return {
-            "script_content": script_content,
-            "script_language": detected_language,
-            "validation_command": validation_command,
-            "estimated_duration": estimated_duration,
-            "requires_root": requires_root,
-            "risks": risks
-        }
+"""Base abstract class for AI services."""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, Optional, List, Tuple, Union
+import asyncio
+
+from app.config import settings
+from app.prompts import prompt_registry
+from app.services.ai.fingerprint import prompt_os_fields
+from app.services.ai.packing import PACK_MARKER, group_related_checks, split_packed_output
+from app.services.ai.report_parser import ReportStreamParser, parse_report
+from app.services.ai.scheduler import PRIORITY_INTERACTIVE
+from app.services.ai.structured_output import InvalidStructuredOutput, parse_structured_report, render_report
+from app.services.ai.token_budget import CONTEXT_SAFETY_MARGIN, estimate_tokens, token_budget, truncate_field
+from app.services.ai.translation import (
+    TranslationError,
+    build_translation_prompt,
+    finish_translation,
+    protect_code,
+    translation_max_tokens,
+)
+from app.utils.exceptions import AIServiceError
+from app.utils.logger import logger
+
+
+# A reference analysis cut shorter than this is not worth its prompt tokens
+MIN_REFERENCE_TOKENS = 128
+
+
+class BaseAIService(ABC):
+    """Abstract base class for AI analysis services."""
+
+    # Metrics of the last streamed call (see LLMCallTimer.to_dict); single
+    # calls return theirs in the result under "llm_metrics"
+    last_metrics: Optional[Dict[str, Any]] = None
+
+    # Scheduling class and fair-queuing tenant of this service's requests
+    # (see scheduler.py); set by AIServiceFactory.create
+    priority: str = PRIORITY_INTERACTIVE
+    tenant: Optional[str] = None
+
+    # Context length of the provider's model in tokens (None when it is much
+    # larger than any prompt and report)
+    context_window: Optional[int] = None
+
+    @abstractmethod
+    async def analyze_check(
+        self, check_data: Dict[str, Any], language: str = "en", agent_info: Dict[str, Any] = None
+    ) -> str:
+        """
+        Analyze an SCA check and return a formatted report.
+
+        Args:
+            check_data: Dictionary containing check information
+            language: Language for the report ('pt' or 'en')
+            agent_info: Dictionary containing agent information (name, ip, os, etc.)
+
+        Returns:
+            Formatted analysis report as string
+        """
+        pass
+
+    @abstractmethod
+    async def analyze_check_stream(
+        self, check_data: Dict[str, Any], language: str = "en", agent_info: Dict[str, Any] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream analysis of an SCA check.
+
+        Args:
+            check_data: Dictionary containing check information
+            language: Language for the report ('pt' or 'en')
+            agent_info: Dictionary containing agent information (name, ip, os, etc.)
+
+        Yields:
+            Chunks of the analysis report
+        """
+        pass
+
+    async def analyze_checks_batch(
+        self,
+        checks: List[Dict[str, Any]],
+        language: str = "en",
+        agent_info: Dict[str, Any] = None,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Analyze several SCA checks of the same agent.
+
+        The default implementation issues concurrent single-check calls bounded by
+        `ai_batch_concurrency`. Providers that support multi-prompt requests override it.
+
+        Args:
+            checks: List of check dictionaries
+            language: Language for the reports ('pt' or 'en')
+            agent_info: Dictionary containing agent information (name, ip, os, etc.)
+
+        Returns:
+            One entry per check, in order: the analysis result dict, or the exception
+            raised while analyzing that check
+        """
+        semaphore = asyncio.Semaphore(settings.ai_batch_concurrency)
+
+        async def analyze_one(check: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.analyze_check(check, language=language, agent_info=agent_info)
+
+        return await asyncio.gather(*(analyze_one(check) for check in checks), return_exceptions=True)
+
+    async def analyze_checks_packed(
+        self,
+        checks: List[Dict[str, Any]],
+        language: str = "en",
+        agent_info: Dict[str, Any] = None,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Analyze several checks of one agent, packing related ones into shared calls.
+
+        Related checks (see packing.group_related_checks) are analyzed up to
+        `ai_pack_size` at a time in a single call that states the instructions
+        and system context once. Unrelated checks, and checks whose report is
+        missing from a packed output, go through `analyze_checks_batch`.
+        Structured output has a single-report schema, so in that mode every
+        check goes through `analyze_checks_batch`.
+
+        Args:
+            checks: List of check dictionaries
+            language: Language for the reports ('pt' or 'en')
+            agent_info: Dictionary containing agent information (name, ip, os, etc.)
+
+        Returns:
+            One entry per check, in order: the analysis result dict, or the exception
+            raised while analyzing that check
+        """
+        if settings.ai_structured_output or settings.ai_pack_size < 2:
+            return await self.analyze_checks_batch(checks, language=language, agent_info=agent_info)
+
+        groups = group_related_checks(checks, settings.ai_pack_size)
+        packs = [group for group in groups if len(group) > 1]
+        singles = [group[0] for group in groups if len(group) == 1]
+        results: List[Optional[Union[Dict[str, Any], Exception]]] = [None] * len(checks)
+        packed = 0
+
+        async def analyze_pack(group: List[int]) -> None:
+            nonlocal packed
+            try:
+                reports = await self._analyze_pack([checks[i] for i in group], language, agent_info)
+            except AIServiceError as e:
+                logger.warning(f"⚠️ Packed analysis of {len(group)} checks failed ({e}); analyzing them one by one")
+                return
+            for i in group:
+                results[i] = reports.get(str(checks[i].get("id")))
+                packed += results[i] is not None
+
+        async def analyze_singles(indices: List[int]) -> None:
+            if indices:
+                batch = await self.analyze_checks_batch(
+                    [checks[i] for i in indices], language=language, agent_info=agent_info
+                )
+                for i, result in zip(indices, batch):
+                    results[i] = result
+
+        await asyncio.gather(analyze_singles(singles), *(analyze_pack(group) for group in packs))
+
+        # Checks of packs that failed, did not fit or came back incomplete
+        await analyze_singles([i for i, result in enumerate(results) if result is None])
+
+        logger.info(
+            f"📦 Packed analysis: {packed} of {len(checks)} checks answered by packed calls, "
+            f"{len(checks) - packed} analyzed individually"
+        )
+        return results
+
+    async def _analyze_pack(
+        self, pack: List[Dict[str, Any]], language: str, agent_info: Optional[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze related checks in one call and split the reports back out.
+
+        A pack whose reports would not fit the model's context is split in
+        two (down to single checks, which are left to the caller). Every
+        report gets the timings of the shared call; token usage covers the
+        whole pack, so it is left out of the per-check metrics.
+
+        Returns:
+            Check ID (as a string) -> analysis result, for the reports found in the output
+        """
+        if len(pack) < 2:
+            return {}
+        policy_id = pack[0].get("policy_id")
+        prompt = self._build_packed_prompt(pack, language, agent_info)
+        if not await self._pack_fits(prompt, len(pack), policy_id):
+            half = len(pack) // 2
+            first, second = await asyncio.gather(
+                self._analyze_pack(pack[:half], language, agent_info),
+                self._analyze_pack(pack[half:], language, agent_info),
+            )
+            return {**first, **second}
+
+        max_tokens = await token_budget.max_tokens(
+            [prompt], policy_id, context_window=self.context_window, reports=len(pack)
+        )
+        text, truncated, metrics = await self._complete(
+            prompt, max_tokens, f"packed analysis of {len(pack)} checks"
+        )
+        metrics = {**metrics, "prompt_tokens": None, "completion_tokens": None, "tokens_per_second": None}
+
+        reports = split_packed_output(text)
+        if truncated and reports:
+            # The last report was cut off by max_tokens
+            reports.pop(list(reports)[-1])
+
+        results = {}
+        for check_id, report in reports.items():
+            result = self._finalize_report(report, language, agent_info)
+            result["llm_metrics"] = dict(metrics)
+            results[check_id] = result
+        return results
+
+    async def _pack_fits(self, prompt: str, reports: int, policy_id: Optional[str]) -> bool:
+        """Whether the model's context leaves the full output budget for every report of a pack."""
+        if not self.context_window:
+            return True
+        wanted = await token_budget.max_tokens([prompt], policy_id, reports=reports)
+        try:
+            allowed = await token_budget.max_tokens(
+                [prompt], policy_id, context_window=self.context_window, reports=reports
+            )
+        except AIServiceError:
+            return False
+        return allowed >= wanted
+
+    async def translate_report(
+        self,
+        report: str,
+        source_language: str,
+        language: str,
+        agent_info: Dict[str, Any] = None,
+    ) -> Dict[str, Any]:
+        """
+        Translate a finished report into the other language (see translation.py).
+
+        Only the prose goes through the model: code is restored verbatim, and
+        the remediation script is parsed from the translated report so its
+        risks and validation command come out in the new language.
+
+        Args:
+            report: Report text in `source_language`
+            source_language: Language of the report ('pt' or 'en')
+            language: Language to translate to ('pt' or 'en')
+            agent_info: Dictionary containing agent information (name, ip, os, etc.)
+
+        Returns:
+            Dictionary with the translated report, the remediation script and "llm_metrics"
+
+        Raises:
+            AIServiceError: If the translation fails, does not fit the context,
+                is cut off or changed the code
+        """
+        protected, snippets = protect_code(report)
+        prompt = build_translation_prompt(protected, source_language, language)
+        max_tokens = translation_max_tokens(protected)
+        if self.context_window and estimate_tokens(prompt) + max_tokens + CONTEXT_SAFETY_MARGIN > self.context_window:
+            raise AIServiceError("Report too long to translate within the model context")
+
+        text, truncated, metrics = await self._complete(prompt, max_tokens, "translation")
+        if truncated:
+            raise AIServiceError("Translation was cut off by max_tokens")
+        try:
+            translated = finish_translation(text, snippets, source_language, language)
+        except TranslationError as e:
+            raise AIServiceError(str(e))
+
+        result = self._finalize_report(translated, language, agent_info)
+        result["llm_metrics"] = metrics
+        return result
+
+    @abstractmethod
+    async def _complete(self, prompt: str, max_tokens: int, purpose: str) -> Tuple[str, bool, Dict[str, Any]]:
+        """
+        Generate free-form text for a prompt that is not a single-check analysis.
+
+        Args:
+            prompt: Complete prompt
+            max_tokens: Output token budget
+            purpose: What is generated, for log and error messages
+
+        Returns:
+            Tuple of (generated text, whether it was cut off by max_tokens, call metrics)
+
+        Raises:
+            AIServiceError: If the generation fails
+        """
+        pass
+
+    def _finalize_report(
+        self,
+        text: str,
+        language: str,
+        agent_info: Dict[str, Any] = None,
+        parser: Optional[ReportStreamParser] = None,
+    ) -> Dict[str, Any]:
+        """
+        Turn raw model output into the analysis result returned by analyze_check.
+
+        Args:
+            text: Raw generated text
+            language: Report language ('pt' or 'en')
+            agent_info: Dictionary containing agent information (name, ip, os, etc.)
+            parser: Parser that already consumed the whole text (e.g. while
+                streaming), to avoid parsing it a second time
+
+        Returns:
+            Dictionary with the report and the parsed remediation script (or None)
+        """
+        report = text.strip()
+
+        # Ensure report starts with header
+        header = (
+            "--- Relatório de Análise de Conformidade SCA ---"
+            if language == "pt"
+            else "--- SCA Compliance Analysis Report ---"
+        )
+        if not report.startswith("---"):
+            report = f"{header}\n{report}"
+
+        # Parse remediation script from the report
+        os_info = agent_info.get("os") if agent_info else None
+        if parser is not None:
+            script_data = parser.remediation_script(os_info)
+        else:
+            script_data = self._parse_remediation_script(report, os_info)
+
+        return {
+            "report": report,
+            "remediation_script": script_data
+        }
+
+    def _finalize_structured(self, text: str, language: str) -> Dict[str, Any]:
+        """
+        Turn structured (JSON) model output into the analysis result.
+
+        Args:
+            text: Raw generated text
+            language: Report language ('pt' or 'en')
+
+        Returns:
+            Dictionary with the rendered markdown report and the remediation script
+
+        Raises:
+            InvalidStructuredOutput: If the output does not match the schema
+        """
+        structured = parse_structured_report(text)
+        return {
+            "report": render_report(structured, language),
+            "remediation_script": structured.remediation_script.model_dump(),
+        }
+
+    def _finalize_output(
+        self, text: str, language: str, agent_info: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """Finalize a non-streamed completion in the configured output mode."""
+        if settings.ai_structured_output:
+            return self._finalize_structured(text, language)
+        return self._finalize_report(text, language, agent_info)
+
+    async def _retry_invalid_output(
+        self, analyze: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Run a single analysis, retrying once if the structured output was invalid.
+
+        Args:
+            analyze: Function performing one generation and returning the result
+
+        Returns:
+            The analysis result
+
+        Raises:
+            AIServiceError: If the retry also produced invalid output
+        """
+        try:
+            return await analyze()
+        except InvalidStructuredOutput as e:
+            logger.warning(f"⚠️ Invalid structured output ({e}); retrying once")
+
+        try:
+            return await analyze()
+        except InvalidStructuredOutput as e:
+            raise AIServiceError(f"Invalid structured output after retry: {e}")
+
+    async def _structured_stream(
+        self, check_data: Dict[str, Any], language: str = "en", agent_info: Dict[str, Any] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream substitute for structured output mode.
+
+        Partial JSON is of no use to clients, so the analysis is generated and
+        validated as a whole and its rendered report is yielded at once.
+        """
+        self.last_metrics = None
+        result = await self.analyze_check(check_data, language=language, agent_info=agent_info)
+        self.last_metrics = result.get("llm_metrics")
+        yield result["report"]
+
+    def _prompt_fields(self, check_data: Dict[str, Any], agent_info: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Template fields of a check and its agent context."""
+        # Extract compliance frameworks if available
+        compliance_frameworks = []
+        if check_data.get("compliance"):
+            for comp in check_data["compliance"]:
+                compliance_frameworks.extend(comp.keys())
+        compliance_str = ", ".join(compliance_frameworks) if compliance_frameworks else "N/A"
+
+        # Extract agent information (the OS fields are also fingerprinted)
+        agent_name = "N/A"
+        agent_ip = "N/A"
+
+        if agent_info:
+            agent_name = agent_info.get("name", "N/A")
+            agent_ip = agent_info.get("ip", "N/A")
+
+        return dict(
+            # Agent context
+            agent_name=agent_name,
+            agent_ip=agent_ip,
+            **prompt_os_fields(agent_info),
+            # Check data
+            check_id=check_data.get("id", "N/A"),
+            title=check_data.get("title", "N/A"),
+            result=check_data.get("result", "failed"),
+            compliance=compliance_str,
+            rationale=truncate_field(check_data.get("rationale", "N/A")),
+            remediation=truncate_field(check_data.get("remediation", "N/A")),
+            # Technical details
+            reason=truncate_field(check_data.get("reason", "N/A")),
+            file=check_data.get("file", "N/A"),
+            directory=check_data.get("directory", "N/A"),
+            process=check_data.get("process", "N/A"),
+            registry=check_data.get("registry", "N/A"),
+            command=check_data.get("command", "N/A"),
+            condition=check_data.get("condition", "N/A"),
+        )
+
+    def _build_prompt(self, check_data: Dict[str, Any], language: str, agent_info: Dict[str, Any] = None) -> str:
+        """Build the prompt for AI analysis with agent context."""
+        fields = self._prompt_fields(check_data, agent_info)
+        templates = prompt_registry
+
+        if settings.ai_structured_output:
+            # Structured output always uses the prefix-first layout
+            head = templates.render("structured_prefix", language) + templates.render(
+                "analysis_data", language, **fields
+            )
+            tail = templates.render("structured_response_start", language)
+        elif not settings.enable_prompt_prefix_caching:
+            head = templates.render("analysis_legacy", language, **fields)
+            tail = ""
+        else:
+            # Stable instruction prefix first, per-agent/per-check data last, so that
+            # every prompt in the same language shares the same leading tokens and
+            # vLLM's automatic prefix caching can reuse their KV cache.
+            head = templates.render("analysis_prefix", language) + templates.render(
+                "analysis_data", language, **fields
+            )
+            tail = templates.render("analysis_response_start", language)
+
+        # Analysis of a similar check, set by the analysis routes in seed mode
+        # (see similarity.py); placed after the check data so the instruction
+        # prefix stays shared
+        reference = ""
+        if check_data.get("reference_report"):
+            reference = self._reference_section(
+                check_data["reference_report"],
+                estimate_tokens(head + tail),
+                language,
+                check_data.get("policy_id"),
+            )
+        return head + reference + tail
+
+    def _reference_section(
+        self, reference_report: str, prompt_tokens: int, language: str, policy_id: Optional[str]
+    ) -> str:
+        """
+        Render the reference analysis of a seeded prompt, cut to fit.
+
+        The reference is truncated to `similarity_reference_max_tokens` and,
+        when the model's context window is known, to what the prompt leaves
+        after reserving the expected report length. It is left out when less
+        than MIN_REFERENCE_TOKENS would remain.
+
+        Args:
+            reference_report: Report of the similar check
+            prompt_tokens: Estimated tokens of the prompt without the reference
+            language: Report language ('pt' or 'en')
+            policy_id: SCA policy of the check, for the expected report length
+
+        Returns:
+            The rendered reference section, or "" if it does not fit
+        """
+        budget = settings.similarity_reference_max_tokens
+        if self.context_window:
+            overhead = estimate_tokens(prompt_registry.render("reference_analysis", language, reference_report=""))
+            available = (
+                self.context_window
+                - prompt_tokens
+                - overhead
+                - CONTEXT_SAFETY_MARGIN
+                - token_budget.expected_output_tokens(policy_id)
+            )
+            budget = min(budget, available)
+
+        if budget < MIN_REFERENCE_TOKENS:
+            logger.info(f"🧭 Reference analysis left out: only {max(0, budget)} tokens of context left for it")
+            return ""
+        return prompt_registry.render(
+            "reference_analysis", language, reference_report=truncate_field(reference_report, budget)
+        )
+
+    def _build_packed_prompt(
+        self, checks: List[Dict[str, Any]], language: str, agent_info: Dict[str, Any] = None
+    ) -> str:
+        """Build one prompt for several related checks of the same agent."""
+        templates = prompt_registry
+        parts = [
+            templates.render("packed_prefix", language),
+            templates.render("packed_system_context", language, **self._prompt_fields({}, agent_info)),
+        ]
+        for check in checks:
+            fields = self._prompt_fields(check, agent_info)
+            parts.append(
+                templates.render(
+                    "packed_check_data", language, marker=PACK_MARKER.format(check_id=fields["check_id"]), **fields
+                )
+            )
+        parts.append(templates.render("packed_response_start", language, count=len(checks)))
+        return "".join(parts)
+
+    def _parse_remediation_script(
+        self, ai_output: str, os_info: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Parse remediation script from AI output.
+
+        The report is tokenized once (see ReportStreamParser): every fenced
+        block and the labeled validation/risks/time fields are collected in a
+        single pass, then the primary script is selected by language.
+
+        Args:
+            ai_output: The complete AI analysis output
+            os_info: Optional OS information to detect script language
+
+        Returns:
+            Dictionary with script data or None if no script found
+        """
+        return parse_report(ai_output).remediation_script(os_info)
@@ -1,70 +1,135 @@
-"""AI service factory for selecting the appropriate provider."""
-
-from typing import Literal
-
-from app.services.ai.base import BaseAIService
-from app.services.ai.vllm_service import VLLMService
-from app.services.ai.openai_service import OpenAIService
-from app.utils.exceptions import AIServiceError
-from app.config import settings
-
-
-AIProvider = Literal["vllm", "openai"]
-
-
-class AIServiceFactory:
-    """Factory for creating AI service instances."""
-
-    _services = {
-        "vllm": VLLMService,
-        "openai": OpenAIService,
-    }
-
-    @classmethod
-    def create(cls, provider: AIProvider = "vllm") -> BaseAIService:
-        """
-        Create an AI service instance.
-
-        Args:
-            provider: The AI provider to use ('vllm' or 'openai')
-
-        Returns:
-            Instance of the requested AI service
-
-        Raises:
-            AIServiceError: If provider is not supported or not allowed by AI_MODE
-        """
-        # Validate provider against AI_MODE
-        if settings.ai_mode == "local" and provider == "openai":
-            raise AIServiceError(
-                "OpenAI provider is not available in 'local' AI mode. "
-                "Change AI_MODE to 'external' or 'mixed' in .env file."
-            )
-
-        if settings.ai_mode == "external" and provider == "vllm":
-            raise AIServiceError(
-                "vLLM provider is not available in 'external' AI mode. "
-                "Change AI_MODE to 'local' or 'mixed' in .env file."
-            )
-
-        service_class = cls._services.get(provider)
-        if not service_class:
-            raise AIServiceError(
-                f"Unsupported AI provider: {provider}. "
-                f"Supported providers: {', '.join(cls._services.keys())}"
-            )
-
-        try:
-            return service_class()
-        except Exception as e:
-            raise AIServiceError(f"Failed to initialize {provider} service: {str(e)}")
-
-    @classmethod
-    def get_available_providers(cls) -> list[str]:
-        """Get list of available AI providers based on AI_MODE configuration."""
-        if settings.ai_mode == "local":
-            return ["vllm"]
-        elif settings.ai_mode == "external":
-            return ["openai"]
-        else:  # mixed
-            return list(cls._services.keys())
+"""AI service factory for selecting the appropriate provider."""
+
+from typing import Literal, Optional
+
+from app.services.ai.base import BaseAIService
+from app.services.ai.vllm_service import VLLMService
+from app.services.ai.openai_service import OpenAIService
+from app.services.ai.routing import RoutingAIService
+from app.services.ai.scheduler import PRIORITIES, PRIORITY_INTERACTIVE
+from app.utils.exceptions import AIServiceError
+from app.utils.logger import logger
+from app.config import settings
+
+
+# "auto" routes between vLLM and OpenAI in mixed mode (see RoutingAIService)
+AIProvider = Literal["vllm", "openai", "auto"]
+
+
+class AIServiceFactory:
+    """Factory for creating AI service instances."""
+
+    _services = {
+        "vllm": VLLMService,
+        "openai": OpenAIService,
+    }
+
+    @classmethod
+    def create(
+        cls,
+        provider: AIProvider = "vllm",
+        priority: str = PRIORITY_INTERACTIVE,
+        tenant: Optional[str] = None,
+    ) -> BaseAIService:
+        """
+        Create an AI service instance.
+
+        Args:
+            provider: The AI provider to use ('vllm', 'openai' or 'auto')
+            priority: Scheduling class of the service's requests
+                ('interactive', 'batch' or 'background')
+            tenant: Fair-queuing key within the class (e.g. the agent ID)
+
+        Returns:
+            Instance of the requested AI service
+
+        Raises:
+            AIServiceError: If provider is not supported or not allowed by AI_MODE
+        """
+        if priority not in PRIORITIES:
+            raise AIServiceError(f"Unknown scheduling priority: {priority}")
+
+        if provider == "auto":
+            return cls._create_routing(priority, tenant)
+
+        # Validate provider against AI_MODE
+        if settings.ai_mode == "local" and provider == "openai":
+            raise AIServiceError(
+                "OpenAI provider is not available in 'local' AI mode. "
+                "Change AI_MODE to 'external' or 'mixed' in .env file."
+            )
+
+        if settings.ai_mode == "external" and provider == "vllm":
+            raise AIServiceError(
+                "vLLM provider is not available in 'external' AI mode. "
+                "Change AI_MODE to 'local' or 'mixed' in .env file."
+            )
+
+        service_class = cls._services.get(provider)
+        if not service_class:
+            raise AIServiceError(
+                f"Unsupported AI provider: {provider}. "
+                f"Supported providers: {', '.join(cls._services.keys())}"
+            )
+
+        try:
+            service = service_class()
+        except Exception as e:
+            raise AIServiceError(f"Failed to initialize {provider} service: {str(e)}")
+
+        service.priority = priority
+        service.tenant = tenant
+        return service
+
+    @classmethod
+    def _create_routing(cls, priority: str, tenant: Optional[str]) -> BaseAIService:
+        """
+        Create the service behind the 'auto' provider.
+
+        In mixed mode this is a RoutingAIService with `ai_routing_primary` as
+        primary and the other provider as hedge/failover target (left out if
+        it cannot be initialized, e.g. no OpenAI key). In local/external mode
+        it is simply the only available provider.
+        """
+        primary = cls.resolve_provider("auto")
+        if settings.ai_mode != "mixed":
+            return cls.create(primary, priority, tenant)
+
+        secondary = "openai" if primary == "vllm" else "vllm"
+        try:
+            secondary_service = cls.create(secondary, priority, tenant)
+        except AIServiceError as e:
+            logger.debug(f"Routing without {secondary} fallback: {e}")
+            return RoutingAIService(primary, cls.create(primary, priority, tenant))
+
+        return RoutingAIService(
+            primary, cls.create(primary, priority, tenant), secondary, secondary_service
+        )
+
+    @classmethod
+    def resolve_provider(cls, provider: AIProvider = "vllm") -> str:
+        """Map 'auto' to the provider it sends requests to first."""
+        if provider != "auto":
+            return provider
+        if settings.ai_mode == "local":
+            return "vllm"
+        if settings.ai_mode == "external":
+            return "openai"
+        return settings.ai_routing_primary
+
+    @classmethod
+    def get_model_name(cls, provider: AIProvider = "vllm") -> str:
+        """Get the model name configured for a provider (without instantiating it)."""
+        if cls.resolve_provider(provider) == "openai":
+            return settings.openai_model
+        return settings.vllm_model
+
+    @classmethod
+    def get_available_providers(cls) -> list[str]:
+        """Get list of available AI providers based on AI_MODE configuration."""
+        if settings.ai_mode == "local":
+            return ["vllm"]
+        elif settings.ai_mode == "external":
+            return ["openai"]
+        else:  # mixed
+            return list(cls._services.keys()) + ["auto"]
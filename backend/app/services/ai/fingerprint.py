@@ -0,0 +1,97 @@
+"""Content-addressed fingerprint for analysis cache lookups."""
+
+import hashlib
+import json
+import re
+from typing import Dict, Any, Optional
+
+from app.prompts import prompt_template_version
+
+# Check fields that are interpolated into the analysis prompt.
+# The check id and policy are deliberately left out: the same rule
+# shipped under another policy produces the same prompt content.
+PROMPT_CHECK_FIELDS = (
+    "title",
+    "result",
+    "rationale",
+    "remediation",
+    "reason",
+    "file",
+    "directory",
+    "process",
+    "registry",
+    "command",
+    "condition",
+)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(value: Any) -> str:
+    """Normalize a field value so cosmetic differences do not change the key."""
+    if value is None:
+        return ""
+    return _WHITESPACE_RE.sub(" ", str(value)).strip()
+
+
+def _compliance_frameworks(check_data: Dict[str, Any]) -> list[str]:
+    """Return the sorted, de-duplicated compliance framework names of a check."""
+    frameworks = set()
+    for comp in check_data.get("compliance") or []:
+        frameworks.update(comp.keys())
+    return sorted(frameworks)
+
+
+def prompt_os_fields(agent_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    OS fields of an agent as they are rendered into the analysis prompt.
+
+    Shared by the prompt builder and the fingerprint, so two agents whose
+    prompts differ never share a cache key.
+    """
+    os_info = (agent_info or {}).get("os") or {}
+    return {
+        "os_name": os_info.get("name", "N/A"),
+        "os_version": os_info.get("version", "N/A"),
+        "os_arch": os_info.get("arch", "N/A"),
+    }
+
+
+def compute_analysis_fingerprint(
+    check_data: Dict[str, Any],
+    language: str,
+    model: str,
+    agent_info: Optional[Dict[str, Any]] = None,
+    template_version: Optional[str] = None,
+) -> str:
+    """
+    Compute a deterministic fingerprint over the prompt-relevant inputs of an analysis.
+
+    Two analyses with the same fingerprint were generated from equivalent prompts
+    (same check content, OS name/version/architecture, language, template and
+    model) and can safely be reused for each other, regardless of agent, policy
+    or check id. The agent name, IP and check id are the only prompt fields
+    left out.
+
+    Args:
+        check_data: Dictionary containing check information
+        language: Report language ('pt' or 'en')
+        model: Model name used to generate the analysis
+        agent_info: Dictionary containing agent information (name, ip, os, etc.)
+        template_version: Prompt template version (defaults to the one in use
+            for the language, see app.prompts)
+
+    Returns:
+        Hex-encoded SHA-256 digest (64 characters)
+    """
+    payload = {
+        "check": {field: _normalize(check_data.get(field)) for field in PROMPT_CHECK_FIELDS},
+        "compliance": _compliance_frameworks(check_data),
+        "os": {field: _normalize(value) for field, value in prompt_os_fields(agent_info).items()},
+        "language": language,
+        "template": template_version or prompt_template_version(language),
+        "model": model,
+    }
+
+    serialized = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
@@ -0,0 +1,185 @@
+"""Per-call LLM instrumentation."""
+
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from app.utils.logger import logger
+
+
+class HedgeRace:
+    """
+    One of the calls a hedged request races (see RoutingAIService._route).
+
+    The router marks the calls it cancels because another provider answered
+    first, so their cancellation is not counted as a client disconnect.
+    """
+
+    def __init__(self):
+        self.lost = False
+
+
+# Race of the call running in the current task; set by the router
+current_hedge_race: ContextVar[Optional[HedgeRace]] = ContextVar("current_hedge_race", default=None)
+
+
+class LLMCallTimer:
+    """
+    Measures a single LLM call.
+
+    Timeline: the timer is created when the call is requested, `start()`
+    marks the moment the request is actually sent (after waiting for an
+    endpoint or a scheduler slot), `first_token()` the first streamed chunk
+    and `finish()` the end of generation.
+
+    Usage:
+        timer = LLMCallTimer("vllm", model)
+        ...                      # wait for a slot
+        timer.start(endpoint=url)
+        ...                      # send request, read response
+        timer.finish(prompt_tokens=..., completion_tokens=...)
+        metrics = timer.to_dict()
+
+    If the client goes away, or the call loses a hedge race, `cancel()`
+    closes the call instead of `finish()`.
+    """
+
+    def __init__(self, provider: str, model: str):
+        self.provider = provider
+        self.model = model
+        self.endpoint: Optional[str] = None
+        self.prompt_tokens: Optional[int] = None
+        self.completion_tokens: Optional[int] = None
+        self._created = time.perf_counter()
+        self._started: Optional[float] = None
+        self._first_token: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._race = current_hedge_race.get()
+        self.cancelled = False
+
+    def start(self, endpoint: Optional[str] = None) -> None:
+        """Mark the request as sent."""
+        self.endpoint = endpoint
+        self._started = time.perf_counter()
+
+    @property
+    def sent(self) -> bool:
+        """Whether the request was sent to the provider."""
+        return self._started is not None
+
+    def first_token(self) -> None:
+        """Mark the first generated chunk (streaming only; later calls are ignored)."""
+        if self._first_token is None:
+            self._first_token = time.perf_counter()
+
+    def finish(self, prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None) -> None:
+        """Mark the end of generation and record token usage, if reported."""
+        self._finished = time.perf_counter()
+        if prompt_tokens is not None:
+            self.prompt_tokens = prompt_tokens
+        if completion_tokens is not None:
+            self.completion_tokens = completion_tokens
+
+    def cancel(self) -> None:
+        """
+        Mark the call as cancelled (client disconnected or hedge race lost) and count it.
+
+        Generation stops here: the caller aborts the upstream request, so the
+        remaining tokens up to `max_tokens` are never generated.
+        """
+        if self.cancelled:
+            return
+        self.cancelled = True
+        self._finished = time.perf_counter()
+        cancellation_stats.record(self)
+
+    @property
+    def hedge_lost(self) -> bool:
+        """Whether the router cancelled the call because another provider answered first."""
+        return self._race is not None and self._race.lost
+
+    def record_usage(self, usage: Optional[Dict[str, Any]]) -> None:
+        """Record token usage from an OpenAI-compatible `usage` object."""
+        if usage:
+            self.prompt_tokens = usage.get("prompt_tokens", self.prompt_tokens)
+            self.completion_tokens = usage.get("completion_tokens", self.completion_tokens)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Metrics of the call, in seconds.
+
+        `time_to_first_token_seconds` is only known for streamed calls;
+        `tokens_per_second` counts completion tokens over the generation time
+        (after the first token when it is known).
+        """
+        started = self._started if self._started is not None else self._created
+        finished = self._finished if self._finished is not None else time.perf_counter()
+
+        ttft = self._first_token - started if self._first_token is not None else None
+        decode_start = self._first_token if self._first_token is not None else started
+        decode_seconds = finished - decode_start
+        tokens_per_second = (
+            self.completion_tokens / decode_seconds
+            if self.completion_tokens and decode_seconds > 0
+            else None
+        )
+
+        return {
+            "provider": self.provider,
+            "model": self.model,
+            "endpoint": self.endpoint,
+            "queue_wait_seconds": started - self._created,
+            "time_to_first_token_seconds": ttft,
+            "generation_seconds": finished - started,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "tokens_per_second": tokens_per_second,
+            "cancelled": self.cancelled,
+        }
+
+
+class CancellationStats:
+    """
+    Counts cancelled LLM calls per provider.
+
+    Calls cancelled because the client went away are counted in `cancelled`
+    (and their generation time in `generation_seconds`); hedged calls that
+    lost the race are counted apart, in `hedge_lost`.
+    """
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, timer: LLMCallTimer) -> None:
+        """Count a cancelled call and the generation time it had used."""
+        metrics = timer.to_dict()
+        entry = self._stats.setdefault(
+            timer.provider,
+            {"cancelled": 0, "cancelled_in_queue": 0, "generation_seconds": 0.0, "hedge_lost": 0},
+        )
+        if timer.hedge_lost:
+            entry["hedge_lost"] += 1
+            logger.debug(f"{timer.provider} request cancelled: another provider answered first")
+            return
+        entry["cancelled"] += 1
+        if not timer.sent:
+            # Cancelled before the request was sent: no generation was wasted
+            entry["cancelled_in_queue"] += 1
+            logger.info(f"🛑 {timer.provider} request cancelled while queued (client disconnected)")
+            return
+        entry["generation_seconds"] += metrics["generation_seconds"]
+        logger.info(
+            f"🛑 {timer.provider} generation cancelled after {metrics['generation_seconds']:.2f}s "
+            "(client disconnected)"
+        )
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Cancelled calls per provider and the generation seconds they used."""
+        return {
+            provider: {**entry, "generation_seconds": round(entry["generation_seconds"], 2)}
+            for provider, entry in self._stats.items()
+        }
+
+
+# Global cancellation counters
+cancellation_stats = CancellationStats()
@@ -1,101 +1,246 @@
-"""OpenAI AI service implementation."""
-
-from typing import Dict, Any, AsyncIterator
-from openai import AsyncOpenAI
-
-from app.config import settings
-from app.utils.logger import logger
-from app.utils.exceptions import AIServiceError
-from app.services.ai.base import BaseAIService
-
-
-class OpenAIService(BaseAIService):
-    """AI service using OpenAI API (ChatGPT)."""
-
-    def __init__(self):
-        if not settings.openai_api_key:
-            raise AIServiceError("OpenAI API key not configured")
-
-        self.client = AsyncOpenAI(
-            api_key=settings.openai_api_key,
-            base_url=settings.openai_base_url,
-        )
-        self.model = settings.openai_model
-
-    async def analyze_check(
-        self, check_data: Dict[str, Any], language: str = "en", agent_info: Dict[str, Any] = None
-    ) -> Dict[str, Any]:
-        """Analyze check using OpenAI and return report with remediation script."""
-        prompt = self._build_prompt(check_data, language, agent_info)
-
-        try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a cybersecurity expert specialized in analyzing security configuration assessments and creating executable remediation scripts.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.1,
-                max_tokens=3072,  # Increased for script generation
-            )
-
-            report = response.choices[0].message.content.strip()
-
-            # Ensure report starts with header
-            header = (
-                "--- Relatório de Análise de Conformidade SCA ---"
-                if language == "pt"
-                else "--- SCA Compliance Analysis Report ---"
-            )
-            if not report.startswith("---"):
-                report = f"{header}\n{report}"
-
-            # Parse remediation script from the report
-            os_info = agent_info.get("os") if agent_info else None
-            script_data = self._parse_remediation_script(report, os_info)
-
-            logger.info(
-                f"OpenAI analysis completed for check {check_data.get('id')}"
-                + (f" with script ({script_data['script_language']})" if script_data else " (no script)")
-            )
-
-            return {
-                "report": report,
-                "remediation_script": script_data
-            }
-
-        except Exception as e:
-            logger.error(f"OpenAI analysis failed: {e}")
-            raise AIServiceError(f"OpenAI analysis failed: {str(e)}")
-
-    async def analyze_check_stream(
-        self, check_data: Dict[str, Any], language: str = "en", agent_info: Dict[str, Any] = None
-    ) -> AsyncIterator[str]:
-        """Stream analysis using OpenAI."""
-        prompt = self._build_prompt(check_data, language, agent_info)
-
-        try:
-            stream = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a cybersecurity expert specialized in analyzing security configuration assessments.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.1,
-                max_tokens=2048,
-                stream=True,
-            )
-
-            async for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
-
-        except Exception as e:
-            logger.error(f"OpenAI streaming failed: {e}")
-            raise AIServiceError(f"OpenAI streaming failed: {str(e)}")
+"""OpenAI AI service implementation."""
+
+from typing import Dict, Any, AsyncIterator, Optional, Tuple
+import asyncio
+
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, RateLimitError
+
+from app.config import settings
+from app.utils.logger import logger
+from app.utils.exceptions import AIServiceError
+from app.services.ai.base import BaseAIService
+from app.services.ai.metrics import LLMCallTimer
+from app.services.ai.rate_limiter import openai_rate_limiter
+from app.services.ai.scheduler import llm_schedulers
+from app.services.ai.structured_output import InvalidStructuredOutput
+from app.services.ai.token_budget import estimate_tokens, token_budget
+
+# Retries of connection errors and 5xx responses (the SDK's own retries are
+# disabled so that 429s are handled by the rate limiter)
+TRANSIENT_RETRIES = 2
+
+
+class OpenAIService(BaseAIService):
+    """AI service using OpenAI API (ChatGPT)."""
+
+    def __init__(self):
+        if not settings.openai_api_key:
+            raise AIServiceError("OpenAI API key not configured")
+
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url,
+            max_retries=0,
+        )
+        self.scheduler = llm_schedulers["openai"]
+        self.model = settings.openai_model
+
+    async def analyze_check(
+        self, check_data: Dict[str, Any], language: str = "en", agent_info: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """Analyze check using OpenAI and return report with remediation script."""
+        return await self._retry_invalid_output(
+            lambda: self._analyze_once(check_data, language, agent_info)
+        )
+
+    async def _analyze_once(
+        self, check_data: Dict[str, Any], language: str, agent_info: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Single generation for analyze_check."""
+        timer = LLMCallTimer("openai", self.model)
+        prompt = self._build_prompt(check_data, language, agent_info)
+        max_tokens = await token_budget.max_tokens([prompt], check_data.get("policy_id"))
+
+        try:
+            async with self.scheduler.slot(self.priority, self.tenant):
+                response = await self._create(
+                    timer,
+                    model=self.model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are a cybersecurity expert specialized in analyzing security configuration assessments and creating executable remediation scripts.",
+                        },
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=0.1,
+                    max_tokens=max_tokens,
+                    # JSON mode: the prompt describes the report schema
+                    **({"response_format": {"type": "json_object"}} if settings.ai_structured_output else {}),
+                )
+
+            timer.finish()
+            timer.model = response.model or self.model
+            timer.record_usage(_usage_dict(response.usage))
+
+            result = self._finalize_output(response.choices[0].message.content, language, agent_info)
+            result["llm_metrics"] = timer.to_dict()
+            script_data = result["remediation_script"]
+
+            logger.info(
+                f"OpenAI analysis completed for check {check_data.get('id')}"
+                + (f" with script ({script_data['script_language']})" if script_data else " (no script)")
+            )
+
+            return result
+
+        except asyncio.CancelledError:
+            # Client went away: the pending request is closed with the task
+            timer.cancel()
+            raise
+        except InvalidStructuredOutput:
+            raise
+        except Exception as e:
+            logger.error(f"OpenAI analysis failed: {e}")
+            raise AIServiceError(f"OpenAI analysis failed: {str(e)}")
+
+    async def _complete(self, prompt: str, max_tokens: int, purpose: str) -> Tuple[str, bool, Dict[str, Any]]:
+        """Generate free-form text (packed reports, translations) with one chat completion."""
+        timer = LLMCallTimer("openai", self.model)
+
+        try:
+            async with self.scheduler.slot(self.priority, self.tenant):
+                response = await self._create(
+                    timer,
+                    model=self.model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are a cybersecurity expert specialized in analyzing security configuration assessments and creating executable remediation scripts.",
+                        },
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=0.1,
+                    max_tokens=max_tokens,
+                )
+            timer.finish()
+            timer.model = response.model or self.model
+            timer.record_usage(_usage_dict(response.usage))
+            choice = response.choices[0]
+            return choice.message.content, choice.finish_reason == "length", timer.to_dict()
+
+        except asyncio.CancelledError:
+            timer.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"OpenAI {purpose} failed: {e}")
+            raise AIServiceError(f"OpenAI {purpose} failed: {str(e)}")
+
+    async def analyze_check_stream(
+        self, check_data: Dict[str, Any], language: str = "en", agent_info: Dict[str, Any] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream analysis using OpenAI.
+
+        Call metrics (including time-to-first-token and the token usage of
+        the final stream chunk) are left in `last_metrics` when the stream ends.
+        """
+        if settings.ai_structured_output:
+            async for chunk in self._structured_stream(check_data, language, agent_info):
+                yield chunk
+            return
+
+        timer = LLMCallTimer("openai", self.model)
+        self.last_metrics = None
+        prompt = self._build_prompt(check_data, language, agent_info)
+        max_tokens = await token_budget.max_tokens([prompt], check_data.get("policy_id"))
+
+        try:
+            async with self.scheduler.slot(self.priority, self.tenant):
+                stream = await self._create(
+                    timer,
+                    model=self.model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are a cybersecurity expert specialized in analyzing security configuration assessments.",
+                        },
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=0.1,
+                    max_tokens=max_tokens,
+                    stream=True,
+                    extra_body={"stream_options": {"include_usage": True}},
+                )
+
+                try:
+                    async for chunk in stream:
+                        timer.record_usage(_usage_dict(getattr(chunk, "usage", None)))
+                        # The usage chunk at the end has no choices
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            timer.first_token()
+                            yield chunk.choices[0].delta.content
+                finally:
+                    # Release the connection even if the consumer stops early
+                    await stream.close()
+            timer.finish()
+
+        except (asyncio.CancelledError, GeneratorExit):
+            # Client went away: closing the stream stops the generation
+            timer.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"OpenAI streaming failed: {e}")
+            raise AIServiceError(f"OpenAI streaming failed: {str(e)}")
+        finally:
+            self.last_metrics = timer.to_dict()
+
+    async def _create(self, timer: LLMCallTimer, **request: Any) -> Any:
+        """
+        Send a chat completion request through the rate limiter.
+
+        Waits for RPM/TPM budget (prompt estimate plus `max_tokens`), retries
+        429 responses after the server-suggested delay and transient errors
+        with exponential backoff, and recalibrates the limiter from the
+        response headers.
+
+        Args:
+            timer: Call timer, started when the request is actually sent
+            **request: Arguments of `chat.completions.create`
+
+        Returns:
+            The parsed completion (or stream, with `stream=True`)
+        """
+        tokens = sum(estimate_tokens(m["content"]) for m in request["messages"]) + request["max_tokens"]
+        rate_limited = transient = 0
+
+        while True:
+            await openai_rate_limiter.acquire(tokens)
+            timer.start(settings.openai_base_url)
+            try:
+                raw = await self.client.chat.completions.with_raw_response.create(**request)
+            except RateLimitError as e:
+                # Exhausted quota (billing) does not recover by waiting
+                if _error_code(e) == "insufficient_quota" or rate_limited >= settings.openai_rate_limit_max_retries:
+                    raise
+                rate_limited += 1
+                delay = openai_rate_limiter.backoff(e.response.headers, rate_limited)
+                logger.warning(f"⏳ OpenAI rate limit hit; retrying in {delay:.1f}s ({rate_limited})")
+                continue
+            except (APIConnectionError, InternalServerError) as e:
+                if transient >= TRANSIENT_RETRIES:
+                    raise
+                transient += 1
+                logger.warning(f"OpenAI request failed ({e}); retrying ({transient})")
+                await asyncio.sleep(0.5 * 2 ** transient)
+                continue
+
+            openai_rate_limiter.update_from_headers(raw.headers)
+            return raw.parse()
+
+
+def _error_code(error: RateLimitError) -> Optional[str]:
+    """Error code of an OpenAI error response body, if any."""
+    body = error.body
+    if isinstance(body, dict):
+        body = body.get("error", body)
+        if isinstance(body, dict):
+            return body.get("code")
+    return None
+
+
+def _usage_dict(usage: Any) -> Optional[Dict[str, Any]]:
+    """Normalize an SDK usage object (model or plain dict) to a dict."""
+    if usage is None or isinstance(usage, dict):
+        return usage
+    return usage.model_dump()
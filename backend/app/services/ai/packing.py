@@ -0,0 +1,144 @@
+"""
+Packed analysis of related checks.
+
+Failing CIS checks of one host often come in families (a dozen sysctl
+parameters, the auditd rules, the sshd options). Analyzed one by one, each
+gets a ~1k-token prompt repeating the same instructions and system context.
+Packed mode groups up to `ai_pack_size` related checks of one agent into a
+single LLM call: instructions and system context are stated once, followed
+by the data of every check, and the model writes one report per check
+behind a marker line. The reports are split back out per check and
+finalized exactly like single analyses. The packed prompt templates
+(packed_*) are in app/prompts/templates.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+# Line separating the per-check parts of packed prompts and outputs
+PACK_MARKER = "=== CHECK {check_id} ==="
+_PACK_MARKER_RE = re.compile(r"^[ \t]*=== CHECK (\S+?) ===[ \t]*$", re.MULTILINE)
+
+# Verification commands too generic to say anything about how checks relate;
+# checks using them are grouped by file or compliance section instead
+_GENERIC_COMMANDS = {
+    "awk", "bash", "cat", "cut", "echo", "egrep", "find", "grep", "head",
+    "ls", "sed", "sh", "stat", "tail", "test",
+}
+
+
+def _first_value(value: Any) -> Optional[str]:
+    """First entry of a field that may be a list or a comma-separated string."""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if not value or not isinstance(value, str):
+        return None
+    first = value.split(",")[0].strip()
+    return first or None
+
+
+def _file_family(path: str) -> str:
+    """
+    Configuration family of a path: "/etc/audit/rules.d/x.rules" -> "etc/audit",
+    "/etc/sysctl.conf" and "/etc/sysctl.d/*" -> "etc/sysctl".
+    """
+    parts = [part for part in path.strip().strip("/").split("/") if part]
+    if len(parts) >= 3:
+        parts = parts[:2]
+    else:
+        parts = parts[:1] + [re.sub(r"(\.d|\.conf)$", "", part) for part in parts[1:2]]
+    return "/".join(parts)
+
+
+def _cis_section(check: Dict[str, Any]) -> Optional[str]:
+    """CIS section of a check ("3.3.1" -> "3.3"), from either compliance format."""
+    for entry in check.get("compliance") or []:
+        if not isinstance(entry, dict):
+            continue
+        # Wazuh API items are {"key": "cis", "value": "3.3.1"}; older ones {"cis": "3.3.1"}
+        if "key" in entry:
+            key, value = entry.get("key"), entry.get("value")
+        else:
+            key, value = next(iter(entry.items()), (None, None))
+        if key == "cis" and value:
+            section = _first_value(str(value))
+            if section:
+                return ".".join(section.split(".")[:2])
+    return None
+
+
+def relatedness_key(check: Dict[str, Any]) -> Optional[str]:
+    """
+    Key under which a check is grouped with related ones.
+
+    Tried in order: the verification command's tool (sysctl, auditctl, ...),
+    the configuration family of the affected file, then the CIS section.
+
+    Returns:
+        The key, or None if nothing relates the check to others
+    """
+    command = _first_value(check.get("command"))
+    if command:
+        tool = command.split()[0].rsplit("/", 1)[-1]
+        if tool not in _GENERIC_COMMANDS:
+            return f"command:{tool}"
+
+    path = _first_value(check.get("file")) or _first_value(check.get("directory"))
+    if path:
+        return f"file:{_file_family(path)}"
+
+    section = _cis_section(check)
+    if section:
+        return f"cis:{section}"
+    return None
+
+
+def group_related_checks(checks: List[Dict[str, Any]], pack_size: int) -> List[List[int]]:
+    """
+    Group related checks into packs of at most `pack_size`.
+
+    Args:
+        checks: Checks of one agent and policy
+        pack_size: Maximum number of checks per pack
+
+    Returns:
+        Groups of indices into `checks`, in first-appearance order; checks
+        with no related check form groups of one
+    """
+    families: Dict[Optional[str], List[int]] = {}
+    singles: List[List[int]] = []
+    for index, check in enumerate(checks):
+        key = relatedness_key(check)
+        if key is None:
+            singles.append([index])
+        else:
+            families.setdefault(key, []).append(index)
+
+    size = max(1, pack_size)
+    groups = [
+        members[start:start + size]
+        for members in families.values()
+        for start in range(0, len(members), size)
+    ]
+    return sorted(groups + singles, key=lambda group: group[0])
+
+
+def split_packed_output(text: str) -> Dict[str, str]:
+    """
+    Split packed model output into the report of each check.
+
+    Args:
+        text: Raw generated text
+
+    Returns:
+        Check ID (as a string) -> report text; checks without a marker are absent
+    """
+    reports: Dict[str, str] = {}
+    markers = list(_PACK_MARKER_RE.finditer(text))
+    for marker, following in zip(markers, markers[1:] + [None]):
+        end = following.start() if following else len(text)
+        report = text[marker.end():end].strip()
+        if report:
+            # A repeated marker keeps the first report
+            reports.setdefault(marker.group(1), report)
+    return reports
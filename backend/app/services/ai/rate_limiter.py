@@ -0,0 +1,179 @@
+"""
+Client-side rate limiting for the OpenAI API.
+
+OpenAI enforces requests-per-minute (RPM) and tokens-per-minute (TPM) limits
+per account, counting the prompt plus `max_tokens` of every request. The
+limiter keeps one token bucket per limit, makes requests wait until both
+buckets can cover them (in arrival order), recalibrates the buckets from the
+`x-ratelimit-*` response headers and pauses all requests when a 429 comes
+back, for as long as the server asks.
+"""
+
+import asyncio
+import re
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from app.config import settings
+from app.utils.logger import logger
+
+# Durations in rate-limit headers, e.g. "20ms", "1s", "6m0s", "1m30.5s"
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# Backoff cap when a 429 carries no usable hint
+MAX_BACKOFF_SECONDS = 60.0
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse an OpenAI rate-limit duration ("6m0s") or plain seconds ("1.5") to seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """Bucket refilled continuously up to a per-minute limit (0 = unlimited)."""
+
+    def __init__(self, per_minute: float):
+        self.limit = per_minute
+        self.available = per_minute
+        self._updated = time.monotonic()
+
+    def refill(self) -> None:
+        """Add the budget accrued since the last update."""
+        now = time.monotonic()
+        if self.limit > 0:
+            self.available = min(self.limit, self.available + (now - self._updated) * self.limit / 60.0)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` can be taken (requests above the limit wait for a full bucket)."""
+        if self.limit <= 0:
+            return 0.0
+        self.refill()
+        missing = min(amount, self.limit) - self.available
+        return max(0.0, missing * 60.0 / self.limit)
+
+    def take(self, amount: float) -> None:
+        if self.limit > 0:
+            self.refill()
+            self.available -= min(amount, self.limit)
+
+    def calibrate(self, limit: Optional[float], remaining: Optional[float]) -> None:
+        """Adopt the limit and remaining budget reported by the server."""
+        self.refill()
+        if limit:
+            self.limit = limit
+            self.available = min(self.available, limit)
+        if remaining is not None and self.limit > 0:
+            self.available = min(self.available, remaining)
+
+
+class OpenAIRateLimiter:
+    """RPM/TPM limiter shared by every OpenAI request of the process."""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self._lock = asyncio.Lock()
+        self._paused_until = 0.0
+        self.throttled_seconds = 0.0
+        self.rate_limited = 0
+
+    async def acquire(self, tokens: int) -> float:
+        """
+        Wait until a request of `tokens` (prompt + max_tokens) fits both limits.
+
+        Args:
+            tokens: Tokens the request counts against TPM
+
+        Returns:
+            Seconds spent waiting
+        """
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                wait = max(
+                    self._paused_until - time.monotonic(),
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(tokens),
+                )
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+
+        waited = time.monotonic() - start
+        if waited > 0.01:
+            self.throttled_seconds += waited
+            logger.debug(f"⏳ OpenAI request of ~{tokens} tokens throttled for {waited:.2f}s")
+        return waited
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Recalibrate both buckets from `x-ratelimit-*` response headers."""
+        self.requests.calibrate(
+            _number(headers.get("x-ratelimit-limit-requests")),
+            _number(headers.get("x-ratelimit-remaining-requests")),
+        )
+        self.tokens.calibrate(
+            _number(headers.get("x-ratelimit-limit-tokens")),
+            _number(headers.get("x-ratelimit-remaining-tokens")),
+        )
+
+    def backoff(self, headers: Mapping[str, str], attempt: int) -> float:
+        """
+        Pause every request after a 429 and return the delay before retrying.
+
+        Uses `retry-after-ms` / `retry-after` when present, then the reset
+        time of the exhausted limit, and exponential backoff otherwise.
+        """
+        self.rate_limited += 1
+        self.update_from_headers(headers)
+
+        retry_after_ms = _number(headers.get("retry-after-ms"))
+        delay = retry_after_ms / 1000.0 if retry_after_ms is not None else parse_duration(headers.get("retry-after"))
+        if delay is None:
+            resets = [
+                parse_duration(headers.get(name))
+                for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+            ]
+            delay = max((r for r in resets if r is not None), default=None)
+        if delay is None:
+            delay = 2.0 ** attempt
+        delay = min(max(delay, 0.1), MAX_BACKOFF_SECONDS)
+
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current limits, available budget and throttling counters."""
+        self.requests.refill()
+        self.tokens.refill()
+        return {
+            "rpm_limit": self.requests.limit,
+            "tpm_limit": self.tokens.limit,
+            "requests_available": round(self.requests.available, 1),
+            "tokens_available": round(self.tokens.available),
+            "throttled_seconds": round(self.throttled_seconds, 2),
+            "rate_limited_responses": self.rate_limited,
+        }
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+# Global OpenAI rate limiter instance
+openai_rate_limiter = OpenAIRateLimiter(settings.openai_rpm_limit, settings.openai_tpm_limit)
@@ -0,0 +1,251 @@
+"""Single-pass parser for markdown analysis reports."""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Labeled metadata fields requested by the prompt, in pt and en
+_LABEL_PATTERN = (
+    r"\*\*[ \t]*(?:"
+    r"(?P<validation>Comando de Valida[çc][ãa]o|Validation Command)"
+    r"|(?P<bare_validation>Valida[çc][ãa]o|Validation)"
+    r"|(?P<risks>Riscos Potenciais|Potenciais|Potential Risks)"
+    r"|(?P<time>Tempo Estimado|Estimado|Estimated Time)"
+    r")[ \t]*:?[ \t]*\*\*[ \t]*:?(?P<value>.*)"
+)
+LABEL_RE = re.compile(_LABEL_PATTERN, re.IGNORECASE)
+
+# One precompiled tokenizer for every line the parser cares about: code
+# fences, headings, labeled fields, bold lines and list items. Each token
+# starts with the newline before its line, so the regex engine jumps from
+# newline to newline and the lookahead rejects prose lines on their first
+# character. Captured values are stripped by the parser, which is cheaper
+# than lazy quantifiers here.
+TOKEN_RE = re.compile(
+    r"\n(?=[ \t`#*+\-\d])[ \t]*(?:"
+    r"```[ \t]*(?P<fence>[A-Za-z0-9_+-]*)[ \t]*\r?$"
+    r"|#{1,6}[ \t]+(?P<heading>.+)"
+    rf"|{_LABEL_PATTERN}"
+    r"|(?P<bold>\*\*)"
+    r"|(?:[-*+]|\d+[.)])[ \t]+(?P<bullet>.+)"
+    r")",
+    re.MULTILINE | re.IGNORECASE,
+)
+
+# Closing fence of a code block: on its own line, or trailing the last line
+# of code (``echo done```), which models often emit
+CLOSING_FENCE_RE = re.compile(r"```[ \t]*\r?$", re.MULTILINE)
+
+# Privilege detection on the extracted script
+ROOT_BASH_RE = re.compile(r"(sudo\s+|\bEUID\b|id\s+-u\b|su\s+-)")
+ROOT_POWERSHELL_RE = re.compile(r"(RunAsAdministrator|elevation required)", re.IGNORECASE)
+
+# Fence language -> script language, in selection priority order.
+# The primary script is the first block of the highest-priority language;
+# a bare fence (no language) is only used when no tagged block exists.
+SCRIPT_LANGUAGES = {
+    "bash": "bash",
+    "shell": "bash",
+    "sh": "bash",
+    "powershell": "powershell",
+    "ps1": "powershell",
+    "python": "python",
+    "": None,
+}
+_LANGUAGE_PRIORITY = {lang: rank for rank, lang in enumerate(SCRIPT_LANGUAGES)}
+
+ParserEvent = Tuple[str, Dict[str, Any]]
+
+
+class ReportStreamParser:
+    """
+    Single-pass parser for a markdown report that may arrive in chunks.
+
+    Complete lines are tokenized with one precompiled pattern; only the
+    trailing incomplete line is kept between feeds, so every character is
+    scanned once. Events are emitted as soon as the structure they describe
+    is complete:
+
+    - ``section``: a heading and its body, once the next heading starts
+      (or the report ends)
+    - ``script``: a fenced code block, as soon as its closing fence arrives
+
+    Every fenced block is kept in ``scripts``. Labeled metadata (validation
+    command, potential risks, estimated time) is collected along the way
+    from text outside code blocks; the first occurrence of each label wins.
+    """
+
+    def __init__(self):
+        self._pending = "\n"
+        self._section_title: Optional[str] = None
+        self._section_parts: List[str] = []
+        self._fence_language: Optional[str] = None
+        self._fence_parts: List[str] = []
+        self._collecting_risks = False
+        self._bare_validation: Optional[str] = None
+        self.scripts: List[Dict[str, Any]] = []
+        self.validation_command: Optional[str] = None
+        self.risks: Optional[List[str]] = None
+        self.estimated_duration: Optional[str] = None
+
+    def feed(self, text: str) -> List[ParserEvent]:
+        """Consume a chunk of text and return the events it completed."""
+        if "\n" not in text:
+            self._pending += text
+            return []
+
+        # Tokens start at the newline before their line, so the pending
+        # (incomplete) line keeps its newline for the next block
+        block = self._pending + text
+        end = block.rfind("\n")
+        self._pending = block[end:]
+        return self._process(block[:end])
+
+    def close(self) -> List[ParserEvent]:
+        """Flush the remaining text at the end of the report."""
+        events = self._process(self._pending)
+        self._pending = "\n"
+
+        # An unterminated code block is not a usable script; keep it as text
+        self._fence_language = None
+        self._fence_parts = []
+
+        self._flush_section(events)
+        return events
+
+    def remediation_script(self, os_info: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Build the remediation script dict from the parsed report.
+
+        Args:
+            os_info: Optional OS information to pick the language of untagged blocks
+
+        Returns:
+            Dictionary with script data or None if no script found
+        """
+        primary = None
+        for script in self.scripts:
+            rank = _LANGUAGE_PRIORITY.get(script["language"])
+            if rank is None or not script["content"]:
+                continue
+            if primary is None or rank < _LANGUAGE_PRIORITY[primary["language"]]:
+                primary = script
+
+        if primary is None:
+            return None
+
+        script_language = SCRIPT_LANGUAGES[primary["language"]]
+        if script_language is None:
+            os_name = (os_info or {}).get("name", "").lower()
+            script_language = "powershell" if "windows" in os_name else "bash"
+
+        script_content = primary["content"]
+        if script_language == "bash":
+            requires_root = bool(ROOT_BASH_RE.search(script_content))
+        elif script_language == "powershell":
+            requires_root = bool(ROOT_POWERSHELL_RE.search(script_content))
+        else:
+            requires_root = False
+
+        return {
+            "script_content": script_content,
+            "script_language": script_language,
+            "validation_command": self.validation_command or self._bare_validation or "",
+            "estimated_duration": self.estimated_duration,
+            "requires_root": requires_root,
+            "risks": self.risks or [],
+        }
+
+    def _process(self, block: str) -> List[ParserEvent]:
+        """Tokenize a block of complete lines (starting with a newline)."""
+        events: List[ParserEvent] = []
+        section_start = 0  # where the current section text starts in the block
+        fence_start = 0  # where the current code block body starts in the block
+        position = 0
+
+        while True:
+            if self._fence_language is not None:
+                # Inside a code block only the closing fence matters
+                closing = CLOSING_FENCE_RE.search(block, fence_start)
+                if closing is None:
+                    break
+                self._fence_parts.append(block[fence_start:closing.start()])
+                script = {
+                    "index": len(self.scripts),
+                    "language": self._fence_language,
+                    "content": "".join(self._fence_parts).strip(),
+                }
+                self.scripts.append(script)
+                events.append(("script", script))
+                self._fence_language = None
+                self._fence_parts = []
+                position = closing.end()
+                continue
+
+            token = TOKEN_RE.search(block, position)
+            if token is None:
+                break
+            position = token.end()
+            kind = token.lastgroup
+
+            if kind == "fence":
+                self._collecting_risks = False
+                self._fence_language = token.group("fence").lower()
+                fence_start = token.end() + 1
+            elif kind == "heading":
+                self._collecting_risks = False
+                self._section_parts.append(block[section_start:token.start()])
+                self._flush_section(events)
+                self._section_title = token.group("heading").strip(" \t#\r")
+                section_start = token.end()
+            elif kind == "bullet":
+                bullet = token.group("bullet").strip()
+                if self._collecting_risks:
+                    self.risks.append(bullet)
+                elif "**" in bullet:
+                    # Labels are sometimes written as list items
+                    label = LABEL_RE.search(bullet)
+                    if label:
+                        self._record_label(label)
+            elif kind == "bold":
+                self._collecting_risks = False
+            else:
+                self._record_label(token)
+
+        if self._fence_language is not None:
+            self._fence_parts.append(block[fence_start:])
+        self._section_parts.append(block[section_start:])
+        return events
+
+    def _record_label(self, token: "re.Match[str]") -> None:
+        """Record a labeled metadata field (first occurrence wins)."""
+        self._collecting_risks = False
+        value = token.group("value").strip().strip("`").strip()
+
+        if token.group("validation"):
+            if self.validation_command is None and value:
+                self.validation_command = value
+        elif token.group("bare_validation"):
+            if self._bare_validation is None and value:
+                self._bare_validation = value
+        elif token.group("risks"):
+            if self.risks is None:
+                self.risks = []
+                self._collecting_risks = True
+        elif self.estimated_duration is None and value:
+            self.estimated_duration = value
+
+    def _flush_section(self, events: List[ParserEvent]) -> None:
+        """Emit the current section if it has any content."""
+        content = "".join(self._section_parts).strip()
+        if self._section_title is not None or content:
+            events.append(("section", {"title": self._section_title, "content": content}))
+        self._section_title = None
+        self._section_parts = []
+
+
+def parse_report(text: str) -> ReportStreamParser:
+    """Parse a complete report in one pass and return the finished parser."""
+    parser = ReportStreamParser()
+    parser.feed(text)
+    parser.close()
+    return parser
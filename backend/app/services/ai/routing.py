@@ -0,0 +1,330 @@
+"""Routing AI service: hedged requests and failover between providers."""
+
+import asyncio
+import contextvars
+import math
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from app.config import settings
+from app.services.ai.base import BaseAIService
+from app.services.ai.metrics import HedgeRace, current_hedge_race
+from app.utils.exceptions import AIServiceError
+from app.utils.logger import logger
+
+# Routing decisions recorded in analysis history
+ROUTE_PRIMARY = "primary"  # primary answered before the hedge delay (or no secondary)
+ROUTE_HEDGED_PRIMARY = "hedged_primary"  # hedge was sent, primary still won
+ROUTE_HEDGED_SECONDARY = "hedged_secondary"  # hedge was sent and won
+ROUTE_FAILOVER = "failover"  # primary failed, secondary served the request
+
+
+class LatencyTracker:
+    """Rolling latency samples per provider and request kind."""
+
+    def __init__(self):
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, provider: str, kind: str, seconds: float) -> None:
+        """Record the latency of a successful request."""
+        key = f"{provider}:{kind}"
+        if key not in self._samples:
+            self._samples[key] = deque(maxlen=settings.ai_hedge_window)
+        self._samples[key].append(seconds)
+
+    def p95(self, provider: str, kind: str) -> Optional[float]:
+        """Rolling p95 latency, or None until enough samples exist."""
+        samples = self._samples.get(f"{provider}:{kind}")
+        if not samples or len(samples) < settings.ai_hedge_min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[math.ceil(0.95 * len(ordered)) - 1]
+
+    def hedge_delay(self, provider: str, kind: str) -> float:
+        """Seconds to wait for a provider before sending a hedged request."""
+        p95 = self.p95(provider, kind)
+        if p95 is None:
+            return settings.ai_hedge_default_delay_seconds
+        return max(settings.ai_hedge_min_delay_seconds, p95)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return sample count and p95 for every provider/kind."""
+        stats = {}
+        for key, samples in self._samples.items():
+            provider, kind = key.split(":", 1)
+            stats[key] = {"samples": len(samples), "p95_seconds": self.p95(provider, kind)}
+        return stats
+
+
+# Shared across requests: services are created per request
+latency_tracker = LatencyTracker()
+
+
+class RoutingAIService(BaseAIService):
+    """
+    AI service that routes between a primary and a secondary provider.
+
+    Requests go to the primary provider. If it has not answered after its
+    rolling p95 latency (`hedge_delay`), the same request is sent to the
+    secondary and the first successful answer wins; the other request is
+    cancelled. If the primary fails, the request fails over to the secondary.
+
+    Single analyses return the serving provider and the routing decision in
+    the result (`ai_provider`, `routing_decision`); for streams they are
+    available in `last_route` once the first chunk has been produced.
+    """
+
+    def __init__(
+        self,
+        primary_name: str,
+        primary: BaseAIService,
+        secondary_name: Optional[str] = None,
+        secondary: Optional[BaseAIService] = None,
+    ):
+        self.primary_name = primary_name
+        self.primary = primary
+        self.secondary_name = secondary_name
+        self.secondary = secondary
+        self.last_route: Optional[Tuple[str, str]] = None
+
+    async def analyze_check(
+        self, check_data: Dict[str, Any], language: str = "en", agent_info: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """Analyze a check on the best available provider."""
+        result, provider, decision = await self._route(
+            lambda service, name: service.analyze_check(check_data, language=language, agent_info=agent_info)
+        )
+        self.last_route = (provider, decision)
+        return {**result, "ai_provider": provider, "routing_decision": decision}
+
+    async def analyze_checks_batch(
+        self,
+        checks: List[Dict[str, Any]],
+        language: str = "en",
+        agent_info: Dict[str, Any] = None,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Analyze several checks on the primary provider, failing over per check.
+
+        Batches are throughput-oriented, so they are not hedged: the whole
+        batch goes to the primary (keeping its multi-prompt batching) and only
+        the checks that failed are retried on the secondary.
+        """
+        results = await self.primary.analyze_checks_batch(checks, language=language, agent_info=agent_info)
+        return await self._fail_over_batch(checks, results, language, agent_info)
+
+    async def analyze_checks_packed(
+        self,
+        checks: List[Dict[str, Any]],
+        language: str = "en",
+        agent_info: Dict[str, Any] = None,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Packed analysis on the primary provider, failing over per check like batches."""
+        results = await self.primary.analyze_checks_packed(checks, language=language, agent_info=agent_info)
+        return await self._fail_over_batch(checks, results, language, agent_info)
+
+    async def translate_report(
+        self,
+        report: str,
+        source_language: str,
+        language: str,
+        agent_info: Dict[str, Any] = None,
+    ) -> Dict[str, Any]:
+        """Translate a report on the best available provider."""
+        result, provider, decision = await self._route(
+            lambda service, name: service.translate_report(
+                report, source_language, language, agent_info=agent_info
+            ),
+            kind="translate",
+        )
+        self.last_route = (provider, decision)
+        return {**result, "ai_provider": provider, "routing_decision": decision}
+
+    async def _complete(self, prompt: str, max_tokens: int, purpose: str) -> Tuple[str, bool, Dict[str, Any]]:
+        """Generate free-form text on the best available provider."""
+        result, _, _ = await self._route(
+            lambda service, name: service._complete(prompt, max_tokens, purpose)
+        )
+        return result
+
+    async def _fail_over_batch(
+        self,
+        checks: List[Dict[str, Any]],
+        results: List[Union[Dict[str, Any], Exception]],
+        language: str,
+        agent_info: Optional[Dict[str, Any]],
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Tag primary batch results and retry the failed checks on the secondary."""
+        results = [
+            r if isinstance(r, Exception)
+            else {**r, "ai_provider": self.primary_name, "routing_decision": ROUTE_PRIMARY}
+            for r in results
+        ]
+
+        failed = [i for i, r in enumerate(results) if isinstance(r, Exception)]
+        if not failed or self.secondary is None:
+            return results
+
+        logger.warning(
+            f"🔀 Failing over {len(failed)} of {len(checks)} checks "
+            f"from {self.primary_name} to {self.secondary_name}"
+        )
+        retried = await self.secondary.analyze_checks_batch(
+            [checks[i] for i in failed], language=language, agent_info=agent_info
+        )
+        for i, retry in zip(failed, retried):
+            if isinstance(retry, Exception):
+                results[i] = AIServiceError(
+                    f"{self.primary_name}: {results[i]}; {self.secondary_name}: {retry}"
+                )
+            else:
+                results[i] = {**retry, "ai_provider": self.secondary_name, "routing_decision": ROUTE_FAILOVER}
+        return results
+
+    async def analyze_check_stream(
+        self, check_data: Dict[str, Any], language: str = "en", agent_info: Dict[str, Any] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream an analysis from the best available provider.
+
+        Hedging and failover apply until the first chunk: the provider that
+        produces it serves the whole stream, and later errors are raised.
+        """
+        streams: Dict[str, AsyncIterator[str]] = {}
+
+        def first_chunk(service: BaseAIService, name: str) -> Awaitable[str]:
+            stream = service.analyze_check_stream(check_data, language=language, agent_info=agent_info)
+            streams[name] = stream
+            return self._first_chunk(stream)
+
+        try:
+            chunk, provider, decision = await self._route(first_chunk, kind="ttft")
+            self.last_route = (provider, decision)
+
+            stream = streams.pop(provider)
+            service = self.primary if provider == self.primary_name else self.secondary
+            try:
+                yield chunk
+                async for chunk in stream:
+                    yield chunk
+            finally:
+                await stream.aclose()
+                self.last_metrics = service.last_metrics
+        finally:
+            # Close the other streams, including a loser that produced its first
+            # chunk in the same wait as the winner (cancelling its finished
+            # task does not close it), so their upstream requests and slots
+            # are released now rather than on garbage collection
+            for stream in streams.values():
+                await stream.aclose()
+
+    @staticmethod
+    async def _first_chunk(stream: AsyncIterator[str]) -> str:
+        try:
+            return await stream.__anext__()
+        except StopAsyncIteration:
+            raise AIServiceError("Provider returned an empty response")
+
+    async def _route(
+        self,
+        call: Callable[[BaseAIService, str], Awaitable[Any]],
+        kind: str = "complete",
+    ) -> Tuple[Any, str, str]:
+        """
+        Run a call on the primary, hedging to / failing over to the secondary.
+
+        Args:
+            call: Function of (service, provider name) returning the awaitable to race
+            kind: Latency kind used for the hedge delay ('complete', 'ttft' or 'translate')
+
+        Returns:
+            Tuple of (result, serving provider, routing decision)
+
+        Raises:
+            AIServiceError: If every provider failed
+        """
+        loop = asyncio.get_running_loop()
+        services = {self.primary_name: self.primary}
+        if self.secondary is not None:
+            services[self.secondary_name] = self.secondary
+
+        tasks: Dict[asyncio.Task, Tuple[str, float]] = {}
+        races: Dict[str, HedgeRace] = {}
+        errors: Dict[str, Exception] = {}
+        hedged = failover = served = False
+
+        def launch(name: str) -> None:
+            # Each call runs in its own context so its LLM timers see its race
+            context = contextvars.copy_context()
+            races[name] = HedgeRace()
+            context.run(current_hedge_race.set, races[name])
+            tasks[loop.create_task(call(services[name], name), context=context)] = (name, loop.time())
+
+        launch(self.primary_name)
+        secondary_pending = self.secondary is not None
+        hedge_at = (
+            loop.time() + latency_tracker.hedge_delay(self.primary_name, kind)
+            if secondary_pending and settings.enable_ai_hedging
+            else None
+        )
+
+        try:
+            while tasks:
+                timeout = max(0.0, hedge_at - loop.time()) if secondary_pending and hedge_at else None
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    logger.info(
+                        f"⏱️ {self.primary_name} slower than its p95 ({kind}); "
+                        f"hedging request to {self.secondary_name}"
+                    )
+                    hedged = True
+                    secondary_pending = False
+                    launch(self.secondary_name)
+                    continue
+
+                for task in done:
+                    name, started = tasks.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        latency_tracker.record(name, kind, loop.time() - started)
+                        if name == self.primary_name:
+                            decision = ROUTE_HEDGED_PRIMARY if hedged else ROUTE_PRIMARY
+                        else:
+                            decision = ROUTE_FAILOVER if failover else ROUTE_HEDGED_SECONDARY
+                        if decision != ROUTE_PRIMARY:
+                            logger.info(f"🔀 Request served by {name} ({decision})")
+                        served = True
+                        return task.result(), name, decision
+
+                    errors[name] = error
+                    logger.warning(f"⚠️ {name} failed: {error}")
+                    if secondary_pending:
+                        logger.info(f"🔀 Failing over to {self.secondary_name}")
+                        failover = True
+                        secondary_pending = False
+                        launch(self.secondary_name)
+        finally:
+            # Cancel the loser (or everything, if the caller was cancelled) and
+            # wait for it so its connection is released before returning.
+            # Losers are marked so their cancellation is not counted as a
+            # client disconnect
+            for task, (name, _) in tasks.items():
+                races[name].lost = served
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        raise AIServiceError(
+            "All AI providers failed: " + "; ".join(f"{name}: {error}" for name, error in errors.items())
+        )
+
+
+def hedging_stats() -> Dict[str, Any]:
+    """Routing configuration and rolling latencies, for status endpoints."""
+    return {
+        "primary": settings.ai_routing_primary,
+        "hedging_enabled": settings.enable_ai_hedging,
+        "latencies": latency_tracker.get_stats(),
+    }
+
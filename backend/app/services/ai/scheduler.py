@@ -0,0 +1,187 @@
+"""
+Priority-aware scheduling of LLM requests.
+
+Every request an AI service sends to a provider first takes a slot from that
+provider's scheduler. Slots are granted by priority class (interactive >
+batch > background), each class has its own concurrency cap, and within a
+class waiting requests are served round-robin per tenant (the Wazuh agent),
+so one large batch cannot starve the others.
+
+With the default caps the batch and background classes together can never
+take every slot, which keeps capacity free for interactive analyses.
+"""
+
+import asyncio
+import math
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from app.config import settings
+from app.utils.logger import logger
+
+# Priority classes, highest first
+PRIORITY_INTERACTIVE = "interactive"  # single analyses requested from the UI
+PRIORITY_BATCH = "batch"  # batch analyses
+PRIORITY_BACKGROUND = "background"  # precomputed analyses
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BATCH, PRIORITY_BACKGROUND)
+
+# Rolling window of wait times kept per class
+WAIT_WINDOW = 500
+
+
+class LLMScheduler:
+    """Slot scheduler for the requests sent to one provider."""
+
+    def __init__(self, name: str, max_concurrency: int, class_limits: Dict[str, int]):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.class_limits = {p: max(1, class_limits.get(p, self.max_concurrency)) for p in PRIORITIES}
+        self._running = 0
+        self._class_running = {p: 0 for p in PRIORITIES}
+        # Per class: tenant -> its waiting requests; tenants rotate on every grant
+        self._queues: Dict[str, "OrderedDict[str, Deque[asyncio.Future]]"] = {
+            p: OrderedDict() for p in PRIORITIES
+        }
+        self._granted = {p: 0 for p in PRIORITIES}
+        self._waits: Dict[str, Deque[float]] = {p: deque(maxlen=WAIT_WINDOW) for p in PRIORITIES}
+
+    @asynccontextmanager
+    async def slot(self, priority: str = PRIORITY_INTERACTIVE, tenant: Optional[str] = None) -> AsyncIterator[None]:
+        """
+        Hold a slot for one provider request.
+
+        Usage:
+            async with scheduler.slot(PRIORITY_BATCH, tenant=agent_id):
+                await client.post(...)
+        """
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority class: {priority}")
+
+        await self._acquire(priority, tenant or "")
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    async def _acquire(self, priority: str, tenant: str) -> None:
+        loop = asyncio.get_running_loop()
+        enqueued_at = loop.time()
+
+        # Every request goes through the queue so grants always follow the
+        # priority and per-tenant rotation; a free slot is granted at once
+        waiter = loop.create_future()
+        self._queues[priority].setdefault(tenant, deque()).append(waiter)
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just before being cancelled: hand the slot on
+                self._release(priority)
+            else:
+                self._discard(priority, tenant, waiter)
+            raise
+
+        wait = loop.time() - enqueued_at
+        self._waits[priority].append(wait)
+        if wait > 1.0:
+            logger.debug(f"⏳ {self.name} {priority} request waited {wait:.1f}s for a slot")
+
+    def _can_run(self, priority: str) -> bool:
+        return (
+            self._running < self.max_concurrency
+            and self._class_running[priority] < self.class_limits[priority]
+        )
+
+    def _take(self, priority: str) -> None:
+        self._running += 1
+        self._class_running[priority] += 1
+        self._granted[priority] += 1
+
+    def _release(self, priority: str) -> None:
+        self._running -= 1
+        self._class_running[priority] -= 1
+        self._dispatch()
+
+    def _discard(self, priority: str, tenant: str, waiter: asyncio.Future) -> None:
+        queue = self._queues[priority].get(tenant)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            pass
+        if not queue:
+            del self._queues[priority][tenant]
+
+    def _dispatch(self) -> None:
+        """Grant free slots to waiting requests, highest class first."""
+        while self._running < self.max_concurrency:
+            priority = next((p for p in PRIORITIES if self._queues[p] and self._can_run(p)), None)
+            if priority is None:
+                return
+
+            tenants = self._queues[priority]
+            tenant, queue = next(iter(tenants.items()))
+            waiter = queue.popleft()
+            # Move the tenant to the back of the rotation (or drop it if done)
+            del tenants[tenant]
+            if queue:
+                tenants[tenant] = queue
+
+            if waiter.done():  # cancelled while queued
+                continue
+            self._take(priority)
+            waiter.set_result(None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, running requests and wait times per priority class."""
+        classes = {}
+        for priority in PRIORITIES:
+            waits = sorted(self._waits[priority])
+            classes[priority] = {
+                "limit": self.class_limits[priority],
+                "running": self._class_running[priority],
+                "queued": sum(len(queue) for queue in self._queues[priority].values()),
+                "queued_tenants": len(self._queues[priority]),
+                "granted": self._granted[priority],
+                "wait_p50_seconds": _percentile(waits, 0.5),
+                "wait_p95_seconds": _percentile(waits, 0.95),
+                "wait_max_seconds": waits[-1] if waits else None,
+            }
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": self._running,
+            "classes": classes,
+        }
+
+
+def _percentile(ordered: list, percentile: float) -> Optional[float]:
+    """Nearest-rank percentile of a sorted list (None if empty)."""
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(percentile * len(ordered)) - 1)]
+
+
+def _create_scheduler(provider: str) -> LLMScheduler:
+    return LLMScheduler(
+        provider,
+        settings.ai_max_concurrency,
+        {
+            PRIORITY_BATCH: settings.ai_batch_max_concurrency,
+            PRIORITY_BACKGROUND: settings.ai_background_max_concurrency,
+        },
+    )
+
+
+# One scheduler per provider: their capacities are independent
+llm_schedulers: Dict[str, LLMScheduler] = {
+    "vllm": _create_scheduler("vllm"),
+    "openai": _create_scheduler("openai"),
+}
+
+
+def scheduler_stats() -> Dict[str, Any]:
+    """Scheduler statistics of every provider, for status endpoints."""
+    return {provider: scheduler.get_stats() for provider, scheduler in llm_schedulers.items()}
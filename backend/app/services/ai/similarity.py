@@ -0,0 +1,230 @@
+"""
+Similarity index over completed analyses.
+
+Equivalent checks under different policies (CIS Ubuntu 22.04 vs 24.04,
+Debian vs Ubuntu) have different prompt content, so their fingerprints
+never match in the shared cache although their titles and descriptions are
+near-identical. This module keeps a local MinHash/LSH index over the
+normalized title and description of recent completed analyses. On a cache
+miss, the closest analysis above `similarity_threshold` is either reused
+as is or passed to the model as a reference (see `similarity_mode`).
+
+Pure Python and in-process: signatures are rebuilt from the database every
+`similarity_refresh_seconds`, like the token budget statistics.
+"""
+
+import asyncio
+import random
+import re
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.db.session import SessionLocal
+from app.repositories.analysis_repository import AnalysisRepository
+from app.repositories.history_writer import history_writer
+from app.utils.logger import logger
+
+# What happens on a cache miss with a similar analysis
+SIMILARITY_OFF = "off"
+SIMILARITY_REUSE = "reuse"  # serve the similar analysis like a shared-cache hit
+SIMILARITY_SEED = "seed"  # generate a new analysis with the similar one as reference
+SIMILARITY_MODES = (SIMILARITY_OFF, SIMILARITY_REUSE, SIMILARITY_SEED)
+
+# 16 bands of 4 rows: pairs above ~0.5 Jaccard become candidates, which are
+# then filtered by their estimated similarity
+NUM_PERMUTATIONS = 64
+BAND_ROWS = 4
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_rng = random.Random(0x5CA)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_TOKEN_RE = re.compile(r"[a-z0-9_./-]+")
+# Version numbers (22.04, 2.2.1) differ between equivalent policies
+_VERSION_RE = re.compile(r"^\d+(?:\.\d+)*$")
+_STOPWORDS = {"a", "an", "and", "are", "be", "is", "of", "on", "or", "the", "to"}
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercase word tokens of a check text, without stopwords and version numbers."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        token = token.strip("./-")
+        if token and token not in _STOPWORDS:
+            tokens.append("#" if _VERSION_RE.match(token) else token)
+    return tokens
+
+
+def shingles(text: str) -> Set[str]:
+    """Word unigrams and bigrams of a check text."""
+    tokens = normalize_tokens(text)
+    return set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+def minhash(features: Set[str]) -> Tuple[int, ...]:
+    """MinHash signature of a feature set (empty sets get an all-max signature)."""
+    hashes = [zlib.crc32(feature.encode("utf-8")) for feature in features]
+    if not hashes:
+        return (_MAX_HASH,) * NUM_PERMUTATIONS
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def estimate_similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(a == b for a, b in zip(first, second)) / NUM_PERMUTATIONS
+
+
+def check_text(title: Optional[str], description: Optional[str]) -> str:
+    """Text of a check that is indexed (the fields analysis history keeps)."""
+    return f"{title or ''}\n{description or ''}"
+
+
+def script_language_for(agent_info: Optional[Dict[str, Any]]) -> str:
+    """Script language an analysis for this agent's OS is expected to contain."""
+    os_info = (agent_info or {}).get("os") or {}
+    platform = f"{os_info.get('platform') or ''} {os_info.get('name') or ''}".lower()
+    return "powershell" if "windows" in platform else "bash"
+
+
+class SimilarityIndex:
+    """MinHash/LSH index of recent completed analyses, refreshed from the database."""
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    async def find_similar(
+        self,
+        title: Optional[str],
+        description: Optional[str],
+        language: str,
+        agent_info: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar indexed analysis of a check.
+
+        Only analyses in the same language whose script matches the agent's
+        platform (bash/powershell) are considered.
+
+        Args:
+            title: Check title
+            description: Check description
+            language: Report language ('pt' or 'en')
+            agent_info: Dictionary containing agent information (name, ip, os, etc.)
+
+        Returns:
+            Tuple of (analysis ID, estimated similarity) at or above
+            `similarity_threshold`, or None
+        """
+        await self._refresh()
+
+        signature = minhash(shingles(check_text(title, description)))
+        script_language = script_language_for(agent_info)
+        best: Optional[Tuple[str, float]] = None
+        for analysis_id in self._candidates(signature):
+            entry = self._entries[analysis_id]
+            if entry["language"] != language:
+                continue
+            if entry["script_language"] and entry["script_language"] != script_language:
+                continue
+            similarity = estimate_similarity(signature, entry["signature"])
+            if similarity >= settings.similarity_threshold and (best is None or similarity > best[1]):
+                best = (analysis_id, similarity)
+
+        if best:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return best
+
+    def _candidates(self, signature: Tuple[int, ...]) -> Set[str]:
+        """IDs sharing at least one LSH band with the signature."""
+        candidates: Set[str] = set()
+        for band in range(0, NUM_PERMUTATIONS, BAND_ROWS):
+            candidates.update(self._buckets.get((band, signature[band:band + BAND_ROWS]), ()))
+        return candidates
+
+    async def _refresh(self) -> None:
+        """Rebuild the index when it is older than the refresh interval."""
+        if not self._is_stale():
+            return
+
+        async with self._lock:
+            if not self._is_stale():
+                return
+            try:
+                # Index the analyses still queued for writing too
+                await history_writer.flush()
+                self._entries, self._buckets = await asyncio.to_thread(self._build)
+            except Exception as e:
+                logger.warning(f"Failed to build similarity index: {e}")
+            self._loaded_at = time.monotonic()
+
+    def _is_stale(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > settings.similarity_refresh_seconds
+        )
+
+    def _build(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[Tuple[int, Tuple[int, ...]], List[str]]]:
+        """Compute signatures of the recent completed analyses (newest per fingerprint)."""
+        db = SessionLocal()
+        try:
+            rows = AnalysisRepository(db).get_similarity_candidates()
+        finally:
+            db.close()
+
+        entries: Dict[str, Dict[str, Any]] = {}
+        buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+        seen: Set[str] = set()
+        for row in rows:
+            # Rows come newest first; copies of one analysis share a fingerprint
+            key = row.analysis_fingerprint or row.id
+            if key in seen:
+                continue
+            seen.add(key)
+
+            # Signatures of rows indexed by the previous build are kept
+            previous = self._entries.get(row.id)
+            signature = (
+                previous["signature"]
+                if previous
+                else minhash(shingles(check_text(row.check_title, row.check_description)))
+            )
+            entries[row.id] = {
+                "language": row.language,
+                "script_language": row.script_language,
+                "signature": signature,
+            }
+            for band in range(0, NUM_PERMUTATIONS, BAND_ROWS):
+                buckets.setdefault((band, signature[band:band + BAND_ROWS]), []).append(row.id)
+
+        logger.info(f"🧭 Similarity index built: {len(entries)} analyses ({len(rows)} rows)")
+        return entries, buckets
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index size, configuration and lookup counters."""
+        return {
+            "mode": settings.similarity_mode,
+            "threshold": settings.similarity_threshold,
+            "indexed": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Global similarity index instance
+similarity_index = SimilarityIndex()
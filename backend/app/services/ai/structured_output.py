@@ -0,0 +1,132 @@
+"""
+Structured (JSON) output mode for analyses.
+
+Instead of free-form markdown, the model is asked for a JSON object with the
+report sections and the remediation script (`StructuredReport`). Providers
+constrain generation to its schema where they can (vLLM guided decoding,
+OpenAI JSON mode); the output is validated with Pydantic and rendered to
+the same markdown layout as free-form reports, so history, PDFs and the
+frontend need no changes.
+"""
+
+import json
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, Field, ValidationError
+
+from app.models.schemas import RemediationScript
+
+
+class InvalidStructuredOutput(ValueError):
+    """Raised when the model output is not valid JSON for `StructuredReport`."""
+
+    pass
+
+
+class StructuredReport(BaseModel):
+    """Analysis report as requested in structured output mode."""
+
+    problem_description: str = Field(..., description="Explanation of the security issue")
+    technical_context: str = Field(..., description="Analysis of the file, command and reason of the failure")
+    remediation_steps: List[str] = Field(..., description="Ordered remediation steps")
+    remediation_script: RemediationScript
+    validation: str = Field(..., description="How to verify the fix was applied")
+
+
+# JSON schema sent to providers that support schema-constrained decoding
+STRUCTURED_REPORT_SCHEMA: Dict[str, Any] = StructuredReport.model_json_schema()
+
+# Section titles and labels of the rendered markdown report; they match the
+# layout requested from the model in free-form mode
+REPORT_LABELS = {
+    "pt": {
+        "header": "--- Relatório de Análise de Conformidade SCA ---",
+        "problem": "1. Descrição do Problema",
+        "context": "2. Contexto Técnico",
+        "steps": "3. Passos de Remediação",
+        "script": "Script de Remediação Automática",
+        "validation_command": "Comando de Validação",
+        "risks": "Riscos Potenciais",
+        "time": "Tempo Estimado",
+        "validation": "5. Validação",
+    },
+    "en": {
+        "header": "--- SCA Compliance Analysis Report ---",
+        "problem": "1. Problem Description",
+        "context": "2. Technical Context",
+        "steps": "3. Remediation Steps",
+        "script": "Automated Remediation Script",
+        "validation_command": "Validation Command",
+        "risks": "Potential Risks",
+        "time": "Estimated Time",
+        "validation": "5. Validation",
+    },
+}
+
+
+def parse_structured_report(text: str) -> StructuredReport:
+    """
+    Validate model output against the structured report schema.
+
+    Args:
+        text: Raw generated text (a JSON object, possibly inside a ```json fence)
+
+    Returns:
+        Validated report
+
+    Raises:
+        InvalidStructuredOutput: If the text is not a JSON object matching the schema
+    """
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        raise InvalidStructuredOutput("no JSON object in model output")
+
+    try:
+        return StructuredReport.model_validate(json.loads(text[start:end + 1]))
+    except json.JSONDecodeError as e:
+        raise InvalidStructuredOutput(f"invalid JSON: {e}")
+    except ValidationError as e:
+        raise InvalidStructuredOutput(f"JSON does not match the report schema: {e.error_count()} errors")
+
+
+def render_report(report: StructuredReport, language: str) -> str:
+    """
+    Render a structured report to markdown.
+
+    Args:
+        report: Validated structured report
+        language: Report language ('pt' or 'en')
+
+    Returns:
+        Markdown report in the free-form layout
+    """
+    labels = REPORT_LABELS.get(language, REPORT_LABELS["en"])
+    script = report.remediation_script
+
+    lines = [
+        labels["header"],
+        "",
+        f"## {labels['problem']}",
+        report.problem_description.strip(),
+        "",
+        f"## {labels['context']}",
+        report.technical_context.strip(),
+        "",
+        f"## {labels['steps']}",
+        *(f"{number}. {step.strip()}" for number, step in enumerate(report.remediation_steps, start=1)),
+        "",
+        f"## {labels['script']}",
+        f"```{script.script_language}",
+        script.script_content.strip("\n"),
+        "```",
+        "",
+        f"**{labels['validation_command']}:** `{script.validation_command}`",
+    ]
+    if script.risks:
+        lines.append(f"**{labels['risks']}:**")
+        lines.extend(f"- {risk}" for risk in script.risks)
+    if script.estimated_duration:
+        lines.append(f"**{labels['time']}:** {script.estimated_duration}")
+    lines.extend(["", f"## {labels['validation']}", report.validation.strip()])
+
+    return "\n".join(lines)
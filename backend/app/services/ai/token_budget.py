@@ -0,0 +1,229 @@
+"""
+Token budgeting for AI requests.
+
+Sizes `max_tokens` per request instead of reserving the worst case: the
+output budget comes from the lengths of completed analyses of the same
+policy (a high percentile plus headroom), and for vLLM it is further capped
+by what is left of the context window after the prompt. Oversized check
+fields are truncated before they reach the prompt.
+
+Token counts are estimated locally from character counts, without loading
+the model tokenizer. The estimate is deliberately conservative for the
+pt/en reports and shell scripts this service generates.
+"""
+
+import asyncio
+import math
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+
+from app.config import settings
+from app.db.models import AnalysisContent, AnalysisHistory
+from app.db.session import SessionLocal
+from app.utils.exceptions import AIServiceError
+from app.utils.logger import logger
+
+# Average characters per token for Llama/GPT BPE vocabularies on mixed
+# prose and code; lower than the usual ~4 for English so the estimate errs
+# on the high side for Portuguese and shell scripts.
+CHARS_PER_TOKEN = 3.5
+
+# Recent completed analyses considered when learning output lengths
+STATS_WINDOW = 5000
+
+# Tokens kept free in the context window for special tokens and rounding
+CONTEXT_SAFETY_MARGIN = 32
+
+TRUNCATION_MARKER = " [...]"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_field(value: str, max_tokens: Optional[int] = None) -> str:
+    """
+    Truncate a check field to an approximate token budget.
+
+    Args:
+        value: Field text
+        max_tokens: Token budget (defaults to `prompt_field_max_tokens`; 0 disables)
+
+    Returns:
+        The text unchanged if it fits, otherwise its head (cut at a word
+        boundary when possible) followed by a truncation marker
+    """
+    if max_tokens is None:
+        max_tokens = settings.prompt_field_max_tokens
+    if not max_tokens or not isinstance(value, str):
+        return value
+
+    max_chars = int(max_tokens * CHARS_PER_TOKEN)
+    if len(value) <= max_chars:
+        return value
+
+    head = value[:max_chars]
+    cut = head.rfind(" ")
+    if cut > max_chars // 2:
+        head = head[:cut]
+    return head.rstrip() + TRUNCATION_MARKER
+
+
+def _percentile(values: List[int], percentile: float) -> int:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percentile * len(ordered)))
+    return ordered[rank - 1]
+
+
+class TokenBudget:
+    """Picks `max_tokens` per request from observed output lengths."""
+
+    def __init__(self):
+        # Output-length percentile (tokens) per policy; None holds all policies
+        self._percentiles: Dict[Optional[str], int] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def max_tokens(
+        self,
+        prompts: List[str],
+        policy_id: Optional[str] = None,
+        context_window: Optional[int] = None,
+        reports: int = 1,
+    ) -> int:
+        """
+        Pick `max_tokens` for a request.
+
+        Args:
+            prompts: Prompt(s) sent in the request; with several prompts the
+                budget must fit the longest one
+            policy_id: SCA policy of the checks, to use its learned output lengths
+            context_window: Model context length in tokens (None when the
+                provider's context is much larger than any report)
+            reports: Reports generated per prompt (packed analyses write several)
+
+        Returns:
+            The `max_tokens` value to send
+
+        Raises:
+            AIServiceError: If the prompt leaves less than `ai_min_max_tokens`
+                of the context window for the output
+        """
+        await self._refresh_stats()
+
+        learned = self._learned_budget(policy_id)
+        budget = (learned or settings.ai_max_tokens) * max(1, reports)
+
+        if context_window:
+            prompt_tokens = max(estimate_tokens(prompt) for prompt in prompts)
+            available = context_window - prompt_tokens - CONTEXT_SAFETY_MARGIN
+            if available < settings.ai_min_max_tokens:
+                # A few output tokens would only produce a cut-off report
+                raise AIServiceError(
+                    f"Prompt too long for the context window: ~{prompt_tokens} prompt tokens leave "
+                    f"{max(0, available)} of {context_window} tokens for the report "
+                    f"(at least {settings.ai_min_max_tokens} needed)"
+                )
+            budget = min(budget, available)
+
+        logger.debug(
+            f"Token budget: max_tokens={budget} (policy={policy_id}, learned={learned})"
+        )
+        return budget
+
+    def expected_output_tokens(self, policy_id: Optional[str] = None) -> int:
+        """
+        Output tokens a report is expected to need, from the statistics as loaded.
+
+        Used to size other parts of a prompt without waiting for a refresh;
+        falls back to `ai_min_max_tokens` until enough history exists.
+        """
+        return self._learned_budget(policy_id) or settings.ai_min_max_tokens
+
+    def _learned_budget(self, policy_id: Optional[str]) -> Optional[int]:
+        """Learned percentile times headroom, within the configured bounds (None if not learned)."""
+        learned = self._percentiles.get(policy_id) or self._percentiles.get(None)
+        if not learned:
+            return None
+        budget = int(learned * settings.ai_output_headroom)
+        return max(settings.ai_min_max_tokens, min(budget, settings.ai_max_tokens))
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return the learned output-length percentiles per policy."""
+        return {
+            (policy_id if policy_id is not None else "*"): tokens
+            for policy_id, tokens in self._percentiles.items()
+        }
+
+    async def _refresh_stats(self) -> None:
+        """Reload learned percentiles when they are older than the refresh interval."""
+        if not self._is_stale():
+            return
+
+        async with self._lock:
+            if not self._is_stale():
+                return
+            try:
+                self._percentiles = await asyncio.to_thread(self._load_stats)
+            except Exception as e:
+                logger.warning(f"Failed to load output length statistics: {e}")
+            self._loaded_at = time.monotonic()
+
+    def _is_stale(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > settings.ai_output_stats_refresh_seconds
+        )
+
+    def _load_stats(self) -> Dict[Optional[str], int]:
+        """
+        Compute output-length percentiles from recent completed analyses.
+
+        Only analyses the model wrote from scratch are counted: shared-cache
+        copies and similarity reuses record no LLM call, and translations
+        (like every row linked to a source analysis) measure another kind of
+        completion.
+        """
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(AnalysisHistory.policy_id, func.length(AnalysisContent.body))
+                .join(AnalysisContent, AnalysisContent.hash == AnalysisHistory.report_hash)
+                .filter(
+                    AnalysisHistory.status == "completed",
+                    AnalysisHistory.generation_seconds.isnot(None),
+                    AnalysisHistory.source_analysis_id.is_(None),
+                )
+                .order_by(AnalysisHistory.analysis_date.desc())
+                .limit(STATS_WINDOW)
+                .all()
+            )
+        finally:
+            db.close()
+
+        lengths: Dict[Optional[str], List[int]] = {None: []}
+        for policy_id, chars in rows:
+            if not chars:
+                continue
+            tokens = math.ceil(chars / CHARS_PER_TOKEN)
+            lengths[None].append(tokens)
+            lengths.setdefault(policy_id, []).append(tokens)
+
+        percentiles = {
+            policy_id: _percentile(values, settings.ai_output_percentile)
+            for policy_id, values in lengths.items()
+            if len(values) >= settings.ai_output_min_samples
+        }
+        logger.info(
+            f"Loaded output length statistics: {len(rows)} analyses, "
+            f"{len(percentiles)} policies/global with enough samples"
+        )
+        return percentiles
+
+
+# Global token budget instance
+token_budget = TokenBudget()
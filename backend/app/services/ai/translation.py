@@ -0,0 +1,127 @@
+"""
+Translation of cached analyses into the other report language.
+
+Reports are requested in Portuguese and English, and the second language of
+a check used to cost a full analysis. When a cached analysis exists in the
+other language, only its prose is translated: fenced script blocks and
+inline code are swapped for placeholders before the prompt is built and put
+back verbatim afterwards, so the remediation script cannot drift and the
+model reads and writes a fraction of the tokens of a new analysis.
+"""
+
+import re
+from typing import List, Tuple
+
+from app.prompts import prompt_registry
+from app.services.ai.structured_output import REPORT_LABELS
+from app.services.ai.token_budget import estimate_tokens
+
+# Fenced blocks (an unterminated fence runs to the end of the report) and inline code
+_CODE_RE = re.compile(r"```.*?(?:```|\Z)|`[^`\n]+`", re.DOTALL)
+PLACEHOLDER = "[[CODE_{index}]]"
+_PLACEHOLDER_RE = re.compile(r"\[\[CODE_(\d+)\]\]")
+
+# Output budget relative to the protected source report: Portuguese prose
+# runs ~20% longer than English, plus room for the header line
+OUTPUT_TOKEN_RATIO = 1.5
+OUTPUT_TOKEN_MARGIN = 64
+
+LANGUAGE_NAMES = {"pt": "European Portuguese", "en": "English"}
+
+
+class TranslationError(ValueError):
+    """Raised when a translated report lost or invented code placeholders."""
+
+    pass
+
+
+def protect_code(report: str) -> Tuple[str, List[str]]:
+    """
+    Replace code in a report with numbered placeholders.
+
+    Args:
+        report: Report text
+
+    Returns:
+        Tuple of (report with placeholders, code snippets by placeholder number)
+    """
+    snippets: List[str] = []
+
+    def replace(match: re.Match) -> str:
+        snippets.append(match.group(0))
+        return PLACEHOLDER.format(index=len(snippets) - 1)
+
+    return _CODE_RE.sub(replace, report), snippets
+
+
+def restore_code(text: str, snippets: List[str]) -> str:
+    """
+    Put the code snippets back in place of their placeholders.
+
+    Args:
+        text: Translated report with placeholders
+        snippets: Snippets returned by protect_code
+
+    Returns:
+        Translated report with the original code
+
+    Raises:
+        TranslationError: If a placeholder is missing, repeated or unknown
+    """
+    found = [int(index) for index in _PLACEHOLDER_RE.findall(text)]
+    if sorted(found) != list(range(len(snippets))):
+        missing = sorted(set(range(len(snippets))) - set(found))
+        raise TranslationError(
+            f"Translation changed the code placeholders (expected {len(snippets)}, "
+            f"found {len(found)}, missing {missing})"
+        )
+    return _PLACEHOLDER_RE.sub(lambda match: snippets[int(match.group(1))], text)
+
+
+def translation_max_tokens(report: str) -> int:
+    """`max_tokens` for translating a protected report (see protect_code)."""
+    return int(estimate_tokens(report) * OUTPUT_TOKEN_RATIO) + OUTPUT_TOKEN_MARGIN
+
+
+def build_translation_prompt(report: str, source_language: str, language: str) -> str:
+    """
+    Build the prompt translating a protected report (see protect_code).
+
+    Args:
+        report: Report text with code placeholders
+        source_language: Language of the report ('pt' or 'en')
+        language: Language to translate to ('pt' or 'en')
+
+    Returns:
+        Prompt text
+    """
+    source_labels, labels = REPORT_LABELS[source_language], REPORT_LABELS[language]
+    mapping = "\n".join(
+        f'   - "{source_labels[key]}" -> "{labels[key]}"' for key in labels if key != "header"
+    )
+    # Instructions are in English for both directions; only the label mapping changes
+    return prompt_registry.render(
+        "translation",
+        "en",
+        source_name=LANGUAGE_NAMES[source_language],
+        target_name=LANGUAGE_NAMES[language],
+        labels=mapping,
+        header=labels["header"],
+        report=report.strip(),
+    )
+
+
+def finish_translation(text: str, snippets: List[str], source_language: str, language: str) -> str:
+    """
+    Turn model output into the translated report.
+
+    Strips the report delimiters if the model echoed them, restores the code
+    and replaces a header the model left in the source language.
+
+    Raises:
+        TranslationError: If the code placeholders do not match
+    """
+    text = text.strip()
+    text = text.removeprefix("<<<REPORT").removesuffix("REPORT>>>").strip()
+    text = restore_code(text, snippets)
+    return text.replace(REPORT_LABELS[source_language]["header"], REPORT_LABELS[language]["header"], 1)
@@ -0,0 +1,187 @@
+"""Load balancing across multiple vLLM endpoints."""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+from app.utils.logger import logger
+
+# Rolling window of request latencies kept per endpoint
+LATENCY_WINDOW = 200
+
+
+def _is_endpoint_failure(error: BaseException) -> bool:
+    """
+    Whether an error says something about the endpoint's health.
+
+    Connection errors, timeouts and 5xx responses count; 4xx responses
+    (e.g. a prompt longer than the context) are caused by the request.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+class VLLMEndpoint:
+    """A single vLLM server and its load/health state."""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.healthy = True
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.last_health_check: Optional[datetime] = None
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Percentile of recent request latencies in seconds."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[max(0, math.ceil(percentile * len(ordered)) - 1)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Endpoint statistics for API responses."""
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "outstanding_requests": self.outstanding,
+            "requests": self.requests,
+            "errors": self.errors,
+            "consecutive_failures": self.consecutive_failures,
+            "latency_p50_seconds": self.latency_percentile(0.5),
+            "latency_p95_seconds": self.latency_percentile(0.95),
+            "last_error": self.last_error,
+            "last_health_check": self.last_health_check.isoformat() if self.last_health_check else None,
+        }
+
+
+class VLLMEndpointPool:
+    """
+    Least-outstanding-requests balancer over the configured vLLM endpoints.
+
+    Endpoints are ejected after `vllm_eject_after_failures` consecutive
+    failures (requests or health checks) and readmitted as soon as a health
+    check against `/models` succeeds again. When every endpoint is ejected,
+    requests are still sent to the least loaded one rather than failing
+    without trying.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.endpoints = [VLLMEndpoint(url) for url in urls]
+        self._health_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(cls) -> "VLLMEndpointPool":
+        """Build the pool from VLLM_API_URLS (or VLLM_API_URL)."""
+        urls = [url.strip() for url in settings.vllm_api_urls.split(",") if url.strip()]
+        return cls(urls or [settings.vllm_api_url])
+
+    def select(self) -> VLLMEndpoint:
+        """Pick the healthy endpoint with the fewest outstanding requests."""
+        candidates = [e for e in self.endpoints if e.healthy] or self.endpoints
+        return min(candidates, key=lambda e: (e.outstanding, e.requests))
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[VLLMEndpoint]:
+        """
+        Reserve an endpoint for one request.
+
+        Usage:
+            async with vllm_pool.acquire() as endpoint:
+                await client.post(f"{endpoint.url}/completions", ...)
+        """
+        endpoint = self.select()
+        endpoint.outstanding += 1
+        endpoint.requests += 1
+        start = time.perf_counter()
+        try:
+            yield endpoint
+        except BaseException as e:
+            if _is_endpoint_failure(e):
+                self._record_failure(endpoint, str(e) or type(e).__name__)
+            raise
+        else:
+            endpoint.latencies.append(time.perf_counter() - start)
+            endpoint.consecutive_failures = 0
+        finally:
+            endpoint.outstanding -= 1
+
+    def _record_failure(self, endpoint: VLLMEndpoint, error: str) -> None:
+        endpoint.errors += 1
+        endpoint.consecutive_failures += 1
+        endpoint.last_error = error
+        if endpoint.healthy and endpoint.consecutive_failures >= settings.vllm_eject_after_failures:
+            endpoint.healthy = False
+            logger.warning(
+                f"⛔ Ejected vLLM endpoint {endpoint.url} after "
+                f"{endpoint.consecutive_failures} consecutive failures: {error}"
+            )
+
+    async def check_health(self) -> None:
+        """Probe every endpoint's `/models` and eject/readmit accordingly."""
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            await asyncio.gather(*(self._check_endpoint(client, e) for e in self.endpoints))
+
+    async def _check_endpoint(self, client: httpx.AsyncClient, endpoint: VLLMEndpoint) -> None:
+        endpoint.last_health_check = datetime.utcnow()
+        try:
+            response = await client.get(f"{endpoint.url}/models")
+            response.raise_for_status()
+        except Exception as e:
+            self._record_failure(endpoint, str(e) or type(e).__name__)
+            return
+
+        endpoint.consecutive_failures = 0
+        if not endpoint.healthy:
+            endpoint.healthy = True
+            logger.info(f"✅ Readmitted vLLM endpoint {endpoint.url}")
+
+    async def _health_loop(self) -> None:
+        while True:
+            try:
+                await self.check_health()
+            except Exception as e:
+                logger.error(f"vLLM health check failed: {e}")
+            await asyncio.sleep(settings.vllm_health_check_interval_seconds)
+
+    def start(self) -> None:
+        """Start periodic health checks (call from the running event loop)."""
+        if self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop())
+            logger.info(
+                f"vLLM endpoints: {', '.join(e.url for e in self.endpoints)} "
+                f"(health check every {settings.vllm_health_check_interval_seconds:g}s)"
+            )
+
+    async def stop(self) -> None:
+        """Stop periodic health checks."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+    def healthy_count(self) -> int:
+        """Number of endpoints currently in rotation."""
+        return sum(1 for e in self.endpoints if e.healthy)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Per-endpoint load, latency and health statistics."""
+        return [endpoint.to_dict() for endpoint in self.endpoints]
+
+
+# Global vLLM endpoint pool instance
+vllm_pool = VLLMEndpointPool.from_settings()
@@ -1,105 +1,309 @@
-"""vLLM AI service implementation."""
-
-from typing import Dict, Any, AsyncIterator
-import httpx
-
-from app.config import settings
-from app.utils.logger import logger
-from app.utils.exceptions import AIServiceError
-from app.services.ai.base import BaseAIService
-
-
-class VLLMService(BaseAIService):
-    """AI service using vLLM (OpenAI-compatible API)."""
-
-    def __init__(self):
-        self.api_url = settings.vllm_api_url
-        self.model = settings.vllm_model
-
-    async def analyze_check(
-        self, check_data: Dict[str, Any], language: str = "en", agent_info: Dict[str, Any] = None
-    ) -> Dict[str, Any]:
-        """Analyze check using vLLM and return report with remediation script."""
-        prompt = self._build_prompt(check_data, language, agent_info)
-
-        try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    f"{self.api_url}/completions",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "max_tokens": 3072,  # Increased for script generation
-                        "temperature": 0.1,
-                        "stop": ["User:", "Check Data:", "End of Report"],
-                    },
-                )
-                response.raise_for_status()
-                result = response.json()
-                report = result["choices"][0]["text"].strip()
-
-                # Ensure report starts with header
-                header = (
-                    "--- Relatório de Análise de Conformidade SCA ---"
-                    if language == "pt"
-                    else "--- SCA Compliance Analysis Report ---"
-                )
-                if not report.startswith("---"):
-                    report = f"{header}\n{report}"
-
-                # Parse remediation script from the report
-                os_info = agent_info.get("os") if agent_info else None
-                script_data = self._parse_remediation_script(report, os_info)
-
-                logger.info(
-                    f"vLLM analysis completed for check {check_data.get('id')}"
-                    + (f" with script ({script_data['script_language']})" if script_data else " (no script)")
-                )
-
-                return {
-                    "report": report,
-                    "remediation_script": script_data
-                }
-
-        except Exception as e:
-            logger.error(f"vLLM analysis failed: {e}")
-            raise AIServiceError(f"vLLM analysis failed: {str(e)}")
-
-    async def analyze_check_stream(
-        self, check_data: Dict[str, Any], language: str = "en", agent_info: Dict[str, Any] = None
-    ) -> AsyncIterator[str]:
-        """Stream analysis using vLLM."""
-        prompt = self._build_prompt(check_data, language, agent_info)
-
-        try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                async with client.stream(
-                    "POST",
-                    f"{self.api_url}/completions",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "max_tokens": 2048,
-                        "temperature": 0.1,
-                        "stream": True,
-                        "stop": ["User:", "Check Data:", "End of Report"],
-                    },
-                ) as response:
-                    response.raise_for_status()
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data = line[6:]
-                            if data == "[DONE]":
-                                break
-                            try:
-                                import json
-
-                                chunk = json.loads(data)
-                                if text := chunk["choices"][0].get("text"):
-                                    yield text
-                            except json.JSONDecodeError:
-                                continue
-
-        except Exception as e:
-            logger.error(f"vLLM streaming failed: {e}")
-            raise AIServiceError(f"vLLM streaming failed: {str(e)}")
+"""vLLM AI service implementation."""
+
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
+import asyncio
+import json
+import math
+import httpx
+
+from app.config import settings
+from app.utils.logger import logger
+from app.utils.exceptions import AIServiceError
+from app.services.ai.base import BaseAIService
+from app.services.ai.metrics import LLMCallTimer
+from app.services.ai.scheduler import llm_schedulers
+from app.services.ai.structured_output import STRUCTURED_REPORT_SCHEMA, InvalidStructuredOutput
+from app.services.ai.token_budget import token_budget
+from app.services.ai.vllm_pool import vllm_pool
+
+
+class VLLMService(BaseAIService):
+    """
+    AI service using vLLM (OpenAI-compatible API).
+
+    Requests wait for a slot from the vLLM scheduler (see scheduler.py) and
+    are then spread over the configured vLLM endpoints by `vllm_pool`.
+    """
+
+    # Stop sequences that keep the model from echoing the prompt back
+    STOP_SEQUENCES = ["User:", "Check Data:", "End of Report"]
+
+    def __init__(self):
+        self.pool = vllm_pool
+        self.scheduler = llm_schedulers["vllm"]
+        self.model = settings.vllm_model
+        self.context_window = settings.max_model_len
+
+    def _request_options(self) -> Dict[str, Any]:
+        """Sampling options shared by every completion request."""
+        options: Dict[str, Any] = {"temperature": 0.1, "stop": self.STOP_SEQUENCES}
+        if settings.ai_structured_output:
+            # vLLM guided decoding constrains the output to the report schema
+            options["guided_json"] = STRUCTURED_REPORT_SCHEMA
+        return options
+
+    async def analyze_check(
+        self, check_data: Dict[str, Any], language: str = "en", agent_info: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """Analyze check using vLLM and return report with remediation script."""
+        return await self._retry_invalid_output(
+            lambda: self._analyze_once(check_data, language, agent_info)
+        )
+
+    async def _analyze_once(
+        self, check_data: Dict[str, Any], language: str, agent_info: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Single generation for analyze_check."""
+        timer = LLMCallTimer("vllm", self.model)
+        prompt = self._build_prompt(check_data, language, agent_info)
+        max_tokens = await token_budget.max_tokens(
+            [prompt], check_data.get("policy_id"), context_window=settings.max_model_len
+        )
+
+        try:
+            async with (
+                self.scheduler.slot(self.priority, self.tenant),
+                httpx.AsyncClient(timeout=120.0) as client,
+                self.pool.acquire() as endpoint,
+            ):
+                timer.start(endpoint.url)
+                response = await client.post(
+                    f"{endpoint.url}/completions",
+                    json={
+                        "model": self.model,
+                        "prompt": prompt,
+                        "max_tokens": max_tokens,
+                        **self._request_options(),
+                    },
+                )
+                response.raise_for_status()
+                body = response.json()
+                timer.finish()
+                timer.record_usage(body.get("usage"))
+
+                result = self._finalize_output(body["choices"][0]["text"], language, agent_info)
+                result["llm_metrics"] = timer.to_dict()
+                script_data = result["remediation_script"]
+
+                logger.info(
+                    f"vLLM analysis completed for check {check_data.get('id')}"
+                    + (f" with script ({script_data['script_language']})" if script_data else " (no script)")
+                )
+
+                return result
+
+        except asyncio.CancelledError:
+            # Client went away: leaving the client context closes the
+            # connection, which makes vLLM abort the generation
+            timer.cancel()
+            raise
+        except InvalidStructuredOutput:
+            raise
+        except Exception as e:
+            logger.error(f"vLLM analysis failed: {e}")
+            raise AIServiceError(f"vLLM analysis failed: {str(e)}")
+
+    async def analyze_checks_batch(
+        self,
+        checks: List[Dict[str, Any]],
+        language: str = "en",
+        agent_info: Dict[str, Any] = None,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Analyze several checks with multi-prompt `/completions` requests.
+
+        Prompts are sent as a list, `vllm_batch_size` at a time, so vLLM can
+        schedule them together instead of paying per-request overhead for each.
+        Chunks run concurrently, up to one per healthy endpoint. A failed
+        request fails only the checks of its own chunk.
+        """
+        chunk_size = max(1, settings.vllm_batch_size)
+        chunks = [checks[start:start + chunk_size] for start in range(0, len(checks), chunk_size)]
+        semaphore = asyncio.Semaphore(max(1, self.pool.healthy_count()))
+
+        async with httpx.AsyncClient(timeout=120.0 * chunk_size) as client:
+
+            async def analyze_chunk(chunk: List[Dict[str, Any]]) -> List[Union[Dict[str, Any], Exception]]:
+                timer = LLMCallTimer("vllm", self.model)
+                async with semaphore:
+                    return await self._analyze_chunk(client, chunk, language, agent_info, timer)
+
+            chunk_results = await asyncio.gather(*(analyze_chunk(chunk) for chunk in chunks))
+
+        return [result for results in chunk_results for result in results]
+
+    async def _analyze_chunk(
+        self,
+        client: httpx.AsyncClient,
+        chunk: List[Dict[str, Any]],
+        language: str,
+        agent_info: Dict[str, Any] = None,
+        timer: LLMCallTimer = None,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Send one multi-prompt request and finalize each completion.
+
+        Every check of the chunk gets the timings of the shared request;
+        token usage is only reported for the request as a whole, so it is
+        left out of the per-check metrics.
+        """
+        timer = timer or LLMCallTimer("vllm", self.model)
+        prompts = [self._build_prompt(check, language, agent_info) for check in chunk]
+
+        try:
+            max_tokens = await token_budget.max_tokens(
+                prompts, chunk[0].get("policy_id"), context_window=settings.max_model_len
+            )
+            async with self.scheduler.slot(self.priority, self.tenant), self.pool.acquire() as endpoint:
+                timer.start(endpoint.url)
+                response = await client.post(
+                    f"{endpoint.url}/completions",
+                    json={
+                        "model": self.model,
+                        "prompt": prompts,
+                        "max_tokens": max_tokens,
+                        **self._request_options(),
+                    },
+                )
+                response.raise_for_status()
+            timer.finish()
+            choices = sorted(response.json()["choices"], key=lambda c: c.get("index", 0))
+            if len(choices) != len(prompts):
+                raise AIServiceError(
+                    f"expected {len(prompts)} completions, got {len(choices)}"
+                )
+        except asyncio.CancelledError:
+            timer.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"vLLM batch analysis failed for {len(chunk)} checks: {e}")
+            error = AIServiceError(f"vLLM analysis failed: {str(e)}")
+            return [error for _ in chunk]
+
+        metrics = timer.to_dict()
+        results: List[Union[Dict[str, Any], Exception]] = []
+        for check, choice in zip(chunk, choices):
+            try:
+                result = self._finalize_output(choice["text"], language, agent_info)
+                result["llm_metrics"] = dict(metrics)
+                results.append(result)
+            except InvalidStructuredOutput as e:
+                # Retry this check once on its own
+                logger.warning(f"⚠️ Invalid structured output for check {check.get('id')} ({e}); retrying once")
+                try:
+                    results.append(await self._analyze_once(check, language, agent_info))
+                except Exception as retry_error:
+                    results.append(AIServiceError(f"vLLM analysis failed: {retry_error}"))
+            except Exception as e:
+                logger.error(f"Failed to process analysis for check {check.get('id')}: {e}")
+                results.append(AIServiceError(f"vLLM analysis failed: {str(e)}"))
+
+        logger.info(f"vLLM batch analysis completed for {len(chunk)} checks")
+        return results
+
+    async def _complete(self, prompt: str, max_tokens: int, purpose: str) -> Tuple[str, bool, Dict[str, Any]]:
+        """Generate free-form text (packed reports, translations) with one completion request."""
+        timer = LLMCallTimer("vllm", self.model)
+        # Same allowance per report-sized output as single analyses
+        timeout = 120.0 * max(1, math.ceil(max_tokens / settings.ai_max_tokens))
+
+        try:
+            async with (
+                self.scheduler.slot(self.priority, self.tenant),
+                httpx.AsyncClient(timeout=timeout) as client,
+                self.pool.acquire() as endpoint,
+            ):
+                timer.start(endpoint.url)
+                response = await client.post(
+                    f"{endpoint.url}/completions",
+                    json={
+                        "model": self.model,
+                        "prompt": prompt,
+                        "max_tokens": max_tokens,
+                        "temperature": 0.1,
+                        "stop": self.STOP_SEQUENCES,
+                    },
+                )
+                response.raise_for_status()
+                body = response.json()
+            timer.finish()
+            timer.record_usage(body.get("usage"))
+            choice = body["choices"][0]
+            return choice["text"], choice.get("finish_reason") == "length", timer.to_dict()
+
+        except asyncio.CancelledError:
+            timer.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"vLLM {purpose} failed: {e}")
+            raise AIServiceError(f"vLLM {purpose} failed: {str(e)}")
+
+    async def analyze_check_stream(
+        self, check_data: Dict[str, Any], language: str = "en", agent_info: Dict[str, Any] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream analysis using vLLM.
+
+        Call metrics (including time-to-first-token and the token usage of
+        the final stream chunk) are left in `last_metrics` when the stream ends.
+        """
+        if settings.ai_structured_output:
+            async for chunk in self._structured_stream(check_data, language, agent_info):
+                yield chunk
+            return
+
+        timer = LLMCallTimer("vllm", self.model)
+        self.last_metrics = None
+        prompt = self._build_prompt(check_data, language, agent_info)
+        max_tokens = await token_budget.max_tokens(
+            [prompt], check_data.get("policy_id"), context_window=settings.max_model_len
+        )
+
+        try:
+            async with (
+                self.scheduler.slot(self.priority, self.tenant),
+                httpx.AsyncClient(timeout=120.0) as client,
+                self.pool.acquire() as endpoint,
+            ):
+                timer.start(endpoint.url)
+                async with client.stream(
+                    "POST",
+                    f"{endpoint.url}/completions",
+                    json={
+                        "model": self.model,
+                        "prompt": prompt,
+                        "max_tokens": max_tokens,
+                        "temperature": 0.1,
+                        "stream": True,
+                        "stream_options": {"include_usage": True},
+                        "stop": self.STOP_SEQUENCES,
+                    },
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if line.startswith("data: "):
+                            data = line[6:]
+                            if data == "[DONE]":
+                                break
+                            try:
+                                chunk = json.loads(data)
+                            except json.JSONDecodeError:
+                                continue
+                            timer.record_usage(chunk.get("usage"))
+                            # The usage chunk at the end has no choices
+                            choices = chunk.get("choices") or []
+                            if choices and (text := choices[0].get("text")):
+                                timer.first_token()
+                                yield text
+                    timer.finish()
+
+        except (asyncio.CancelledError, GeneratorExit):
+            # Client went away (task cancelled or stream closed by the
+            # consumer): closing the response aborts the generation in vLLM
+            timer.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"vLLM streaming failed: {e}")
+            raise AIServiceError(f"vLLM streaming failed: {str(e)}")
+        finally:
+            self.last_metrics = timer.to_dict()
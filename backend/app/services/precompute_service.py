@@ -0,0 +1,314 @@
+"""
+Background precomputation of analyses for newly failed checks.
+
+Operators usually open the dashboard right after a scan, when every newly
+failed check still needs an LLM analysis. The precompute worker periodically
+compares the failed checks of every active agent with the analysis history
+and generates the missing analyses at background priority (see
+ai/scheduler.py), within a GPU-time budget and an optional time window, so
+most interactive requests become cache hits.
+"""
+
+import asyncio
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.repositories.async_analysis_repository import AsyncAnalysisRepository
+from app.services.ai import AIServiceFactory, compute_analysis_fingerprint
+from app.services.ai.scheduler import PRIORITY_BACKGROUND
+from app.services.wazuh_client import wazuh_client
+from app.utils.exceptions import AIServiceError, WazuhAPIError
+from app.utils.logger import logger
+
+# The GPU budget is spent over a rolling window of this length
+BUDGET_WINDOW_SECONDS = 3600.0
+
+
+def parse_window(value: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse a "HH:MM-HH:MM" time window to (start, end) minutes of the day.
+
+    Args:
+        value: Window string; empty means no restriction
+
+    Returns:
+        (start, end) minutes, or None for no restriction
+
+    Raises:
+        ValueError: If the window is malformed
+    """
+    if not value.strip():
+        return None
+    try:
+        start, end = value.split("-")
+        return _minute_of_day(start), _minute_of_day(end)
+    except ValueError:
+        raise ValueError(f"Invalid precompute window {value!r}, expected HH:MM-HH:MM")
+
+
+def _minute_of_day(value: str) -> int:
+    hours, minutes = value.strip().split(":")
+    if not (0 <= int(hours) < 24 and 0 <= int(minutes) < 60):
+        raise ValueError(value)
+    return int(hours) * 60 + int(minutes)
+
+
+def in_window(window: Optional[Tuple[int, int]], now: datetime) -> bool:
+    """Whether `now` falls inside the window (which may wrap midnight)."""
+    if window is None:
+        return True
+    start, end = window
+    minute = now.hour * 60 + now.minute
+    if start <= end:
+        return start <= minute < end
+    return minute >= start or minute < end
+
+
+class PrecomputeWorker:
+    """Periodically precomputes analyses for failed checks missing from the cache."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._run_lock = asyncio.Lock()
+        self._window: Optional[Tuple[int, int]] = None
+        # (monotonic time, generation seconds) of every precomputed analysis
+        self._gpu_usage: Deque[Tuple[float, float]] = deque()
+        self.runs = 0
+        self.precomputed = 0
+        self.failed = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_run: Optional[Dict[str, int]] = None
+
+    def gpu_seconds_used(self) -> float:
+        """Generation seconds spent on precomputation in the budget window."""
+        cutoff = time.monotonic() - BUDGET_WINDOW_SECONDS
+        while self._gpu_usage and self._gpu_usage[0][0] < cutoff:
+            self._gpu_usage.popleft()
+        return sum(seconds for _, seconds in self._gpu_usage)
+
+    def _can_start(self, force: bool = False) -> bool:
+        """Whether another analysis may start now (budget left, inside the window, or forced)."""
+        if force:
+            return True
+        budget = settings.precompute_gpu_seconds_per_hour
+        return (budget <= 0 or self.gpu_seconds_used() < budget) and in_window(self._window, datetime.now())
+
+    def configuration_error(self) -> Optional[str]:
+        """
+        Load the time window and check the settings precomputation depends on.
+
+        Returns:
+            Why precomputation cannot run, or None if it can
+        """
+        if not settings.enable_analysis_cache:
+            return "the analysis cache is disabled"
+        try:
+            self._window = parse_window(settings.precompute_window)
+        except ValueError as e:
+            return str(e)
+        return None
+
+    async def find_missing(self) -> List[Dict[str, Any]]:
+        """
+        Find failed checks of active agents that have no cached analysis.
+
+        Checks are compared by analysis fingerprint, so a check failing on many
+        agents with the same OS is analyzed once and served to the others from
+        the shared cache.
+
+        Returns:
+            One work item (agent, policy_id, check, language, fingerprint) per
+            missing fingerprint
+        """
+        provider = settings.precompute_ai_provider
+        model = AIServiceFactory.get_model_name(provider)
+        languages = [lang.strip() for lang in settings.precompute_languages.split(",") if lang.strip()]
+
+        candidates: Dict[str, Dict[str, Any]] = {}
+        for agent in await wazuh_client.get_agents():
+            if agent.get("status", "active") != "active":
+                continue
+            try:
+                for policy in await wazuh_client.get_sca_policies(agent["id"]):
+                    policy_id = policy["policy_id"]
+                    for check in await wazuh_client.get_failed_checks(agent["id"], policy_id):
+                        for language in languages:
+                            fingerprint = compute_analysis_fingerprint(
+                                check, language=language, model=model, agent_info=agent
+                            )
+                            candidates.setdefault(fingerprint, {
+                                "agent": agent,
+                                "policy_id": policy_id,
+                                "check": check,
+                                "language": language,
+                                "fingerprint": fingerprint,
+                            })
+            except WazuhAPIError as e:
+                logger.warning(f"⚠️ Precompute skipped agent {agent['id']}: {e}")
+
+        async with AsyncSessionLocal() as db:
+            cached = await AsyncAnalysisRepository(db).get_cached_fingerprints(list(candidates))
+
+        return [item for fingerprint, item in candidates.items() if fingerprint not in cached]
+
+    async def run_once(self, force: bool = False) -> Dict[str, int]:
+        """
+        Run one precompute cycle.
+
+        Args:
+            force: Ignore the GPU budget and the time window (manual runs);
+                the analysis cache must still be enabled
+
+        Returns:
+            Summary with the number of missing, analyzed, failed and skipped checks
+        """
+        async with self._run_lock:
+            summary = {"missing": 0, "analyzed": 0, "failed": 0, "skipped": 0}
+            error = self.configuration_error()
+            if error:
+                logger.warning(f"⏸️ Precompute skipped: {error}")
+                return summary
+            if not self._can_start(force):
+                logger.info("⏸️ Precompute skipped: GPU budget spent or outside the time window")
+                return summary
+
+            pending = await self.find_missing()
+            limit = max(0, settings.precompute_max_analyses_per_run)
+            summary["missing"] = len(pending)
+            summary["skipped"] = max(0, len(pending) - limit)
+            if pending:
+                logger.info(f"🧮 Precomputing {min(len(pending), limit)} of {len(pending)} missing analyses")
+
+            # As many in flight as the background class may run, so the budget
+            # and window are checked right before each request is sent
+            semaphore = asyncio.Semaphore(max(1, settings.ai_background_max_concurrency))
+
+            async def precompute(item: Dict[str, Any]) -> None:
+                async with semaphore:
+                    if not self._can_start(force):
+                        summary["skipped"] += 1
+                        return
+                    summary["analyzed" if await self._analyze(item) else "failed"] += 1
+
+            await asyncio.gather(*(precompute(item) for item in pending[:limit]))
+
+            self.runs += 1
+            self.precomputed += summary["analyzed"]
+            self.failed += summary["failed"]
+            self.last_run_at = datetime.utcnow()
+            self.last_run = summary
+            logger.info(
+                f"✅ Precompute run finished: {summary['analyzed']} analyzed, "
+                f"{summary['failed']} failed, {summary['skipped']} left for later"
+            )
+            return summary
+
+    async def _analyze(self, item: Dict[str, Any]) -> bool:
+        """Generate and save the analysis of one work item; returns success."""
+        provider = settings.precompute_ai_provider
+        agent, check, language = item["agent"], item["check"], item["language"]
+        start_time = datetime.utcnow()
+
+        try:
+            ai_service = AIServiceFactory.create(provider, priority=PRIORITY_BACKGROUND, tenant=agent["id"])
+            result = await ai_service.analyze_check(check, language=language, agent_info=agent)
+        except AIServiceError as e:
+            logger.warning(f"⚠️ Precompute failed for check {check.get('id')} (agent {agent['id']}): {e}")
+            return False
+
+        metrics = result.get("llm_metrics") or {}
+        self._gpu_usage.append((time.monotonic(), metrics.get("generation_seconds") or 0.0))
+
+        # An analysis served by the fallback provider is keyed on its model
+        served_provider = result.get("ai_provider", AIServiceFactory.resolve_provider(provider))
+        fingerprint = item["fingerprint"]
+        if served_provider != AIServiceFactory.resolve_provider(provider):
+            fingerprint = compute_analysis_fingerprint(
+                check,
+                language=language,
+                model=AIServiceFactory.get_model_name(served_provider),
+                agent_info=agent,
+            )
+
+        try:
+            async with AsyncSessionLocal() as db:
+                await AsyncAnalysisRepository(db).save_analysis(
+                    agent_id=agent["id"],
+                    agent_name=agent.get("name", agent["id"]),
+                    policy_id=item["policy_id"],
+                    check_id=check["id"],
+                    check_title=check.get("title", "Unknown"),
+                    check_description=check.get("description"),
+                    language=language,
+                    ai_provider=served_provider,
+                    report_text=result["report"],
+                    status="completed",
+                    execution_time=(datetime.utcnow() - start_time).total_seconds(),
+                    remediation_script=result.get("remediation_script"),
+                    analysis_fingerprint=fingerprint,
+                    routing_decision=result.get("routing_decision"),
+                    llm_metrics=metrics,
+                )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save precomputed analysis: {e}")
+            return False
+
+    async def _loop(self) -> None:
+        while True:
+            if in_window(self._window, datetime.now()):
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    logger.error(f"Precompute run failed: {e}")
+            await asyncio.sleep(settings.precompute_interval_seconds)
+
+    def start(self) -> None:
+        """Start periodic precomputation (call from the running event loop)."""
+        if self._task is not None:
+            return
+        error = self.configuration_error()
+        if error:
+            logger.warning(f"⚠️ Precompute not started: {error}")
+            return
+
+        self._task = asyncio.create_task(self._loop())
+        logger.info(
+            f"🧮 Precompute every {settings.precompute_interval_seconds}s"
+            + (f" between {settings.precompute_window}" if self._window else "")
+            + f" (GPU budget {settings.precompute_gpu_seconds_per_hour:g}s/h)"
+        )
+
+    async def stop(self) -> None:
+        """Stop periodic precomputation, cancelling a run in progress."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Worker state, totals and GPU budget usage."""
+        return {
+            "enabled": self._task is not None,
+            "running": self._run_lock.locked(),
+            "window": settings.precompute_window or None,
+            "in_window": in_window(self._window, datetime.now()),
+            "gpu_seconds_last_hour": round(self.gpu_seconds_used(), 1),
+            "gpu_seconds_per_hour": settings.precompute_gpu_seconds_per_hour,
+            "runs": self.runs,
+            "precomputed": self.precomputed,
+            "failed": self.failed,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_run": self.last_run,
+        }
+
+
+# Global precompute worker instance
+precompute_worker = PrecomputeWorker()
@@ -1 +1 @@
-"""Utilities package."""
+"""Utilities package."""
@@ -1,31 +1,37 @@
-"""Custom exceptions for the application."""
-
-
-class WazuhAPIError(Exception):
-    """Raised when Wazuh API requests fail."""
-
-    pass
-
-
-class AIServiceError(Exception):
-    """Raised when AI service operations fail."""
-
-    pass
-
-
-class AgentNotFoundError(Exception):
-    """Raised when requested agent doesn't exist."""
-
-    pass
-
-
-class CheckNotFoundError(Exception):
-    """Raised when requested SCA check doesn't exist."""
-
-    pass
-
-
-class PDFGenerationError(Exception):
-    """Raised when PDF generation fails."""
-
-    pass
+"""Custom exceptions for the application."""
+
+
+class WazuhAPIError(Exception):
+    """Raised when Wazuh API requests fail."""
+
+    pass
+
+
+class AIServiceError(Exception):
+    """Raised when AI service operations fail."""
+
+    pass
+
+
+class ClientDisconnectedError(Exception):
+    """Raised when the client disconnects before its analysis completes."""
+
+    pass
+
+
+class AgentNotFoundError(Exception):
+    """Raised when requested agent doesn't exist."""
+
+    pass
+
+
+class CheckNotFoundError(Exception):
+    """Raised when requested SCA check doesn't exist."""
+
+    pass
+
+
+class PDFGenerationError(Exception):
+    """Raised when PDF generation fails."""
+
+    pass
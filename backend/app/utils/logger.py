@@ -1,31 +1,31 @@
-import logging
-import sys
-from pathlib import Path
-
-from app.config import settings
-
-
-def setup_logger(name: str = "wazuh_sca") -> logging.Logger:
-    """Configure application logger."""
-
-    logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, settings.log_level.upper()))
-
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.DEBUG)
-
-    # Formatter
-    formatter = logging.Formatter(
-        fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    console_handler.setFormatter(formatter)
-
-    logger.addHandler(console_handler)
-
-    return logger
-
-
-# Global logger instance
-logger = setup_logger()
+import logging
+import sys
+from pathlib import Path
+
+from app.config import settings
+
+
+def setup_logger(name: str = "wazuh_sca") -> logging.Logger:
+    """Configure application logger."""
+
+    logger = logging.getLogger(name)
+    logger.setLevel(getattr(logging, settings.log_level.upper()))
+
+    # Console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.DEBUG)
+
+    # Formatter
+    formatter = logging.Formatter(
+        fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    console_handler.setFormatter(formatter)
+
+    logger.addHandler(console_handler)
+
+    return logger
+
+
+# Global logger instance
+logger = setup_logger()
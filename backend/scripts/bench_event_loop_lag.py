@@ -0,0 +1,177 @@
+"""
+Benchmark event-loop lag of the sync and async analysis history repositories.
+
+Seeds a temporary SQLite database with synthetic analyses, then runs the
+queries of the history endpoints (agent history page, count, cache stats)
+from concurrent coroutines, once through AnalysisRepository on a sync
+Session (how request handlers used to query) and once through
+AsyncAnalysisRepository on an AsyncSession. A ticker coroutine measures how
+late the event loop wakes it up while the queries run: with the sync
+repository every query blocks the loop, so the lag grows with the load.
+
+Usage (from the backend directory):
+    python -m scripts.bench_event_loop_lag --rows 20000 --concurrency 16 --requests 400
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List
+
+os.environ.setdefault("WAZUH_PASSWORD", "benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("APP_ENV", "production")  # no SQL echo
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.models import AnalysisHistory  # noqa: E402
+from app.db.session import async_database_url  # noqa: E402
+from app.repositories.analysis_repository import AnalysisRepository  # noqa: E402
+from app.repositories.async_analysis_repository import AsyncAnalysisRepository  # noqa: E402
+
+TICK_SECONDS = 0.005
+AGENTS = 50
+
+
+def seed(url: str, rows: int) -> None:
+    """Create the schema and insert synthetic completed analyses."""
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all(
+            AnalysisHistory(
+                agent_id=f"{i % AGENTS:03d}",
+                agent_name=f"web-{i % AGENTS:03d}",
+                policy_id="cis_ubuntu22-04",
+                check_id=28000 + i,
+                analysis_fingerprint=f"{i:064x}",
+                check_title=f"Ensure kernel parameter rule_{i} is set",
+                language="en",
+                ai_provider="vllm",
+                report_text="## Analysis\n" + "Lorem ipsum dolor sit amet. " * 40,
+                status="completed",
+                remediation_script="sysctl -w net.ipv4.conf.all.rule=0",
+                script_language="bash",
+                llm_model="bench",
+                generation_seconds=1.0 + i % 7,
+            )
+            for i in range(rows)
+        )
+        db.commit()
+    engine.dispose()
+
+
+async def measure_lag(stop: asyncio.Event, samples: List[float]) -> None:
+    """Record how late each TICK_SECONDS sleep returns until stopped."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        samples.append(time.perf_counter() - started - TICK_SECONDS)
+
+
+def sync_request(SessionLocal, agent_id: str) -> None:
+    db = SessionLocal()
+    try:
+        repo = AnalysisRepository(db)
+        [a.to_dict() for a in repo.get_history_by_agent(agent_id, limit=200)]
+        repo.count_by_agent(agent_id)
+        repo.get_cache_stats()
+    finally:
+        db.close()
+
+
+async def async_request(AsyncSessionLocal, agent_id: str) -> None:
+    async with AsyncSessionLocal() as db:
+        repo = AsyncAnalysisRepository(db)
+        [a.to_dict() for a in await repo.get_history_by_agent(agent_id, limit=200)]
+        await repo.count_by_agent(agent_id)
+        await repo.get_cache_stats()
+
+
+async def run(mode: str, url: str, requests: int, concurrency: int) -> Dict[str, Any]:
+    """Run the request mix in one mode and summarize lag and throughput."""
+    if mode == "sync":
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+        SessionLocal = sessionmaker(autoflush=False, bind=engine)
+
+        async def handle(agent_id: str) -> None:
+            # What an async route calling the sync repository does
+            sync_request(SessionLocal, agent_id)
+    else:
+        engine = create_async_engine(async_database_url(url))
+        AsyncSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+        async def handle(agent_id: str) -> None:
+            await async_request(AsyncSessionLocal, agent_id)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(f"{i % AGENTS:03d}")
+    latencies: List[float] = []
+
+    async def worker() -> None:
+        while not queue.empty():
+            agent_id = queue.get_nowait()
+            started = time.perf_counter()
+            await handle(agent_id)
+            latencies.append(time.perf_counter() - started)
+
+    stop = asyncio.Event()
+    lag: List[float] = []
+    ticker = asyncio.create_task(measure_lag(stop, lag))
+    await asyncio.sleep(TICK_SECONDS * 4)  # baseline ticks before the load
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await ticker
+    if mode == "sync":
+        engine.dispose()
+    else:
+        await engine.dispose()
+
+    lag.sort()
+    latencies.sort()
+    return {
+        "mode": mode,
+        "requests_per_second": requests / elapsed,
+        "latency_p50_ms": statistics.median(latencies) * 1000,
+        "latency_p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "lag_p50_ms": statistics.median(lag) * 1000,
+        "lag_p99_ms": lag[max(0, int(len(lag) * 0.99) - 1)] * 1000,
+        "lag_max_ms": lag[-1] * 1000,
+        "ticks": len(lag),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="Synthetic analyses to seed")
+    parser.add_argument("--requests", type=int, default=400, help="History requests per mode")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent requests")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/bench.db"
+        seed(url, args.rows)
+        print(f"Seeded {args.rows} analyses; {args.requests} requests, concurrency {args.concurrency}\n")
+        print(f"{'mode':<6} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'lag p50':>8} {'lag p99':>8} {'lag max':>8}")
+        for mode in ("sync", "async"):
+            result = asyncio.run(run(mode, url, args.requests, args.concurrency))
+            print(
+                f"{result['mode']:<6} {result['requests_per_second']:>8.1f} "
+                f"{result['latency_p50_ms']:>8.1f} {result['latency_p99_ms']:>8.1f} "
+                f"{result['lag_p50_ms']:>8.1f} {result['lag_p99_ms']:>8.1f} {result['lag_max_ms']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
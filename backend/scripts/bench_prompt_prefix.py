@@ -0,0 +1,155 @@
+"""
+Benchmark the legacy and prefix-cache-friendly prompt layouts against vLLM.
+
+Sends the same set of synthetic SCA checks with both layouts as streaming
+`/completions` requests and reports time-to-first-token (TTFT) and
+throughput for each layout. Works against a real vLLM server (started with
+prefix caching enabled) or any OpenAI-compatible stand-in.
+
+Usage (from the backend directory):
+    python -m scripts.bench_prompt_prefix --url http://localhost:8000/v1 --requests 40 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from typing import Dict, Any, List
+
+os.environ.setdefault("WAZUH_PASSWORD", "benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import httpx  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.services.ai.vllm_service import VLLMService  # noqa: E402
+
+
+def build_checks(count: int) -> List[Dict[str, Any]]:
+    """Build synthetic, distinct SCA checks resembling CIS Linux rules."""
+    return [
+        {
+            "id": 28500 + i,
+            "title": f"Ensure kernel parameter net.ipv4.conf.all.rule_{i} is set",
+            "result": "failed",
+            "rationale": "Disabling this parameter reduces the attack surface of the host. " * 3,
+            "remediation": f"Set net.ipv4.conf.all.rule_{i} = 0 in /etc/sysctl.d/60-netipv4.conf",
+            "reason": f"sysctl net.ipv4.conf.all.rule_{i} returned 1",
+            "file": "/etc/sysctl.d/60-netipv4.conf",
+            "command": f"sysctl net.ipv4.conf.all.rule_{i}",
+            "condition": "all",
+            "compliance": [{"cis": f"3.3.{i}"}, {"nist_800_53": "CM.1"}],
+        }
+        for i in range(count)
+    ]
+
+
+def build_agent(index: int) -> Dict[str, Any]:
+    """Build a synthetic agent; agents differ so legacy prompts diverge early."""
+    return {
+        "name": f"web-{index:03d}",
+        "ip": f"10.0.{index // 256}.{index % 256}",
+        "os": {"name": "Ubuntu", "version": "22.04.4 LTS", "arch": "x86_64"},
+    }
+
+
+def shared_prefix_length(prompts: List[str]) -> int:
+    """Length (in characters) of the prefix shared by all prompts."""
+    return len(os.path.commonprefix(prompts))
+
+
+async def run_request(
+    client: httpx.AsyncClient, url: str, model: str, prompt: str, max_tokens: int
+) -> Dict[str, float]:
+    """Send one streaming completion and measure TTFT, duration and chunk count."""
+    start = time.perf_counter()
+    ttft = None
+    chunks = 0
+
+    async with client.stream(
+        "POST",
+        f"{url}/completions",
+        json={
+            "model": model,
+            "prompt": prompt,
+            "max_tokens": max_tokens,
+            "temperature": 0.1,
+            "stream": True,
+        },
+    ) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            data = line[6:]
+            if data == "[DONE]":
+                break
+            try:
+                text = json.loads(data)["choices"][0].get("text")
+            except (json.JSONDecodeError, KeyError, IndexError):
+                continue
+            if text:
+                if ttft is None:
+                    ttft = time.perf_counter() - start
+                chunks += 1
+
+    return {"ttft": ttft or 0.0, "duration": time.perf_counter() - start, "tokens": chunks}
+
+
+async def run_layout(
+    prompts: List[str], url: str, model: str, concurrency: int, max_tokens: int
+) -> Dict[str, float]:
+    """Run all prompts of one layout with bounded concurrency."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(client: httpx.AsyncClient, prompt: str) -> Dict[str, float]:
+        async with semaphore:
+            return await run_request(client, url, model, prompt, max_tokens)
+
+    wall_start = time.perf_counter()
+    async with httpx.AsyncClient(timeout=300.0) as client:
+        results = await asyncio.gather(*(bounded(client, p) for p in prompts))
+    wall = time.perf_counter() - wall_start
+
+    ttfts = sorted(r["ttft"] for r in results)
+    total_tokens = sum(r["tokens"] for r in results)
+    return {
+        "ttft_p50": statistics.median(ttfts),
+        "ttft_p95": ttfts[max(0, int(len(ttfts) * 0.95) - 1)],
+        "throughput": total_tokens / wall if wall else 0.0,
+        "wall": wall,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=settings.vllm_api_url, help="OpenAI-compatible base URL")
+    parser.add_argument("--model", default=settings.vllm_model, help="Model name")
+    parser.add_argument("--requests", type=int, default=20, help="Number of prompts per layout")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent requests")
+    parser.add_argument("--max-tokens", type=int, default=256, help="max_tokens per request")
+    parser.add_argument("--language", choices=["pt", "en"], default="en")
+    args = parser.parse_args()
+
+    service = VLLMService()
+    checks = build_checks(args.requests)
+
+    print(f"{'layout':<8} {'shared prefix':>14} {'TTFT p50':>10} {'TTFT p95':>10} {'tok/s':>9} {'wall':>8}")
+    for layout, enabled in (("legacy", False), ("prefix", True)):
+        settings.enable_prompt_prefix_caching = enabled
+        prompts = [
+            service._build_prompt(check, args.language, build_agent(i))
+            for i, check in enumerate(checks)
+        ]
+        stats = await run_layout(prompts, args.url, args.model, args.concurrency, args.max_tokens)
+        print(
+            f"{layout:<8} {shared_prefix_length(prompts):>12} ch "
+            f"{stats['ttft_p50']:>9.3f}s {stats['ttft_p95']:>9.3f}s "
+            f"{stats['throughput']:>9.1f} {stats['wall']:>7.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
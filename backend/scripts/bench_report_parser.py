@@ -0,0 +1,204 @@
+"""
+Microbenchmark of the remediation-script parser.
+
+Compares the single-pass parser used by `BaseAIService._parse_remediation_script`
+with the previous multi-regex implementation on ~3k-token reports in pt and
+en (Linux and Windows). The expected outputs for these samples are checked
+by tests/test_report_parser.py.
+
+Usage (from the backend directory):
+    python -m scripts.bench_report_parser --iterations 2000
+"""
+
+import argparse
+import os
+import re
+import timeit
+from typing import Any, Dict, Optional
+
+os.environ.setdefault("WAZUH_PASSWORD", "benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.services.ai.report_parser import parse_report  # noqa: E402
+
+PROSE_PT = (
+    "A configuração atual permite que pacotes ICMP redirecionados alterem a tabela de\n"
+    "encaminhamento do sistema, o que pode ser explorado para ataques man-in-the-middle.\n"
+) * 12
+PROSE_EN = (
+    "The current configuration lets redirected ICMP packets change the routing table\n"
+    "of the host, which can be abused for man-in-the-middle attacks on the network.\n"
+) * 12
+
+SCRIPT = """#!/bin/bash
+set -e
+if [ "$EUID" -ne 0 ]; then
+  echo "Run as root"
+  exit 1
+fi
+echo "net.ipv4.conf.all.accept_redirects = 0" > /etc/sysctl.d/60-netipv4.conf
+sysctl -w net.ipv4.conf.all.accept_redirects=0
+sysctl -w net.ipv4.route.flush=1
+sysctl net.ipv4.conf.all.accept_redirects"""
+
+PS_SCRIPT = """#Requires -RunAsAdministrator
+Set-ItemProperty -Path 'HKLM:\\SYSTEM\\CurrentControlSet\\Services\\Tcpip\\Parameters' `
+  -Name 'EnableICMPRedirect' -Value 0 -Type DWord
+Get-ItemProperty -Path 'HKLM:\\SYSTEM\\CurrentControlSet\\Services\\Tcpip\\Parameters' -Name 'EnableICMPRedirect'"""
+
+SAMPLES = {
+    "pt": f"""--- Relatório de Análise de Conformidade SCA ---
+
+## 1. Descrição do Problema
+{PROSE_PT}
+
+## 2. Contexto Técnico
+{PROSE_PT}
+- Ficheiro: /etc/sysctl.d/60-netipv4.conf
+- Comando: sysctl net.ipv4.conf.all.accept_redirects
+
+## 3. Passos de Remediação
+{PROSE_PT * 3}
+
+## Script de Remediação Automática
+```bash
+{SCRIPT}
+```
+
+**Comando de Validação:** `sysctl net.ipv4.conf.all.accept_redirects`
+**Riscos Potenciais:**
+- Pode afetar routers que dependem de redirecionamentos ICMP
+- Requer privilégios de root
+**Tempo Estimado:** < 5 segundos
+
+## 5. Validação
+{PROSE_PT * 2}
+""",
+    "en": f"""--- SCA Compliance Analysis Report ---
+
+## 1. Problem Description
+{PROSE_EN}
+
+## 2. Technical Context
+{PROSE_EN}
+- File: /etc/sysctl.d/60-netipv4.conf
+- Command: sysctl net.ipv4.conf.all.accept_redirects
+
+## 3. Remediation Steps
+{PROSE_EN * 3}
+
+## Automated Remediation Script
+```bash
+{SCRIPT}
+```
+
+**Validation Command:** `sysctl net.ipv4.conf.all.accept_redirects`
+**Potential Risks:**
+- May affect routers relying on ICMP redirects
+- Requires root privileges
+**Estimated Time:** < 5 seconds
+
+## 5. Validation
+{PROSE_EN * 2}
+""",
+    "en-windows": f"""--- SCA Compliance Analysis Report ---
+
+## 1. Problem Description
+{PROSE_EN}
+
+## 2. Technical Context
+{PROSE_EN}
+- Registry: HKLM\\SYSTEM\\CurrentControlSet\\Services\\Tcpip\\Parameters
+
+## 3. Remediation Steps
+{PROSE_EN * 3}
+
+## Automated Remediation Script
+```powershell
+{PS_SCRIPT}
+```
+
+**Validation Command:** `Get-ItemProperty -Path 'HKLM:\\SYSTEM\\CurrentControlSet\\Services\\Tcpip\\Parameters'`
+**Potential Risks:**
+- Legacy routing setups may stop working
+**Estimated Time:** 1 minute
+
+## 5. Validation
+{PROSE_EN * 2}
+""",
+}
+
+def legacy_parse(ai_output: str, os_info: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Previous implementation: one re.search per fence language plus metadata passes."""
+    script_language = "bash"
+    if os_info and "windows" in os_info.get("name", "").lower():
+        script_language = "powershell"
+
+    patterns = [
+        (r'```bash\s*\n(.*?)```', "bash"),
+        (r'```shell\s*\n(.*?)```', "bash"),
+        (r'```sh\s*\n(.*?)```', "bash"),
+        (r'```powershell\s*\n(.*?)```', "powershell"),
+        (r'```ps1\s*\n(.*?)```', "powershell"),
+        (r'```python\s*\n(.*?)```', "python"),
+    ]
+    script_content = None
+    detected_language = script_language
+    for pattern, lang in patterns:
+        match = re.search(pattern, ai_output, re.DOTALL | re.IGNORECASE)
+        if match:
+            script_content = match.group(1).strip()
+            detected_language = lang
+            break
+    if not script_content:
+        match = re.search(r'```\s*\n(.*?)```', ai_output, re.DOTALL)
+        if match:
+            script_content = match.group(1).strip()
+    if not script_content:
+        return None
+
+    validation_match = re.search(
+        r'\*\*(?:Comando de )?Valida[çc][ãa]o(?:\s+Command)?[:\*]\*\*\s*[`]?(.*?)[`]?(?:\n|$)',
+        ai_output, re.IGNORECASE,
+    )
+    risks = []
+    risks_section = re.search(
+        r'\*\*(?:Riscos )?Potenciais?(?: Risks)?[:\*]\*\*(.*?)(?:\n\*\*|\n##|$)',
+        ai_output, re.DOTALL | re.IGNORECASE,
+    )
+    if risks_section:
+        risks = [r.strip() for r in re.findall(r'[-*]\s*(.+?)(?:\n|$)', risks_section.group(1)) if r.strip()]
+    time_match = re.search(
+        r'\*\*(?:Tempo )?Estimado?(?: Time)?[:\*]\*\*\s*(.+?)(?:\n|$)', ai_output, re.IGNORECASE
+    )
+    requires_root = bool(re.search(r'(sudo\s+|if.*EUID.*root|su\s+-)', script_content))
+
+    return {
+        "script_content": script_content,
+        "script_language": detected_language,
+        "validation_command": validation_match.group(1).strip() if validation_match else "",
+        "estimated_duration": time_match.group(1).strip() if time_match else None,
+        "requires_root": requires_root,
+        "risks": risks,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=1000, help="Parses per measurement")
+    args = parser.parse_args()
+
+    print(f"\n{'sample':<11} {'chars':>7} {'legacy':>12} {'single-pass':>12} {'speedup':>8}")
+    for language, report in SAMPLES.items():
+        legacy = timeit.timeit(lambda: legacy_parse(report), number=args.iterations)
+        current = timeit.timeit(lambda: parse_report(report).remediation_script(), number=args.iterations)
+        print(
+            f"{language:<11} {len(report):>7} "
+            f"{legacy / args.iterations * 1e6:>9.1f} µs "
+            f"{current / args.iterations * 1e6:>9.1f} µs "
+            f"{legacy / current:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Write-concurrency test of the SQLite profile.
+
+Runs several worker processes against one SQLite file, like uvicorn with
+`--workers`: writers save analyses through AnalysisRepository while readers
+run the history and cache-statistics queries. Each run uses a fresh database
+with one profile:
+
+- legacy: what the app used before the profile existed (rollback journal,
+  synchronous=FULL, the driver's 5 s busy timeout, default cache, no mmap)
+- tuned: the configured profile (WAL, synchronous=NORMAL, ... see
+  SQLITE_* settings)
+
+and reports write throughput, "database is locked" errors and read latency.
+
+Usage (from the backend directory):
+    python -m scripts.bench_sqlite_writes --writers 4 --readers 4 --seconds 10
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List
+
+PROFILES = {
+    "legacy": {
+        "SQLITE_JOURNAL_MODE": "DELETE",
+        "SQLITE_SYNCHRONOUS": "FULL",
+        "SQLITE_BUSY_TIMEOUT_MS": "5000",
+        "SQLITE_CACHE_SIZE_KIB": "2000",
+        "SQLITE_MMAP_SIZE_MB": "0",
+    },
+    "tuned": {},  # The configured SQLITE_* settings
+}
+
+
+def _configure(url: str, profile: str) -> None:
+    """Set the environment read by app.config (before any app import)."""
+    os.environ.setdefault("WAZUH_PASSWORD", "benchmark")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ["APP_ENV"] = "production"  # no SQL echo
+    os.environ["LOG_LEVEL"] = "WARNING"
+    os.environ["DATABASE_URL"] = url
+    os.environ.update(PROFILES[profile])
+
+
+def _worker(role: str, index: int, url: str, profile: str, start: float, deadline: float, results) -> None:
+    """Write or read from start to deadline; report counts and latencies."""
+    _configure(url, profile)
+    from app.db.session import SessionLocal
+    from app.repositories.analysis_repository import AnalysisRepository
+
+    time.sleep(max(0.0, start - time.time()))
+
+    done, errors, latencies = 0, 0, []
+    while time.time() < deadline:
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            repo = AnalysisRepository(db)
+            if role == "writer":
+                repo.save_analysis(
+                    agent_id=f"{index:03d}",
+                    agent_name=f"web-{index:03d}",
+                    policy_id="cis_ubuntu22-04",
+                    check_id=28000 + done,
+                    check_title=f"Ensure kernel parameter rule_{done} is set",
+                    language="en",
+                    ai_provider="vllm",
+                    report_text="## Analysis\n" + "Lorem ipsum dolor sit amet. " * 40,
+                    analysis_fingerprint=f"{index:08x}{done:056x}",
+                    prompt_template="bench",
+                )
+            else:
+                [a.to_dict() for a in repo.get_history_by_agent(f"{index % 4:03d}", limit=200)]
+                repo.get_cache_stats()
+            done += 1
+            latencies.append(time.perf_counter() - started)
+        except Exception as e:
+            db.rollback()
+            errors += 1
+            if "locked" not in str(e):
+                raise
+        finally:
+            db.close()
+    results.put({"role": role, "done": done, "errors": errors, "latencies": latencies})
+
+
+def run(profile: str, writers: int, readers: int, seconds: float) -> Dict[str, Any]:
+    """Run one profile on a fresh database and aggregate the worker results."""
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/bench.db"
+        _configure(url, profile)
+        context = multiprocessing.get_context("spawn")
+        setup = context.Process(target=_init_db, args=(url, profile))
+        setup.start()
+        setup.join()
+
+        results = context.Queue()
+        start = time.time() + 5  # time for every worker to import the app
+        deadline = start + seconds
+        processes = [
+            context.Process(target=_worker, args=(role, index, url, profile, start, deadline, results))
+            for role, count in (("writer", writers), ("reader", readers))
+            for index in range(count)
+        ]
+        for process in processes:
+            process.start()
+        reports = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    summary: Dict[str, Any] = {"profile": profile}
+    for role in ("writer", "reader"):
+        latencies: List[float] = sorted(l for r in reports if r["role"] == role for l in r["latencies"])
+        summary[role] = {
+            "done": sum(r["done"] for r in reports if r["role"] == role),
+            "locked": sum(r["errors"] for r in reports if r["role"] == role),
+            "p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+            "p99_ms": latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000 if latencies else None,
+        }
+    return summary
+
+
+def _init_db(url: str, profile: str) -> None:
+    _configure(url, profile)
+    from app.db.session import check_database_settings, init_db
+
+    init_db()
+    check_database_settings()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=4, help="Writer processes")
+    parser.add_argument("--readers", type=int, default=4, help="Reader processes")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration of each run")
+    args = parser.parse_args()
+
+    rows = []
+    for profile in PROFILES:
+        result = run(profile, args.writers, args.readers, args.seconds)
+        rows.append(result)
+
+    print(f"\n{args.writers} writers, {args.readers} readers, {args.seconds:g}s per profile\n")
+    print(
+        f"{'profile':<8} {'writes/s':>9} {'locked':>7} {'write p99':>10} "
+        f"{'reads/s':>8} {'locked':>7} {'read p50':>9} {'read p99':>9}"
+    )
+    for result in rows:
+        w, r = result["writer"], result["reader"]
+        print(
+            f"{result['profile']:<8} {w['done'] / args.seconds:>9.1f} {w['locked']:>7} "
+            f"{w['p99_ms'] or 0:>8.1f}ms {r['done'] / args.seconds:>8.1f} {r['locked']:>7} "
+            f"{r['p50_ms'] or 0:>7.1f}ms {r['p99_ms'] or 0:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
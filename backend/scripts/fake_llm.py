@@ -0,0 +1,427 @@
+"""
+Deterministic OpenAI-compatible stand-in for vLLM/OpenAI.
+
+Serves `/v1/models`, `/v1/completions` and `/v1/chat/completions`
+(streaming and non-streaming) with canned SCA reports in pt and en, with
+bash or PowerShell remediation scripts depending on the OS named in the
+prompt (as JSON when the request asks for structured output; one report per
+check for packed prompts; translation prompts get their report back with the
+requested headings and labels). Latency follows a simple model: requests wait
+for one of `--max-concurrency` slots, the first token arrives `--ttft`
+seconds after the slot is acquired and the rest are paced at
+`--tokens-per-second`.
+A seeded `--error-rate` fraction of requests fails with HTTP 500.
+
+Point the backend at it to benchmark the `VLLMService` and `OpenAIService`
+paths end to end without a GPU:
+    VLLM_API_URL=http://localhost:8001/v1
+    OPENAI_BASE_URL=http://localhost:8001/v1 OPENAI_API_KEY=fake
+
+Usage (from the backend directory):
+    python -m scripts.fake_llm --port 8001 --ttft 0.3 --tokens-per-second 40 --max-concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from scripts.bench_report_parser import PROSE_EN, PROSE_PT, PS_SCRIPT, SCRIPT
+
+# Text pieces of up to 4 characters (with their leading whitespace), roughly
+# the size of a BPE token; joining them gives back the original text
+TOKEN_RE = re.compile(r"\s*\S{1,4}|\s+")
+
+# OS line of the prompt's system context (both languages)
+OS_RE = re.compile(r"\*\*(?:Operating System|Sistema Operativo):\*\*([^\n]*)")
+
+# Per-check separator lines of packed prompts (app/services/ai/packing.py)
+PACK_MARKER_RE = re.compile(r"^=== CHECK (\S+) ===$", re.MULTILINE)
+
+# Report and label mapping of translation prompts (app/services/ai/translation.py)
+TRANSLATION_RE = re.compile(r"^<<<REPORT\n(.*)\nREPORT>>>$", re.MULTILINE | re.DOTALL)
+TRANSLATION_LABEL_RE = re.compile(r'^\s+- "(.+?)" -> "(.+?)"$', re.MULTILINE)
+TRANSLATION_HEADER_RE = re.compile(r"starting with the line:\n(.+)")
+
+
+LABELS = {
+    "pt": {
+        "header": "--- Relatório de Análise de Conformidade SCA ---",
+        "sections": ("1. Descrição do Problema", "2. Contexto Técnico", "3. Passos de Remediação"),
+        "script": "Script de Remediação Automática",
+        "validation": "Comando de Validação",
+        "risks": "Riscos Potenciais",
+        "risk": "Requer privilégios de administrador",
+        "time": "Tempo Estimado",
+        "duration": "< 5 segundos",
+    },
+    "en": {
+        "header": "--- SCA Compliance Analysis Report ---",
+        "sections": ("1. Problem Description", "2. Technical Context", "3. Remediation Steps"),
+        "script": "Automated Remediation Script",
+        "validation": "Validation Command",
+        "risks": "Potential Risks",
+        "risk": "Requires administrator privileges",
+        "time": "Estimated Time",
+        "duration": "< 5 seconds",
+    },
+}
+
+SCRIPTS = {
+    "linux": ("bash", SCRIPT, "sysctl net.ipv4.conf.all.accept_redirects"),
+    "windows": (
+        "powershell",
+        PS_SCRIPT,
+        "Get-ItemProperty -Path 'HKLM:\\SYSTEM\\CurrentControlSet\\Services\\Tcpip\\Parameters'",
+    ),
+}
+
+
+def build_report(language: str, platform: str) -> str:
+    """Canned report of ~1.8k tokens in the layout the prompts ask for."""
+    labels = LABELS[language]
+    prose = PROSE_PT if language == "pt" else PROSE_EN
+    script_language, script, validation = SCRIPTS[platform]
+    sections = "".join(f"## {title}\n{prose}\n" for title in labels["sections"])
+    return (
+        f"{labels['header']}\n\n{sections}"
+        f"## {labels['script']}\n```{script_language}\n{script}\n```\n\n"
+        f"**{labels['validation']}:** `{validation}`\n"
+        f"**{labels['risks']}:**\n- {labels['risk']}\n"
+        f"**{labels['time']}:** {labels['duration']}\n"
+    )
+
+
+def build_structured_report(language: str, platform: str) -> str:
+    """Canned JSON report for structured output requests (AI_STRUCTURED_OUTPUT)."""
+    labels = LABELS[language]
+    prose = PROSE_PT if language == "pt" else PROSE_EN
+    script_language, script, validation = SCRIPTS[platform]
+    return json.dumps(
+        {
+            "problem_description": prose,
+            "technical_context": prose,
+            "remediation_steps": [line for line in prose.splitlines() if line][:4],
+            "remediation_script": {
+                "script_content": script,
+                "script_language": script_language,
+                "validation_command": validation,
+                "estimated_duration": labels["duration"],
+                "requires_root": True,
+                "risks": [labels["risk"]],
+            },
+            "validation": prose,
+        },
+        ensure_ascii=False,
+        indent=2,
+    )
+
+
+REPORTS = {
+    (language, platform): build_report(language, platform)
+    for language in LABELS
+    for platform in SCRIPTS
+}
+STRUCTURED_REPORTS = {
+    (language, platform): build_structured_report(language, platform)
+    for language in LABELS
+    for platform in SCRIPTS
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into token-sized pieces."""
+    return TOKEN_RE.findall(text)
+
+
+def translate(prompt: str, report: str) -> str:
+    """"Translate" a report by swapping its headings and labels as the prompt asks."""
+    for source, target in TRANSLATION_LABEL_RE.findall(prompt):
+        report = report.replace(source, target)
+    lines = report.split("\n")
+    header = TRANSLATION_HEADER_RE.search(prompt)
+    if header and lines[0].startswith("---"):
+        lines[0] = header.group(1)
+    return "\n".join(lines)
+
+
+def pick_report(prompt: str, structured: bool = False) -> str:
+    """Choose the canned report matching the prompt's language and OS."""
+    translation = TRANSLATION_RE.search(prompt)
+    if translation:
+        return translate(prompt, translation.group(1))
+
+    language = "pt" if "Tarefa:" in prompt else "en"
+    os_line = OS_RE.search(prompt)
+    platform = "windows" if os_line and "windows" in os_line.group(1).lower() else "linux"
+    report = (STRUCTURED_REPORTS if structured else REPORTS)[(language, platform)]
+
+    # Packed prompts get one report per check, behind its separator line
+    check_ids = PACK_MARKER_RE.findall(prompt)
+    if check_ids and not structured:
+        return "\n".join(f"=== CHECK {check_id} ===\n{report}" for check_id in check_ids)
+    return report
+
+
+def wants_json(body: Dict[str, Any]) -> bool:
+    """Whether the request asks for JSON (vLLM guided decoding or OpenAI JSON mode)."""
+    response_format = body.get("response_format") or {}
+    return bool(body.get("guided_json")) or response_format.get("type") in ("json_object", "json_schema")
+
+
+def generate(
+    prompt: str, max_tokens: Optional[int], stop: Optional[List[str]], structured: bool = False
+) -> Tuple[List[str], str]:
+    """
+    Produce the completion for a prompt.
+
+    Returns:
+        Tuple of (tokens, finish_reason)
+    """
+    text = pick_report(prompt, structured)
+    for sequence in stop or []:
+        if sequence and sequence in text:
+            text = text[: text.index(sequence)]
+
+    tokens = tokenize(text)
+    if max_tokens is not None and len(tokens) > max_tokens:
+        return tokens[:max_tokens], "length"
+    return tokens, "stop"
+
+
+def usage(prompt: str, completion_tokens: int) -> Dict[str, int]:
+    """OpenAI-style usage block."""
+    prompt_tokens = len(tokenize(prompt))
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+class FakeLLM:
+    """Latency model and error injection of the fake server."""
+
+    def __init__(
+        self,
+        model: str,
+        ttft: float,
+        tokens_per_second: float,
+        max_concurrency: int,
+        error_rate: float,
+        seed: int,
+    ):
+        self.model = model
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+
+    def should_fail(self) -> bool:
+        """Decide (deterministically for a given seed and request order) whether to fail."""
+        self.requests += 1
+        if self.random.random() < self.error_rate:
+            self.errors += 1
+            return True
+        return False
+
+    async def paced(self, token_lists: List[List[str]]) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Yield (index, token) pairs at the configured speed.
+
+        Several sequences (multi-prompt requests) are generated side by side,
+        as a batching server would.
+        """
+        async with self.slots:
+            await asyncio.sleep(self.ttft)
+            start = time.perf_counter()
+            longest = max((len(tokens) for tokens in token_lists), default=0)
+            for position in range(longest):
+                if self.tokens_per_second > 0:
+                    delay = start + position / self.tokens_per_second - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                for index, tokens in enumerate(token_lists):
+                    if position < len(tokens):
+                        yield index, tokens[position]
+
+    async def complete(self, token_lists: List[List[str]]) -> None:
+        """Spend the time a non-streamed request would take."""
+        async for _ in self.paced(token_lists):
+            pass
+
+
+def error_response() -> JSONResponse:
+    return JSONResponse(
+        status_code=500,
+        content={"error": {"message": "Injected failure", "type": "server_error", "code": 500}},
+    )
+
+
+def sse(data: Any) -> str:
+    return f"data: {json.dumps(data)}\n\n"
+
+
+def create_app(llm: FakeLLM) -> FastAPI:
+    """Build the FastAPI app serving the OpenAI-compatible endpoints."""
+    app = FastAPI(title="Fake LLM")
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", "requests": llm.requests, "errors": llm.errors}
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": llm.model, "object": "model", "owned_by": "fake-llm"}]}
+
+    @app.post("/v1/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        if llm.should_fail():
+            return error_response()
+
+        prompts = body.get("prompt", "")
+        prompts = prompts if isinstance(prompts, list) else [prompts]
+        generated = [
+            generate(p, body.get("max_tokens"), body.get("stop"), wants_json(body)) for p in prompts
+        ]
+        token_lists = [tokens for tokens, _ in generated]
+        completion_id = f"cmpl-{uuid.uuid4().hex}"
+        total_usage = usage("".join(prompts), sum(len(t) for t in token_lists))
+
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+            async def stream():
+                async for index, token in llm.paced(token_lists):
+                    yield sse({
+                        "id": completion_id, "object": "text_completion", "model": llm.model,
+                        "choices": [{"index": index, "text": token, "finish_reason": None}],
+                    })
+                yield sse({
+                    "id": completion_id, "object": "text_completion", "model": llm.model,
+                    "choices": [
+                        {"index": index, "text": "", "finish_reason": finish}
+                        for index, (_, finish) in enumerate(generated)
+                    ],
+                })
+                if include_usage:
+                    yield sse({
+                        "id": completion_id, "object": "text_completion", "model": llm.model,
+                        "choices": [], "usage": total_usage,
+                    })
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(stream(), media_type="text/event-stream")
+
+        await llm.complete(token_lists)
+        return {
+            "id": completion_id,
+            "object": "text_completion",
+            "created": int(time.time()),
+            "model": llm.model,
+            "choices": [
+                {"index": index, "text": "".join(tokens), "finish_reason": finish, "logprobs": None}
+                for index, (tokens, finish) in enumerate(generated)
+            ],
+            "usage": total_usage,
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        if llm.should_fail():
+            return error_response()
+
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        tokens, finish = generate(prompt, body.get("max_tokens"), body.get("stop"), wants_json(body))
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> Dict[str, Any]:
+            return {
+                "id": completion_id, "object": "chat.completion.chunk", "created": created,
+                "model": llm.model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+            async def stream():
+                yield sse(chunk({"role": "assistant", "content": ""}))
+                async for _, token in llm.paced([tokens]):
+                    yield sse(chunk({"content": token}))
+                yield sse(chunk({}, finish))
+                if include_usage:
+                    yield sse({
+                        "id": completion_id, "object": "chat.completion.chunk", "created": created,
+                        "model": llm.model, "choices": [], "usage": usage(prompt, len(tokens)),
+                    })
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(stream(), media_type="text/event-stream")
+
+        await llm.complete([tokens])
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": llm.model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": finish,
+                }
+            ],
+            "usage": usage(prompt, len(tokens)),
+        }
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--model", default="meta-llama/Meta-Llama-3-8B-Instruct",
+                        help="Model name reported by the server")
+    parser.add_argument("--ttft", type=float, default=0.3, help="Seconds until the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=40.0,
+                        help="Generation speed per request (0 = as fast as possible)")
+    parser.add_argument("--max-concurrency", type=int, default=8,
+                        help="Requests generated at once; the rest wait in a queue")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for error injection")
+    args = parser.parse_args()
+
+    llm = FakeLLM(
+        model=args.model,
+        ttft=args.ttft,
+        tokens_per_second=args.tokens_per_second,
+        max_concurrency=args.max_concurrency,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    print(
+        f"Fake LLM '{args.model}' on http://{args.host}:{args.port}/v1 "
+        f"(ttft={args.ttft}s, {args.tokens_per_second} tok/s, concurrency={args.max_concurrency}, "
+        f"error rate={args.error_rate})"
+    )
+    uvicorn.run(create_app(llm), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+"""Shared test configuration."""
+
+import os
+
+# Required settings without defaults; set before app.config is imported
+os.environ.setdefault("WAZUH_PASSWORD", "test")
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("APP_ENV", "production")  # no SQL echo
@@ -0,0 +1,134 @@
+"""
+Remediation-script parser: expected outputs and parity with the previous parser.
+
+The samples are the ~3k-token reports of scripts/bench_report_parser.py;
+`legacy_parse` there is the multi-regex parser the single-pass one replaced.
+"""
+
+from typing import Any, Dict, Optional
+
+import pytest
+
+from app.services.ai.report_parser import ReportStreamParser, parse_report
+from scripts.bench_report_parser import PS_SCRIPT, SAMPLES, SCRIPT, legacy_parse
+
+GOLDEN = {
+    "pt": {
+        "script_content": SCRIPT,
+        "script_language": "bash",
+        "validation_command": "sysctl net.ipv4.conf.all.accept_redirects",
+        "estimated_duration": "< 5 segundos",
+        "requires_root": True,
+        "risks": [
+            "Pode afetar routers que dependem de redirecionamentos ICMP",
+            "Requer privilégios de root",
+        ],
+    },
+    "en": {
+        "script_content": SCRIPT,
+        "script_language": "bash",
+        "validation_command": "sysctl net.ipv4.conf.all.accept_redirects",
+        "estimated_duration": "< 5 seconds",
+        "requires_root": True,
+        "risks": [
+            "May affect routers relying on ICMP redirects",
+            "Requires root privileges",
+        ],
+    },
+    "en-windows": {
+        "script_content": PS_SCRIPT,
+        "script_language": "powershell",
+        "validation_command": "Get-ItemProperty -Path 'HKLM:\\SYSTEM\\CurrentControlSet\\Services\\Tcpip\\Parameters'",
+        "estimated_duration": "1 minute",
+        "requires_root": True,
+        "risks": ["Legacy routing setups may stop working"],
+    },
+}
+
+WINDOWS = {"name": "Microsoft Windows Server 2022"}
+
+
+def parse_streamed(report: str, chunk_size: int, os_info: Optional[Dict[str, Any]] = None):
+    """Feed the report in small chunks, as the streaming endpoint does."""
+    parser = ReportStreamParser()
+    for start in range(0, len(report), chunk_size):
+        parser.feed(report[start:start + chunk_size])
+    parser.close()
+    return parser.remediation_script(os_info)
+
+
+@pytest.mark.parametrize("sample", sorted(SAMPLES))
+def test_golden_output(sample):
+    assert parse_report(SAMPLES[sample]).remediation_script() == GOLDEN[sample]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 4096])
+@pytest.mark.parametrize("sample", sorted(SAMPLES))
+def test_streamed_output_matches_single_parse(sample, chunk_size):
+    assert parse_streamed(SAMPLES[sample], chunk_size) == GOLDEN[sample]
+
+
+@pytest.mark.parametrize("sample", sorted(SAMPLES))
+def test_script_matches_legacy_parser(sample):
+    # The labels and privilege detection were fixed on purpose (English
+    # labels, EUID checks); the extracted script must not change
+    os_info = WINDOWS if "windows" in sample else None
+    legacy = legacy_parse(SAMPLES[sample], os_info)
+    current = parse_report(SAMPLES[sample]).remediation_script(os_info)
+    assert (current["script_content"], current["script_language"]) == (
+        legacy["script_content"],
+        legacy["script_language"],
+    )
+
+
+INLINE_FENCE_REPORTS = {
+    "trailing fence": (
+        "## Automated Remediation Script\n"
+        "```bash\n"
+        "sysctl -w net.ipv4.conf.all.accept_redirects=0\n"
+        "echo done```\n"
+        "\n"
+        "**Validation Command:** `sysctl net.ipv4.conf.all.accept_redirects`\n"
+        "**Estimated Time:** < 5 seconds\n"
+        "\n"
+        "## 5. Validation\n"
+        "Run the validation command.\n"
+    ),
+    "trailing fence with spaces, bare fence": (
+        "```\n"
+        "echo done``` \n"
+        "**Validation Command:** `sysctl net.ipv4.conf.all.accept_redirects`\n"
+        "**Estimated Time:** < 5 seconds"
+    ),
+}
+
+
+@pytest.mark.parametrize("name", sorted(INLINE_FENCE_REPORTS))
+def test_inline_closing_fence(name):
+    report = INLINE_FENCE_REPORTS[name]
+    expected_content = legacy_parse(report)["script_content"]
+
+    for result in (parse_report(report).remediation_script(), parse_streamed(report, 5)):
+        assert result["script_content"] == expected_content
+        assert "```" not in result["script_content"]
+        assert "Validation Command" not in result["script_content"]
+        assert result["validation_command"] == "sysctl net.ipv4.conf.all.accept_redirects"
+        assert result["estimated_duration"] == "< 5 seconds"
+
+
+def test_inline_closing_fence_ends_the_block_before_later_sections():
+    parser = parse_report(INLINE_FENCE_REPORTS["trailing fence"])
+    assert [script["content"] for script in parser.scripts] == [
+        "sysctl -w net.ipv4.conf.all.accept_redirects=0\necho done"
+    ]
+
+
+def test_fence_opened_with_language_does_not_close_a_block():
+    report = "```bash\necho one\n```python\nprint(2)\n```\n"
+    assert parse_report(report).remediation_script()["script_content"] == (
+        "echo one\n```python\nprint(2)"
+    )
+
+
+def test_unterminated_block_is_not_a_script():
+    assert parse_report("## Script\n```bash\necho never closed\n").remediation_script() is None
@@ -0,0 +1,99 @@
+"""
+Concurrent writes against a file-backed SQLite database with the configured profile.
+
+Every worker is a separate process, like uvicorn with `--workers`: the engine
+reads DATABASE_URL when app.db.session is imported, so each process points
+it at the test database before importing the app (see
+scripts/bench_sqlite_writes.py).
+"""
+
+import multiprocessing
+import os
+import sqlite3
+
+WRITERS = 4
+READERS = 2
+WRITES_PER_WRITER = 25
+
+
+def _configure(url: str) -> None:
+    """Set the environment read by app.config (before any app import)."""
+    os.environ.setdefault("WAZUH_PASSWORD", "test")
+    os.environ.setdefault("SECRET_KEY", "test")
+    os.environ["APP_ENV"] = "production"
+    os.environ["LOG_LEVEL"] = "WARNING"
+    os.environ["DATABASE_URL"] = url
+
+
+def _init_db(url: str, results) -> None:
+    _configure(url)
+    from app.db.session import check_database_settings, init_db, sqlite_pragmas
+
+    init_db()
+    results.put((check_database_settings(), sqlite_pragmas()))
+
+
+def _worker(role: str, index: int, url: str, start, results) -> None:
+    """Save (or read) analyses once every worker is ready; report the errors."""
+    _configure(url)
+    from app.db.session import SessionLocal
+    from app.repositories.analysis_repository import AnalysisRepository
+
+    start.wait()  # every worker has imported the app
+    errors = []
+    for number in range(WRITES_PER_WRITER):
+        db = SessionLocal()
+        try:
+            repo = AnalysisRepository(db)
+            if role == "writer":
+                repo.save_analysis(
+                    agent_id=f"{index:03d}",
+                    agent_name=f"web-{index:03d}",
+                    policy_id="cis_ubuntu22-04",
+                    check_id=28000 + number,
+                    check_title=f"Ensure kernel parameter rule_{number} is set",
+                    language="en",
+                    ai_provider="vllm",
+                    report_text=f"## Analysis {index}/{number}\n" + "Lorem ipsum dolor sit amet. " * 40,
+                    analysis_fingerprint=f"{index:08x}{number:056x}",
+                )
+            else:
+                [a.to_dict() for a in repo.get_history_by_agent(f"{index:03d}", limit=200)]
+                repo.get_cache_stats()
+        except Exception as e:
+            db.rollback()
+            errors.append(f"{role} {index}: {e}")
+        finally:
+            db.close()
+    results.put(errors)
+
+
+def test_concurrent_writers_are_not_locked_out(tmp_path):
+    path = tmp_path / "history.db"
+    url = f"sqlite:///{path}"
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+
+    setup = context.Process(target=_init_db, args=(url, results))
+    setup.start()
+    effective, configured = results.get(timeout=60)
+    setup.join()
+    assert effective["journal_mode"] == configured["journal_mode"]
+    assert effective["busy_timeout"] == configured["busy_timeout"]
+
+    start = context.Barrier(WRITERS + READERS)
+    processes = [
+        context.Process(target=_worker, args=(role, index, url, start, results))
+        for role, count in (("writer", WRITERS), ("reader", READERS))
+        for index in range(count)
+    ]
+    for process in processes:
+        process.start()
+    errors = [error for _ in processes for error in results.get(timeout=120)]
+    for process in processes:
+        process.join()
+
+    assert not [error for error in errors if "database is locked" in error]
+    assert errors == []
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM analysis_history").fetchone()[0] == WRITERS * WRITES_PER_WRITER
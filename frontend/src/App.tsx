@@ -1,52 +1,52 @@
-import { QueryClient, QueryClientProvider } from '@tanstack/react-query';
-import { useTranslation } from 'react-i18next';
-import Dashboard from './pages/Dashboard';
-import { Shield } from 'lucide-react';
-
-const queryClient = new QueryClient();
-
-function App() {
-  const { t, i18n } = useTranslation();
-
-  const toggleLanguage = () => {
-    const newLang = i18n.language === 'en' ? 'pt' : 'en';
-    i18n.changeLanguage(newLang);
-  };
-
-  return (
-    <QueryClientProvider client={queryClient}>
-      <div className="min-h-screen bg-gray-50">
-        {/* Header */}
-        <header className="bg-white shadow-sm border-b">
-          <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-4">
-            <div className="flex items-center justify-between">
-              <div className="flex items-center space-x-3">
-                <Shield className="w-8 h-8 text-primary-600" />
-                <div>
-                  <h1 className="text-2xl font-bold text-gray-900">
-                    {t('app.title')}
-                  </h1>
-                  <p className="text-sm text-gray-500">{t('app.subtitle')}</p>
-                </div>
-              </div>
-
-              <button
-                onClick={toggleLanguage}
-                className="px-4 py-2 text-sm font-medium text-gray-700 bg-white border border-gray-300 rounded-md hover:bg-gray-50 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-primary-500"
-              >
-                {i18n.language === 'en' ? '🇵🇹 PT' : '🇬🇧 EN'}
-              </button>
-            </div>
-          </div>
-        </header>
-
-        {/* Main Content */}
-        <main className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8">
-          <Dashboard />
-        </main>
-      </div>
-    </QueryClientProvider>
-  );
-}
-
-export default App;
+import { QueryClient, QueryClientProvider } from '@tanstack/react-query';
+import { useTranslation } from 'react-i18next';
+import Dashboard from './pages/Dashboard';
+import { Shield } from 'lucide-react';
+
+const queryClient = new QueryClient();
+
+function App() {
+  const { t, i18n } = useTranslation();
+
+  const toggleLanguage = () => {
+    const newLang = i18n.language === 'en' ? 'pt' : 'en';
+    i18n.changeLanguage(newLang);
+  };
+
+  return (
+    <QueryClientProvider client={queryClient}>
+      <div className="min-h-screen bg-gray-50">
+        {/* Header */}
+        <header className="bg-white shadow-sm border-b">
+          <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-4">
+            <div className="flex items-center justify-between">
+              <div className="flex items-center space-x-3">
+                <Shield className="w-8 h-8 text-primary-600" />
+                <div>
+                  <h1 className="text-2xl font-bold text-gray-900">
+                    {t('app.title')}
+                  </h1>
+                  <p className="text-sm text-gray-500">{t('app.subtitle')}</p>
+                </div>
+              </div>
+
+              <button
+                onClick={toggleLanguage}
+                className="px-4 py-2 text-sm font-medium text-gray-700 bg-white border border-gray-300 rounded-md hover:bg-gray-50 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-primary-500"
+              >
+                {i18n.language === 'en' ? '🇵🇹 PT' : '🇬🇧 EN'}
+              </button>
+            </div>
+          </div>
+        </header>
+
+        {/* Main Content */}
+        <main className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8">
+          <Dashboard />
+        </main>
+      </div>
+    </QueryClientProvider>
+  );
+}
+
+export default App;